@@ -0,0 +1,5 @@
+# Escapa del Laberinto - lógica del juego
+# Isaac Orozco y Daniel Araya
+#
+# Todo lo que está en este paquete funciona sin tkinter, excepto
+# laberinto.imagenes, que solo se importa al abrir la ventana.
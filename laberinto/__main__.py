@@ -0,0 +1,211 @@
+# Escapa del Laberinto - herramientas de línea de comandos
+# Isaac Orozco y Daniel Araya
+#
+# Uso:
+#   python -m laberinto juego                          # abre la ventana
+#   python -m laberinto gen --semilla 7 --mostrar      # genera y muestra un mapa
+#   python -m laberinto gen --cantidad 20 --salida niveles.lbp
+#   python -m laberinto bench --rapido                 # ver laberinto.benchmark
+#   python -m laberinto scores --modo cazador --k 10
+#   python -m laberinto validate niveles.lbp partidas/*.lbr
+#
+# Cada comando importa solo lo que usa, dentro de su función: generar o
+# validar mapas no carga tkinter, PIL ni numpy, así que corre en un servidor
+# sin pantalla y arranca en una fracción de lo que tarda la interfaz. El
+# tiempo de importación se mide en el benchmark (casos importacion[...]).
+import argparse
+import sys
+
+MOTORES = ("dfs", "regiones", "numpy")
+
+
+# ----------------- JUEGO -----------------
+def comando_juego(args):
+    from laberinto.gui import main as abrir_juego
+    abrir_juego()
+    return 0
+
+
+# ----------------- GENERAR MAPAS -----------------
+def _clase_generador(motor):
+    if motor == "regiones":
+        from laberinto.regiones import GeneradorMapaPorRegiones
+        return GeneradorMapaPorRegiones
+    if motor == "numpy":
+        from laberinto.generador_numpy import NUMPY_AVAILABLE, GeneradorMapaNumpy
+        if not NUMPY_AVAILABLE:
+            raise SystemExit("El motor numpy necesita numpy instalado")
+        return GeneradorMapaNumpy
+    from laberinto.generador import GeneradorMapa
+    return GeneradorMapa
+
+
+def probar_generacion_mapa(generador, mostrar=False):
+    """Imprime los datos de un mapa generado (y el mapa si mostrar)"""
+    from laberinto.generador import obtener_posiciones_enemigos
+
+    print(f"Semilla: {generador.semilla}")
+    print(f"Posición del jugador: {generador.posicion_jugador}")
+    print(f"Salidas: {generador.salidas}")
+    print(f"Camino válido encontrado: {generador.verificar_camino_valido()}")
+    posiciones = obtener_posiciones_enemigos(generador.mapa, posicion_jugador=generador.posicion_jugador,
+                                             campo_salidas=generador.distancias_salidas())
+    print(f"Posiciones para enemigos: {posiciones}")
+    if mostrar:
+        print("\nMapa generado:")
+        generador.mostrar_mapa()
+
+
+def comando_gen(args):
+    import time
+
+    from laberinto.generador import generar_mapa_juego
+
+    clase = _clase_generador(args.motor)
+    generadores = []
+    inicio = time.perf_counter()
+    for k in range(args.cantidad):
+        semilla = None if args.semilla is None else args.semilla + k
+        generador = generar_mapa_juego(semilla, args.filas, args.columnas, mostrar_progreso=False,
+                                       clase_generador=clase)
+        generador.completar()  # por regiones: todo el mapa, para mostrarlo o guardarlo
+        generadores.append(generador)
+    ms = (time.perf_counter() - inicio) * 1000
+    print(f"{len(generadores)} mapa(s) de {args.filas}x{args.columnas} ({args.motor}) en {ms:.1f} ms")
+
+    if args.salida:
+        from laberinto.formato_mapa import EXTENSION_PAQUETE, guardar_mapa, guardar_paquete
+        if args.salida.endswith(EXTENSION_PAQUETE):
+            guardar_paquete(generadores, args.salida)
+        elif len(generadores) == 1:
+            guardar_mapa(generadores[0], args.salida)
+        else:
+            raise SystemExit(f"Varios mapas van en un paquete {EXTENSION_PAQUETE}")
+        print(f"Guardado en {args.salida}")
+    else:
+        for generador in generadores:
+            probar_generacion_mapa(generador, args.mostrar)
+    return 0
+
+
+# ----------------- BENCHMARK -----------------
+def comando_bench(args):
+    from laberinto.benchmark import main as benchmark
+    return benchmark(args.resto)
+
+
+# ----------------- PUNTAJES -----------------
+def comando_scores(args):
+    from laberinto.puntajes import SistemaPuntajes
+
+    puntajes = SistemaPuntajes(args.archivo, k=args.k, asincrono=False)
+    for modo in args.modo or ("escapa", "cazador"):
+        print(f"TOP {args.k} - MODO {modo.upper()}")
+        top = puntajes.obtener_top(modo, args.k)
+        for i, registro in enumerate(top, 1):
+            print(f"{i}. {registro['nombre']} - {registro['puntaje']} pts ({registro['fecha']})")
+        if not top:
+            print("No hay puntajes registrados")
+        print()
+    return 0
+
+
+# ----------------- VALIDAR ARCHIVOS -----------------
+def _validar_mapa(generador):
+    if not generador.verificar_camino_valido():
+        return "sin camino a una salida"
+    return None
+
+
+def _validar(ruta):
+    """(ok, detalle) de un mapa .lbm, paquete .lbp o grabación .lbr"""
+    if ruta.endswith(".lbr"):
+        from laberinto.grabacion import verificar
+        coincide, grabacion, sim = verificar(ruta)
+        detalle = (f"{grabacion.modo}/{grabacion.dificultad}, puntaje {grabacion.puntaje} "
+                   f"-> {sim.jugador.puntaje}")
+        return coincide, detalle
+
+    from laberinto.formato_mapa import EXTENSION_PAQUETE, PaqueteMapas, cargar_mapa
+    if ruta.endswith(EXTENSION_PAQUETE):
+        errores = []
+        with PaqueteMapas(ruta) as paquete:
+            for k in range(len(paquete)):
+                # Un paquete cortado se reporta nivel por nivel
+                try:
+                    error = _validar_mapa(paquete[k])
+                except ValueError as e:
+                    error = str(e)
+                if error:
+                    errores.append(f"nivel {k}: {error}")
+            return not errores, "; ".join(errores) or f"{len(paquete)} niveles"
+    generador = cargar_mapa(ruta)
+    error = _validar_mapa(generador)
+    return error is None, error or f"{generador.filas}x{generador.columnas}"
+
+
+def comando_validate(args):
+    import time
+
+    errores = 0
+    for ruta in args.archivos:
+        inicio = time.perf_counter()
+        try:
+            ok, detalle = _validar(ruta)
+        except (OSError, ValueError) as e:
+            # Los formatos reportan archivos cortados o dañados con ValueError
+            ok, detalle = False, str(e)
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"{'OK' if ok else 'ERROR':<6} {ruta}: {detalle} ({ms:.1f} ms)")
+        errores += not ok
+    return 1 if errores else 0
+
+
+# ----------------- PRINCIPAL -----------------
+def crear_parser():
+    from laberinto.constantes import ARCHIVO_PUNTAJES, FILAS, COLUMNAS
+
+    parser = argparse.ArgumentParser(prog="python -m laberinto",
+                                     description="Herramientas de Escapa del Laberinto")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    juego = comandos.add_parser("juego", help="abre la ventana del juego")
+    juego.set_defaults(funcion=comando_juego)
+
+    gen = comandos.add_parser("gen", help="genera mapas (y los guarda en .lbm/.lbp)")
+    gen.add_argument("--semilla", type=int, help="semilla del primer mapa; los demás usan las siguientes")
+    gen.add_argument("--filas", type=int, default=FILAS)
+    gen.add_argument("--columnas", type=int, default=COLUMNAS)
+    gen.add_argument("--cantidad", type=int, default=1)
+    gen.add_argument("--motor", choices=MOTORES, default="dfs")
+    gen.add_argument("--salida", help="archivo .lbm (un mapa) o .lbp (paquete de niveles)")
+    gen.add_argument("--mostrar", action="store_true", help="imprime el mapa en consola")
+    gen.set_defaults(funcion=comando_gen)
+
+    bench = comandos.add_parser("bench", help="corre laberinto.benchmark con los argumentos dados",
+                                add_help=False)
+    bench.set_defaults(funcion=comando_bench)
+
+    scores = comandos.add_parser("scores", help="muestra el top de puntajes")
+    scores.add_argument("--modo", nargs="+", choices=("escapa", "cazador"))
+    scores.add_argument("--k", type=int, default=5)
+    scores.add_argument("--archivo", default=ARCHIVO_PUNTAJES)
+    scores.set_defaults(funcion=comando_scores)
+
+    validate = comandos.add_parser("validate", help="valida mapas .lbm/.lbp y grabaciones .lbr")
+    validate.add_argument("archivos", nargs="+")
+    validate.set_defaults(funcion=comando_validate)
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    # Lo que sigue a `bench` son argumentos de laberinto.benchmark
+    args, args.resto = parser.parse_known_args(argv)
+    if args.resto and args.comando != "bench":
+        parser.error(f"argumentos no reconocidos: {' '.join(args.resto)}")
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+# Escapa del Laberinto - benchmarks de los caminos críticos
+# Isaac Orozco y Daniel Araya
+#
+# Uso:
+#   python -m laberinto.benchmark                      # barrido completo
+#   python -m laberinto.benchmark --rapido             # pocas repeticiones
+#   python -m laberinto.benchmark --salida hoy.json --comparar ayer.json
+#
+# Mide generación, carga de mapas guardados, validación, búsqueda de
+# posiciones libres, movimiento de enemigos (también en modo enjambre), un
+# tick completo de la simulación y el dibujo (sobre un canvas falso, así que
+# no necesita pantalla), además del tiempo de arrancar un proceso que
+# importa cada punto de entrada (la interfaz y las herramientas de
+# python -m laberinto). Reporta percentiles de latencia, throughput y
+# memoria pico, y guarda todo en JSON para comparar corridas.
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from laberinto.constantes import FILAS_VISTA, COLUMNAS_VISTA, DIRECTORIO_BASE
+from laberinto.casillas import Camino, Muro
+from laberinto.generador import GeneradorMapa, generar_mapa_juego, obtener_posiciones_libres
+from laberinto.regiones import GeneradorMapaPorRegiones
+from laberinto.enjambre import NUMPY_AVAILABLE, SimulacionEnjambre
+from laberinto.render import RenderizadorMapa
+from laberinto.simulacion import Simulacion, DIRECCIONES
+
+TAMANOS = ((12, 18), (51, 75), (201, 301))
+CANTIDADES_ENEMIGOS = (3, 30, 300)
+ENEMIGOS_ENJAMBRE = 10000  # modo enjambre (solo si numpy está instalado)
+# Módulos cuyo arranque se mide en un proceso nuevo ("python" = intérprete solo)
+MODULOS_IMPORTACION = ("python", "laberinto.generador", "laberinto.simulacion",
+                       "laberinto.__main__", "laberinto.gui")
+COLORES = {"#": "#8B4513", "L": "#228B22", "J": "#FF1493", "E": "#8B0000"}
+
+
+class CanvasFalso:
+    """Imita la parte de tk.Canvas que usa RenderizadorMapa y cuenta items"""
+
+    def __init__(self):
+        self.siguiente_id = 0
+        self.tipos = {}
+        self.items_creados = 0
+
+    def _crear(self, tipo):
+        self.siguiente_id += 1
+        self.items_creados += 1
+        self.tipos[self.siguiente_id] = tipo
+        return self.siguiente_id
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._crear("rectangle")
+
+    def create_oval(self, *args, **kwargs):
+        return self._crear("oval")
+
+    def create_image(self, *args, **kwargs):
+        return self._crear("image")
+
+    def create_text(self, *args, **kwargs):
+        return self._crear("text")
+
+    def delete(self, item):
+        if item == "all":
+            self.tipos.clear()
+        else:
+            self.tipos.pop(item, None)
+
+    def type(self, item):
+        return self.tipos.get(item)
+
+    def coords(self, *args):
+        pass
+
+    def itemconfig(self, *args, **kwargs):
+        pass
+
+    def move(self, *args):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    i = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[i]
+
+
+def medir(funcion, repeticiones, preparar=None, unidades_por_llamada=1):
+    """Corre funcion(estado) `repeticiones` veces y devuelve estadísticas.
+
+    preparar() (opcional) se llama antes de cada repetición fuera del tiempo
+    medido y su resultado se pasa a funcion. La memoria pico se mide en una
+    corrida aparte con tracemalloc para no distorsionar los tiempos.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        estado = preparar() if preparar else None
+        inicio = time.perf_counter()
+        funcion(estado)
+        tiempos.append(time.perf_counter() - inicio)
+
+    estado = preparar() if preparar else None
+    tracemalloc.start()
+    funcion(estado)
+    _, memoria_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tiempos.sort()
+    total = sum(tiempos)
+    return {
+        "repeticiones": repeticiones,
+        "p50_ms": percentil(tiempos, 50) * 1000,
+        "p95_ms": percentil(tiempos, 95) * 1000,
+        "p99_ms": percentil(tiempos, 99) * 1000,
+        "por_segundo": repeticiones * unidades_por_llamada / total if total else float("inf"),
+        "memoria_pico_kb": memoria_pico / 1024,
+    }
+
+
+def _silencioso(funcion):
+    """Evita que los print del juego ensucien la salida del benchmark"""
+    def envuelta(*args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return funcion(*args, **kwargs)
+    return envuelta
+
+
+def _bot_aleatorio(rng):
+    direcciones = list(DIRECCIONES)
+    return lambda sim: [("mover", rng.choice(direcciones), False)]
+
+
+# ----------------- CASOS -----------------
+def bench_importacion(modulo, repeticiones):
+    """Proceso nuevo que solo importa el módulo; None si no se puede importar aquí"""
+    comando = [sys.executable, "-c", "pass" if modulo == "python" else f"import {modulo}"]
+    if subprocess.run(comando, cwd=DIRECTORIO_BASE, capture_output=True).returncode != 0:
+        return None
+    return medir(lambda _: subprocess.run(comando, cwd=DIRECTORIO_BASE, check=True), repeticiones)
+
+
+def bench_generacion(filas, columnas, repeticiones):
+    semillas = iter(range(10 ** 9))
+    return medir(lambda _: generar_mapa_juego(next(semillas), filas, columnas, mostrar_progreso=False),
+                 repeticiones)
+
+
+def bench_generacion_regiones(filas, columnas, repeticiones):
+    """Arranque con generación por regiones: solo las cercanas al jugador"""
+    semillas = iter(range(10 ** 9))
+    return medir(lambda _: generar_mapa_juego(next(semillas), filas, columnas, mostrar_progreso=False,
+                                              clase_generador=GeneradorMapaPorRegiones),
+                 repeticiones)
+
+
+def bench_carga_mapa(filas, columnas, repeticiones):
+    """Abrir un mapa guardado (.lbm), la alternativa a generar y validar"""
+    generador = generar_mapa_juego(1, filas, columnas, mostrar_progreso=False)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = generador.guardar(os.path.join(directorio, "mapa.lbm"))
+        return medir(lambda _: GeneradorMapa.cargar(ruta), repeticiones)
+
+
+def bench_validacion(filas, columnas, repeticiones, bfs=False):
+    """Recién generado responde el union-find; con bfs se cambia una casilla
+    (y se deja como estaba) para que las versiones difieran y haga el BFS"""
+    generador = generar_mapa_juego(1, filas, columnas, mostrar_progreso=False)
+    if bfs:
+        r, c = generador.posicion_jugador
+        codigo = generador.mapa.tipo(r, c)
+        generador.mapa.poner(r, c, Muro.codigo)
+        generador.mapa.poner(r, c, codigo)
+    return medir(lambda _: generador.verificar_camino_valido(), repeticiones)
+
+
+def bench_posiciones_libres(filas, columnas, repeticiones):
+    generador = generar_mapa_juego(1, filas, columnas, mostrar_progreso=False)
+    return medir(lambda _: obtener_posiciones_libres(generador.mapa, Camino), repeticiones)
+
+
+def bench_aparicion(filas, columnas, repeticiones):
+    """Una casilla libre al azar lejos del jugador, como al reaparecer un enemigo"""
+    generador = generar_mapa_juego(1, filas, columnas, mostrar_progreso=False)
+    libres = generador.mapa.libres()
+    rng = random.Random(5)
+    return medir(lambda _: libres.muestrear_punto(rng, generador.posicion_jugador, 4), repeticiones)
+
+
+def _simulacion(filas, columnas, num_enemigos, modo="escapa"):
+    generador = generar_mapa_juego(1, filas, columnas, mostrar_progreso=False)
+    return Simulacion(modo, "dificil", generador=generador, rng=random.Random(1),
+                      num_enemigos=num_enemigos)
+
+
+def bench_mover_enemigos(filas, columnas, num_enemigos, repeticiones):
+    """Un paso de todos los enemigos (incluye recalcular el campo BFS si hace falta)"""
+    sim = _simulacion(filas, columnas, num_enemigos)
+    bot = _bot_aleatorio(random.Random(2))
+
+    def preparar():
+        for accion in bot(sim):
+            sim.aplicar(accion)
+        sim.terminado = False  # el benchmark sigue aunque atrapen al jugador
+
+    return medir(lambda _: sim.mover_enemigos(), repeticiones, preparar,
+                 unidades_por_llamada=len(sim.enemigos))
+
+
+def bench_mover_enjambre(filas, columnas, num_enemigos, repeticiones, modo="escapa"):
+    """Un paso de todo el enjambre (arreglos NumPy), con el campo BFS ya calculado"""
+    generador = generar_mapa_juego(1, filas, columnas, mostrar_progreso=False)
+    sim = SimulacionEnjambre(modo, "dificil", generador=generador, rng=random.Random(1),
+                             num_enemigos=num_enemigos)
+    return medir(lambda _: sim.mover_enemigos(), repeticiones, unidades_por_llamada=num_enemigos)
+
+
+def bench_tick(filas, columnas, num_enemigos, repeticiones, modo="escapa"):
+    """Simulacion.step() completo con un bot que se mueve al azar"""
+    sim = _simulacion(filas, columnas, num_enemigos, modo)
+    bot = _bot_aleatorio(random.Random(3))
+
+    def tick(_):
+        sim.step(bot(sim))
+        sim.terminado = False
+
+    return medir(tick, repeticiones)
+
+
+def bench_render(filas, columnas, num_enemigos, repeticiones):
+    """Primer dibujo y dibujo incremental de cada tick, con la vista del juego"""
+    sim = _simulacion(filas, columnas, num_enemigos)
+
+    def preparar():
+        return RenderizadorMapa(CanvasFalso(), 30, COLORES, {}, FILAS_VISTA, COLUMNAS_VISTA)
+
+    inicial = medir(lambda r: r.dibujar(sim.generador, sim.jugador, sim.enemigos),
+                    max(1, repeticiones // 10), preparar)
+
+    canvas = CanvasFalso()
+    renderizador = RenderizadorMapa(canvas, 30, COLORES, {}, FILAS_VISTA, COLUMNAS_VISTA)
+    renderizador.dibujar(sim.generador, sim.jugador, sim.enemigos)
+    bot = _bot_aleatorio(random.Random(4))
+    items_antes = canvas.items_creados
+
+    def tick(_):
+        sim.step(bot(sim))
+        sim.terminado = False
+        for posicion in sim.tomar_celdas_cambiadas():
+            renderizador.marcar_sucia(posicion)
+        renderizador.dibujar(sim.generador, sim.jugador, sim.enemigos)
+
+    incremental = medir(tick, repeticiones)
+    incremental["items_creados_por_tick"] = (canvas.items_creados - items_antes) / (repeticiones + 1)
+    return inicial, incremental
+
+
+def ejecutar(tamanos=TAMANOS, enemigos=CANTIDADES_ENEMIGOS, repeticiones=50, mostrar=print):
+    """Corre todos los casos y devuelve {"meta": ..., "resultados": {nombre: stats}}"""
+    resultados = {}
+
+    def registrar(nombre, stats):
+        resultados[nombre] = stats
+        mostrar(f"{nombre:<40} p50={stats['p50_ms']:9.3f} ms  p95={stats['p95_ms']:9.3f} ms  "
+                f"{stats['por_segundo']:12.1f}/s  pico={stats['memoria_pico_kb']:9.1f} KB")
+
+    for modulo in MODULOS_IMPORTACION:
+        # Cada repetición es un proceso: con pocas alcanza
+        stats = bench_importacion(modulo, min(repeticiones, 10))
+        if stats is not None:
+            registrar(f"importacion[{modulo}]", stats)
+
+    for filas, columnas in tamanos:
+        tam = f"{filas}x{columnas}"
+        # Los mapas grandes cuestan más: menos repeticiones para no eternizar la corrida
+        rep = max(3, repeticiones * 12 * 18 // (filas * columnas)) if filas * columnas > 12 * 18 else repeticiones
+        registrar(f"generacion[{tam}]", _silencioso(bench_generacion)(filas, columnas, rep))
+        registrar(f"generacion_regiones[{tam}]",
+                  _silencioso(bench_generacion_regiones)(filas, columnas, repeticiones))
+        registrar(f"carga_mapa[{tam}]", _silencioso(bench_carga_mapa)(filas, columnas, repeticiones))
+        registrar(f"validacion[{tam}]", _silencioso(bench_validacion)(filas, columnas, rep))
+        registrar(f"validacion_bfs[{tam}]", _silencioso(bench_validacion)(filas, columnas, rep, bfs=True))
+        registrar(f"posiciones_libres[{tam}]", _silencioso(bench_posiciones_libres)(filas, columnas, rep))
+        registrar(f"aparicion[{tam}]", _silencioso(bench_aparicion)(filas, columnas, repeticiones))
+        for num_enemigos in enemigos:
+            caso = f"{tam},{num_enemigos}e"
+            registrar(f"mover_enemigos[{caso}]",
+                      _silencioso(bench_mover_enemigos)(filas, columnas, num_enemigos, repeticiones))
+            registrar(f"tick_escapa[{caso}]",
+                      _silencioso(bench_tick)(filas, columnas, num_enemigos, repeticiones))
+            registrar(f"tick_cazador[{caso}]",
+                      _silencioso(bench_tick)(filas, columnas, num_enemigos, repeticiones, "cazador"))
+            inicial, incremental = _silencioso(bench_render)(filas, columnas, num_enemigos, repeticiones)
+            registrar(f"render_inicial[{caso}]", inicial)
+            registrar(f"render_tick[{caso}]", incremental)
+        if NUMPY_AVAILABLE:
+            caso = f"{tam},{ENEMIGOS_ENJAMBRE}e"
+            registrar(f"mover_enjambre[{caso}]",
+                      _silencioso(bench_mover_enjambre)(filas, columnas, ENEMIGOS_ENJAMBRE, repeticiones))
+            registrar(f"mover_enjambre_cazador[{caso}]",
+                      _silencioso(bench_mover_enjambre)(filas, columnas, ENEMIGOS_ENJAMBRE,
+                                                        repeticiones, "cazador"))
+
+    return {
+        "meta": {
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "repeticiones": repeticiones,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base, tolerancia=0.25):
+    """Devuelve [(nombre, p50_base, p50_actual)] de los casos más lentos que la base"""
+    regresiones = []
+    for nombre, stats in actual["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior and stats["p50_ms"] > anterior["p50_ms"] * (1 + tolerancia):
+            regresiones.append((nombre, anterior["p50_ms"], stats["p50_ms"]))
+    return regresiones
+
+
+def _leer_tamano(texto):
+    filas, columnas = texto.lower().split("x")
+    return int(filas), int(columnas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de Escapa del Laberinto")
+    parser.add_argument("--tamanos", nargs="+", type=_leer_tamano,
+                        help="tamaños a barrer, por ejemplo 12x18 101x151")
+    parser.add_argument("--enemigos", nargs="+", type=int, help="cantidades de enemigos a barrer")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    parser.add_argument("--rapido", action="store_true", help="pocas repeticiones y tamaños chicos")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para buscar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="fracción de p50 más lento que se considera regresión")
+    args = parser.parse_args(argv)
+
+    tamanos = args.tamanos or (TAMANOS[:2] if args.rapido else TAMANOS)
+    enemigos = args.enemigos or (CANTIDADES_ENEMIGOS[:2] if args.rapido else CANTIDADES_ENEMIGOS)
+    repeticiones = 10 if args.rapido else args.repeticiones
+
+    resultado = ejecutar(tamanos, enemigos, repeticiones)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2)
+        print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar(resultado, base, args.tolerancia)
+        for nombre, antes, ahora in regresiones:
+            print(f"REGRESIÓN {nombre}: {antes:.3f} ms -> {ahora:.3f} ms")
+        if regresiones:
+            return 1
+        print("Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+# Escapa del Laberinto - casillas y grilla del mapa
+# Isaac Orozco y Daniel Araya
+import os
+import time
+
+from laberinto.constantes import DIRECTORIO_BASE
+from laberinto.indice_libres import IndiceLibres
+
+
+class Casilla:  # CLASE BASE
+
+    simbolo = "?"
+    codigo = None  # índice del tipo dentro de GrillaMapa
+
+    def accesible_por_jugador(self):
+        return False
+
+    def accesible_por_enemigo(self):
+        return False
+
+    def __str__(self):
+        return self.simbolo
+
+
+class Camino(Casilla):
+    simbolo = "."
+    codigo = 0
+
+    def accesible_por_jugador(self): return True
+
+    def accesible_por_enemigo(self): return True
+
+class Liana(Casilla):
+    simbolo = "L"
+    codigo = 2
+    imagen = None
+    imagen_path = None
+
+    @classmethod
+    def init_imagen_path(cls):
+        if cls.imagen_path is None:
+            cls.imagen_path = os.path.join(DIRECTORIO_BASE, "Objetos", "liana.png")
+
+    @classmethod
+    def cargar_imagen(cls, tamano, cargador=None):
+        # Import diferido: la simulación sin ventana no necesita tkinter
+        if cargador is None:
+            from laberinto.imagenes import cargar_imagen_escalada as cargador
+
+        cls.init_imagen_path()
+        cls.imagen = cargador(cls.imagen_path, tamano, "Liana")
+
+    def accesible_por_jugador(self): return False
+    def accesible_por_enemigo(self): return True
+
+
+
+
+class Tunel(Casilla):
+    simbolo = "T"
+    codigo = 3
+
+    def accesible_por_jugador(self): return True
+
+    def accesible_por_enemigo(self): return False
+
+
+
+class Muro(Casilla):
+    simbolo = "#"
+    codigo = 1
+    imagen = None            # PhotoImage cached
+    imagen_path = None       # ruta absoluta al PNG usado por la clase
+
+    @classmethod
+    def init_imagen_path(cls):
+        # determina la ruta correcta basada en la carpeta del proyecto
+        if cls.imagen_path is None:
+            cls.imagen_path = os.path.join(DIRECTORIO_BASE, "Objetos", "muro.png")
+
+    @classmethod
+    def cargar_imagen(cls, tamano, cargador=None):
+        """
+        Carga y escala la imagen del muro a (tamano x tamano).
+        - Debe llamarse DESPUÉS de crear el Tk() principal.
+        - Guarda la PhotoImage en cls.imagen (evita GC).
+        - Si no existe el asset queda en None (fallback a rectángulo).
+        - cargador(ruta, tamano, etiqueta): por defecto cargar_imagen_escalada;
+          la interfaz pasa GestorRecursos.imagen para usar el atlas.
+        """
+        if cargador is None:
+            from laberinto.imagenes import cargar_imagen_escalada as cargador
+
+        cls.init_imagen_path()
+        cls.imagen = cargador(cls.imagen_path, tamano, "Muro")
+
+    def accesible_por_jugador(self): return False
+
+    def accesible_por_enemigo(self): return False
+
+
+
+class Salida(Casilla):
+    simbolo = "S"
+    codigo = 4
+
+    def accesible_por_jugador(self): return True
+
+    def accesible_por_enemigo(self): return True  # Los enemigos pueden usar las salidas
+
+
+class Trampa(Casilla):
+    def __init__(self, ahora=None):
+        self.activa = True
+        self.tiempo_colocacion = time.time() if ahora is None else ahora
+
+    simbolo = "X"
+    codigo = 5
+
+    def accesible_por_jugador(self): return True
+
+    def accesible_por_enemigo(self): return True
+
+    def activar_trampa(self):
+        """Activa la trampa cuando un enemigo la toca"""
+        self.activa = False
+        return True  # Indica que el enemigo debe ser eliminado
+
+
+# ----------------- GRILLA COMPACTA -----------------
+# Una sola instancia compartida (flyweight) por cada tipo de casilla sin estado
+CAMINO = Camino()
+MURO = Muro()
+LIANA = Liana()
+TUNEL = Tunel()
+SALIDA = Salida()
+
+# Índice: codigo -> instancia compartida (Trampa tiene estado y va en tabla aparte)
+CASILLAS_POR_CODIGO = (CAMINO, MURO, LIANA, TUNEL, SALIDA, None)
+
+# Tablas de paso precalculadas por código de casilla
+PASO_JUGADOR = bytes([1, 0, 0, 1, 1, 1])
+PASO_ENEMIGO = bytes([1, 0, 1, 0, 1, 1])
+
+# Las mismas tablas con 256 entradas, para bytearray.translate()
+TABLA_PASO_JUGADOR = PASO_JUGADOR.ljust(256, b"\0")
+TABLA_PASO_ENEMIGO = PASO_ENEMIGO.ljust(256, b"\0")
+
+
+class FilaGrilla:
+    """Vista de una fila de GrillaMapa para mantener la sintaxis mapa[r][c]"""
+    __slots__ = ("grilla", "base")
+
+    def __init__(self, grilla, r):
+        self.grilla = grilla
+        self.base = r * grilla.columnas
+
+    def __len__(self):
+        return self.grilla.columnas
+
+    def _indice(self, c):
+        # Como una lista: negativos desde el final y nunca pasar a otra fila
+        columnas = self.grilla.columnas
+        if c < 0:
+            c += columnas
+        if not 0 <= c < columnas:
+            raise IndexError(c)
+        return self.base + c
+
+    def __getitem__(self, c):
+        return self.grilla.casilla_en(self._indice(c))
+
+    def __setitem__(self, c, casilla):
+        self.grilla.poner_casilla(self._indice(c), casilla)
+
+    def __iter__(self):
+        for c in range(self.grilla.columnas):
+            yield self.grilla.casilla_en(self.base + c)
+
+
+class GrillaMapa:
+    """Mapa guardado como un bytearray plano de códigos de casilla.
+
+    - Cada celda se identifica con un entero: i = r * columnas + c.
+    - Las casillas sin estado se devuelven como instancias compartidas.
+    - Las trampas (con estado) viven en el diccionario self.trampas.
+    - paso_jugador / paso_enemigo se mantienen al día en cada cambio.
+    - libres() es el índice de casillas Camino para hacer aparecer enemigos;
+      se construye la primera vez que se pide y luego se actualiza solo.
+    """
+
+    def __init__(self, filas, columnas, codigo_inicial=Muro.codigo):
+        self.filas = filas
+        self.columnas = columnas
+        total = filas * columnas
+        self.celdas = bytearray([codigo_inicial]) * total
+        self.paso_jugador = bytearray([PASO_JUGADOR[codigo_inicial]]) * total
+        self.paso_enemigo = bytearray([PASO_ENEMIGO[codigo_inicial]]) * total
+        self.trampas = {}
+        self.version_paso = 0  # cambia cuando cambia alguna máscara de paso
+        self.indice_libres = None
+
+    def __len__(self):
+        return self.filas
+
+    def __getitem__(self, r):
+        if r < 0:
+            r += self.filas
+        if not 0 <= r < self.filas:
+            raise IndexError(r)
+        return FilaGrilla(self, r)
+
+    def __iter__(self):
+        for r in range(self.filas):
+            yield FilaGrilla(self, r)
+
+    def dentro(self, r, c):
+        """Verifica si (r, c) está dentro de esta grilla"""
+        return 0 <= r < self.filas and 0 <= c < self.columnas
+
+    def indice(self, r, c):
+        return r * self.columnas + c
+
+    def tipo(self, r, c):
+        """Devuelve el código de la casilla en (r, c)"""
+        return self.celdas[r * self.columnas + c]
+
+    def casilla_en(self, i):
+        """Devuelve el objeto Casilla de la celda i"""
+        codigo = self.celdas[i]
+        if codigo == Trampa.codigo:
+            return self.trampas[i]
+        return CASILLAS_POR_CODIGO[codigo]
+
+    def poner(self, r, c, codigo):
+        """Cambia el tipo de la casilla (r, c) a un tipo sin estado"""
+        self.poner_codigo(r * self.columnas + c, codigo)
+
+    def poner_codigo(self, i, codigo):
+        anterior = self.celdas[i]
+        if anterior == Trampa.codigo:
+            del self.trampas[i]
+        if self.indice_libres is not None and anterior != codigo:
+            if codigo == Camino.codigo:
+                self.indice_libres.agregar(i)
+            elif anterior == Camino.codigo:
+                self.indice_libres.quitar(i)
+        if (self.paso_jugador[i] != PASO_JUGADOR[codigo] or
+                self.paso_enemigo[i] != PASO_ENEMIGO[codigo]):
+            self.version_paso += 1
+        self.celdas[i] = codigo
+        self.paso_jugador[i] = PASO_JUGADOR[codigo]
+        self.paso_enemigo[i] = PASO_ENEMIGO[codigo]
+
+    def recalcular_paso(self):
+        """Reconstruye las máscaras de paso tras escribir self.celdas en bloque"""
+        self.paso_jugador = self.celdas.translate(TABLA_PASO_JUGADOR)
+        self.paso_enemigo = self.celdas.translate(TABLA_PASO_ENEMIGO)
+        self.version_paso += 1
+        self.indice_libres = None  # se reconstruye en el próximo libres()
+
+    def poner_bloque(self, r0, c0, columnas, codigos):
+        """Escribe un rectángulo de códigos (filas de `columnas` celdas, sin trampas)
+        con r0, c0 como esquina superior izquierda; mantiene máscaras e índice"""
+        camino = Camino.codigo
+        for fila in range(len(codigos) // columnas):
+            i = (r0 + fila) * self.columnas + c0
+            nuevos = codigos[fila * columnas:(fila + 1) * columnas]
+            if self.indice_libres is not None:
+                for j in range(columnas):
+                    if self.celdas[i + j] == camino and nuevos[j] != camino:
+                        self.indice_libres.quitar(i + j)
+                    elif nuevos[j] == camino:
+                        self.indice_libres.agregar(i + j)
+            if self.trampas:
+                for j in range(i, i + columnas):
+                    self.trampas.pop(j, None)
+            self.celdas[i:i + columnas] = nuevos
+            self.paso_jugador[i:i + columnas] = nuevos.translate(TABLA_PASO_JUGADOR)
+            self.paso_enemigo[i:i + columnas] = nuevos.translate(TABLA_PASO_ENEMIGO)
+        self.version_paso += 1
+
+    def libres(self):
+        """IndiceLibres de las casillas Camino (sin trampa), siempre al día"""
+        if self.indice_libres is None:
+            self.indice_libres = IndiceLibres.desde_mapa(self, Camino.codigo)
+        return self.indice_libres
+
+    def poner_casilla(self, i, casilla):
+        """Guarda un objeto Casilla; solo las trampas se conservan como objeto"""
+        self.poner_codigo(i, casilla.codigo)
+        if casilla.codigo == Trampa.codigo:
+            self.trampas[i] = casilla
+
+    def accesible(self, r, c, es_jugador=True):
+        """Consulta de paso en O(1) usando las máscaras precalculadas"""
+        if not (0 <= r < self.filas and 0 <= c < self.columnas):
+            return False
+        paso = self.paso_jugador if es_jugador else self.paso_enemigo
+        return paso[r * self.columnas + c] == 1
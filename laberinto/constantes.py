@@ -0,0 +1,51 @@
+# Escapa del Laberinto - constantes del juego
+# Isaac Orozco y Daniel Araya
+import os
+from collections import namedtuple
+
+FILAS = 12
+COLUMNAS = 18
+# Casillas visibles en la ventana; si el mapa es más grande la cámara sigue al jugador
+FILAS_VISTA = FILAS
+COLUMNAS_VISTA = COLUMNAS
+
+NUM_ENEMIGOS = 3
+TIEMPO_REAPARICION_ENEMIGO = 10  # segundos
+COOLDOWN_TRAMPA = 5  # segundos entre colocaciones
+MAX_TRAMPAS_ACTIVAS = 3
+# Pasos reales (no en línea recta) mínimos de un enemigo que aparece a cualquier salida
+DISTANCIA_APARICION_SALIDA = 6
+
+# Configuración de dificultad
+DIFICULTAD_FACIL = {
+    'escapa': 6,    # frames entre movimientos (más lento)
+    'cazador': 5
+}
+DIFICULTAD_DIFICIL = {
+    'escapa': 3,    # frames entre movimientos (más rápido)
+    'cazador': 2
+}
+
+COSTO_CORRER_POR_MOVIMIENTO = 10
+RECUPERACION_ENERGIA_POR_TURNO = 5
+ENERGIA_MAXIMA = 100
+
+# Duración de un tick de simulación: la interfaz avanza la simulación en
+# pasos fijos de este largo, sin importar cuándo la llame Tk
+DURACION_TICK = 0.1  # segundos
+# Si la interfaz se atrasa, a lo sumo se recuperan estos ticks por llamada
+MAX_TICKS_POR_FRAME = 5
+
+# Log de puntajes actual; los TXT son del formato anterior y se migran al log
+ARCHIVO_PUNTAJES = "puntajes.log"
+ARCHIVO_PUNTAJES_ESCAPA = "puntajes_escapa.txt"
+ARCHIVO_PUNTAJES_CAZADOR = "puntajes_cazador.txt"
+# Grabaciones de partidas (.lbr), a la par de los archivos de puntajes
+DIRECTORIO_PARTIDAS = "partidas"
+
+# Carpeta del proyecto (donde están Objetos/ y sprites_personaje/)
+DIRECTORIO_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imágenes ya escaladas (atlas por tamaño de casilla); se puede borrar sin problema
+DIRECTORIO_CACHE = os.path.join(DIRECTORIO_BASE, ".cache_imagenes")
+
+Punto = namedtuple("Punto", ["r", "c"])
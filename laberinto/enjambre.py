@@ -0,0 +1,324 @@
+# Escapa del Laberinto - modo enjambre (miles de enemigos con NumPy)
+# Isaac Orozco y Daniel Araya
+#
+# Backend opcional, como generador_numpy: si numpy no está instalado el juego
+# sigue funcionando con la lista de objetos Enemigo. Aquí el estado de todos
+# los enemigos vive en arreglos (posición, vivo, tiempo de muerte) y las
+# reglas se aplican a todos a la vez contra las máscaras de paso del mapa.
+# Pensado para niveles de estrés y experimentos de IA sin interfaz:
+#
+#   sim = SimulacionEnjambre("escapa", "dificil", num_enemigos=10000,
+#                            generador=generar_mapa_juego(1, 201, 301))
+#   sim.ejecutar(1000)
+from laberinto.constantes import (NUM_ENEMIGOS, TIEMPO_REAPARICION_ENEMIGO, DISTANCIA_APARICION_SALIDA,
+                                  Punto)
+from laberinto.casillas import Camino, Salida, Trampa
+from laberinto.simulacion import Simulacion
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Distancia mínima (Manhattan) al jugador al aparecer o reaparecer
+DISTANCIA_APARICION = 4
+# Distancia "infinita" para descartar vecinos sin paso
+_LEJOS = 2 ** 30
+
+
+class _VistaEnemigo:
+    """Un enemigo del enjambre con la misma cara que Enemigo (posicion, vivo)"""
+    __slots__ = ("enjambre", "k")
+
+    def __init__(self, enjambre, k):
+        self.enjambre = enjambre
+        self.k = k
+
+    @property
+    def posicion(self):
+        return Punto(*divmod(int(self.enjambre.posiciones[self.k]), self.enjambre.columnas))
+
+    @property
+    def vivo(self):
+        return bool(self.enjambre.vivos[self.k])
+
+
+# ----------------- ENJAMBRE -----------------
+class EnjambreEnemigos:
+    """Estado de muchos enemigos como arreglos paralelos (struct of arrays).
+
+    - posiciones: índice plano de la celda de cada enemigo (int64).
+    - vivos: bool; tiempos_muerte: segundos del reloj de la simulación.
+    - Se puede recorrer como una lista de enemigos (vistas con posicion y
+      vivo), así el renderizador lo dibuja igual que a la lista normal.
+    - Los movimientos siguen las mismas reglas que Enemigo.mover_hacia_objetivo,
+      incluido el orden de desempate de las direcciones.
+    """
+
+    def __init__(self, filas, columnas, posiciones, semilla=None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("EnjambreEnemigos necesita numpy (pip install numpy)")
+        self.filas = filas
+        self.columnas = columnas
+        self.posiciones = np.asarray(posiciones, dtype=np.int64).copy()
+        self.vivos = np.ones(len(self.posiciones), dtype=bool)
+        self.tiempos_muerte = np.zeros(len(self.posiciones))
+        self.rng = np.random.default_rng(semilla)
+        # Derecha, Abajo, Izquierda, Arriba: el mismo orden que Enemigo
+        self.saltos = np.array([1, columnas, -1, -columnas], dtype=np.int64)
+
+    @classmethod
+    def aleatorio(cls, mapa, cantidad, origen=None, semilla=None, campo_salidas=None):
+        """Enjambre de `cantidad` enemigos en casillas libres lejos de origen
+        (y de las salidas, si se pasa su CampoDistancias)"""
+        enjambre = cls(mapa.filas, mapa.columnas, np.zeros(cantidad, dtype=np.int64), semilla)
+        posiciones = enjambre._muestrear_libres(mapa, cantidad, origen, campo_salidas=campo_salidas)
+        if len(posiciones):
+            enjambre.posiciones = posiciones
+        else:
+            enjambre.vivos[:] = False  # mapa sin casillas libres
+        return enjambre
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def __getitem__(self, k):
+        if not -len(self) <= k < len(self):
+            raise IndexError(k)
+        return _VistaEnemigo(self, k % len(self))
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield _VistaEnemigo(self, k)
+
+    def cantidad_vivos(self):
+        return int(np.count_nonzero(self.vivos))
+
+    def en_celda(self, i):
+        """Índices de los enemigos vivos en la celda i"""
+        return np.flatnonzero(self.vivos & (self.posiciones == i))
+
+    # ----------------- MOVIMIENTO -----------------
+    def _vecinos(self, mapa, indices):
+        """(candidatos, válidos): las 4 celdas vecinas de cada enemigo y si se pueden pisar"""
+        pos = self.posiciones[indices]
+        r, c = np.divmod(pos, self.columnas)
+        candidatos = pos[:, None] + self.saltos
+        validos = np.stack([c < self.columnas - 1, r < self.filas - 1, c > 0, r > 0], axis=1)
+        paso = np.frombuffer(mapa.paso_enemigo, dtype=np.uint8)
+        validos &= paso[np.where(validos, candidatos, 0)] == 1
+        return candidatos, validos
+
+    def mover(self, mapa, objetivos, campo=None, huir=False):
+        """Mueve un paso a todos los enemigos vivos.
+
+        objetivos: un Punto para todos o (filas, columnas) como arreglos por
+        enemigo. Si hay un CampoDistancias con raíz en el objetivo se sigue su
+        gradiente; quien no tiene camino (o no hay campo) usa la distancia
+        Manhattan, como Enemigo.mover_hacia_objetivo.
+        """
+        indices = np.flatnonzero(self.vivos)
+        if not len(indices):
+            return 0
+        candidatos, validos = self._vecinos(mapa, indices)
+        destinos = self.posiciones[indices].copy()
+        sin_campo = np.ones(len(indices), dtype=bool)
+
+        if campo is not None:
+            dist = np.frombuffer(campo.distancias, dtype=np.int32)
+            actual = dist[destinos]
+            sin_campo = actual < 0
+            vecinas = np.where(validos, dist[np.where(validos, candidatos, 0)], -1)
+            if huir:
+                mejor = np.argmax(vecinas, axis=1)
+                mejor_distancia = vecinas[np.arange(len(indices)), mejor]
+                mueve = ~sin_campo & (mejor_distancia > actual)
+            else:
+                vecinas = np.where(vecinas < 0, _LEJOS, vecinas)
+                mejor = np.argmin(vecinas, axis=1)
+                mejor_distancia = vecinas[np.arange(len(indices)), mejor]
+                mueve = ~sin_campo & (mejor_distancia < actual)
+            destinos[mueve] = candidatos[mueve, mejor[mueve]]
+
+        heuristica = np.flatnonzero(sin_campo)
+        if len(heuristica):
+            if isinstance(objetivos, Punto):
+                objetivo_r, objetivo_c = objetivos.r, objetivos.c
+            else:
+                seleccion = indices[heuristica]
+                objetivo_r, objetivo_c = objetivos[0][seleccion, None], objetivos[1][seleccion, None]
+            r, c = np.divmod(candidatos[heuristica], self.columnas)
+            manhattan = np.abs(r - objetivo_r) + np.abs(c - objetivo_c)
+            validos_h = validos[heuristica]
+            if huir:
+                mejor = np.argmax(np.where(validos_h, manhattan, -1), axis=1)
+            else:
+                mejor = np.argmin(np.where(validos_h, manhattan, _LEJOS), axis=1)
+            mueve = validos_h.any(axis=1)
+            destinos[heuristica[mueve]] = candidatos[heuristica[mueve], mejor[mueve]]
+
+        movidos = int(np.count_nonzero(destinos != self.posiciones[indices]))
+        self.posiciones[indices] = destinos
+        return movidos
+
+    def salidas_mas_cercanas(self, salidas):
+        """(filas, columnas) de la salida más cercana (Manhattan) a cada enemigo;
+        es el objetivo de respaldo de quien no tiene camino a ninguna"""
+        r, c = np.divmod(self.posiciones, self.columnas)
+        salidas_r = np.array([s.r for s in salidas])
+        salidas_c = np.array([s.c for s in salidas])
+        distancias = np.abs(r[:, None] - salidas_r) + np.abs(c[:, None] - salidas_c)
+        mas_cercana = np.argmin(distancias, axis=1)
+        return salidas_r[mas_cercana], salidas_c[mas_cercana]
+
+    # ----------------- MUERTE Y REAPARICIÓN -----------------
+    def matar(self, indices, ahora):
+        self.vivos[indices] = False
+        self.tiempos_muerte[indices] = ahora
+
+    def caer_en_trampas(self, mapa, ahora):
+        """Mata a los enemigos vivos sobre trampas activas (uno por trampa);
+        devuelve las celdas de las trampas que se activaron"""
+        celdas = np.frombuffer(mapa.celdas, dtype=np.uint8)
+        en_trampa = np.flatnonzero(self.vivos & (celdas[self.posiciones] == Trampa.codigo))
+        if not len(en_trampa):
+            return []
+        # El primero de cada celda la activa; la trampa desaparece con él
+        trampas, primeros = np.unique(self.posiciones[en_trampa], return_index=True)
+        activadas = []
+        for i, k in zip(trampas.tolist(), en_trampa[primeros].tolist()):
+            trampa = mapa.trampas[i]
+            if trampa.activa:
+                trampa.activar_trampa()
+                self.matar(k, ahora)
+                activadas.append(i)
+        return activadas
+
+    def _muestrear_libres(self, mapa, cantidad, origen=None, distancia_minima=DISTANCIA_APARICION,
+                          campo_salidas=None):
+        """`cantidad` casillas Camino al azar (pueden repetirse) lejos de origen"""
+        libres = np.array(mapa.libres().todas, dtype=np.int64)
+        if origen is not None and len(libres):
+            r, c = np.divmod(libres, self.columnas)
+            lejos = libres[np.abs(r - origen.r) + np.abs(c - origen.c) >= distancia_minima]
+            if len(lejos):
+                libres = lejos
+        if campo_salidas is not None and len(libres):
+            # Como generador.filtro_aparicion: con camino a una salida y no pegadas a ella
+            distancias = np.frombuffer(campo_salidas.distancias, dtype=np.int32)
+            justas = libres[distancias[libres] >= DISTANCIA_APARICION_SALIDA]
+            if len(justas):
+                libres = justas
+        if not len(libres):
+            return np.zeros(0, dtype=np.int64)
+        return libres[self.rng.integers(0, len(libres), cantidad)]
+
+    def reaparecer(self, mapa, ahora, origen, maximo=None, campo_salidas=None):
+        """Revive a los muertos hace TIEMPO_REAPARICION_ENEMIGO segundos o más
+        (a lo sumo `maximo`); devuelve cuántos revivieron"""
+        listos = np.flatnonzero(~self.vivos & (ahora - self.tiempos_muerte >= TIEMPO_REAPARICION_ENEMIGO))
+        return self._revivir(mapa, listos, origen, maximo, campo_salidas=campo_salidas)
+
+    def revivir_muertos(self, mapa, cantidad, origen, distancia_minima=DISTANCIA_APARICION,
+                        campo_salidas=None):
+        """Revive ya a `cantidad` enemigos muertos (los que murieron primero)"""
+        muertos = np.flatnonzero(~self.vivos)
+        muertos = muertos[np.argsort(self.tiempos_muerte[muertos], kind="stable")]
+        return self._revivir(mapa, muertos, origen, cantidad, distancia_minima, campo_salidas)
+
+    def _revivir(self, mapa, indices, origen, maximo=None, distancia_minima=DISTANCIA_APARICION,
+                 campo_salidas=None):
+        if maximo is not None:
+            indices = indices[:max(maximo, 0)]
+        if not len(indices):
+            return 0
+        posiciones = self._muestrear_libres(mapa, len(indices), origen, distancia_minima, campo_salidas)
+        if not len(posiciones):
+            return 0
+        self.posiciones[indices] = posiciones
+        self.vivos[indices] = True
+        return len(indices)
+
+
+# ----------------- SIMULACIÓN CON ENJAMBRE -----------------
+class SimulacionEnjambre(Simulacion):
+    """Simulacion con los enemigos en un EnjambreEnemigos.
+
+    - Todos los enemigos se mueven juntos cada frames_enemigo ticks (no hay
+      temporizador por enemigo).
+    - self.enemigos es el enjambre: se puede dibujar con RenderizadorMapa.
+    - Las reglas de puntaje son las de Simulacion; en modo cazador los
+      enemigos que escapan o son atrapados vuelven a aparecer de
+      inmediato, como generar_nuevo_enemigo.
+    - No se puede grabar con Grabadora (la repetición usa enemigos normales).
+    """
+
+    def __init__(self, modo="escapa", dificultad="facil", generador=None, reloj=None, rng=None,
+                 num_enemigos=NUM_ENEMIGOS, semilla=None, perfilador=None):
+        super().__init__(modo, dificultad, generador, reloj, rng, 0, semilla, perfilador)
+        self.num_enemigos = num_enemigos
+        self.enjambre = EnjambreEnemigos.aleatorio(self.mapa, num_enemigos, self.jugador.posicion,
+                                                   self.rng.randrange(2 ** 32),
+                                                   self.generador.distancias_salidas())
+        self.enemigos = self.enjambre
+
+    def mover_programados(self):
+        if self.tick % self.frames_enemigo == 0:
+            with self.perfilador.fase("enemigos"):
+                self.mover_enemigos()
+
+    def mover_enemigos(self, enemigos=None):
+        """Mueve a todo el enjambre y hace reaparecer a los que ya pueden"""
+        enjambre = self.enjambre
+        if self.modo == "cazador" and self.generador.salidas:
+            # Gradiente del campo de las salidas; en línea recta solo quien no tiene camino
+            enjambre.mover(self.mapa, enjambre.salidas_mas_cercanas(self.generador.salidas),
+                           self.generador.distancias_salidas())
+        else:
+            # El BFS desde el jugador solo hace falta si se persigue o huye de él
+            self.campo_jugador.actualizar(self.jugador.posicion)
+            enjambre.mover(self.mapa, self.jugador.posicion, self.campo_jugador,
+                           huir=self.modo == "cazador")
+        with self.perfilador.fase("reaparicion"):
+            enjambre.reaparecer(self.mapa, self.reloj(), self.jugador.posicion,
+                                campo_salidas=self.generador.distancias_salidas())
+
+    def verificar_colisiones(self):
+        """Verifica colisiones entre jugador y enemigos/trampas"""
+        ahora = self.reloj()
+        atrapados = self.enjambre.en_celda(self._celda(self.jugador.posicion))
+        if len(atrapados):
+            if self.modo == "escapa":
+                self.terminar(False, "Te atraparon!")
+                return
+            self.enjambre.matar(atrapados, ahora)
+            self.jugador.puntaje += 200 * len(atrapados)
+            self.generar_nuevo_enemigo()
+
+        if self.modo == "escapa":
+            for i in self.enjambre.caer_en_trampas(self.mapa, ahora):
+                self.jugador.puntaje += 50
+                self.jugador.trampas_activas -= 1
+                posicion = Punto(*divmod(i, self.mapa.columnas))
+                self.mapa.poner(posicion.r, posicion.c, Camino.codigo)
+                self.celdas_cambiadas.append(posicion)
+
+    def verificar_victoria(self):
+        """Verifica condiciones de victoria y enemigos en salidas"""
+        if self.modo == "cazador" and not self.terminado:
+            celdas = np.frombuffer(self.mapa.celdas, dtype=np.uint8)
+            escaparon = np.flatnonzero(self.enjambre.vivos &
+                                       (celdas[self.enjambre.posiciones] == Salida.codigo))
+            if len(escaparon):
+                self.jugador.puntaje = max(0, self.jugador.puntaje - 100 * len(escaparon))
+                self.enjambre.matar(escaparon, self.reloj())
+                self.generar_nuevo_enemigo()
+        super().verificar_victoria()
+
+    def generar_nuevo_enemigo(self):
+        """Revive enemigos muertos hasta volver a num_enemigos vivos"""
+        faltan = self.num_enemigos - self.enjambre.cantidad_vivos()
+        if faltan > 0:
+            self.enjambre.revivir_muertos(self.mapa, faltan, self.jugador.posicion, 6,
+                                          self.generador.distancias_salidas())
@@ -0,0 +1,134 @@
+# Escapa del Laberinto - jugador y enemigos
+# Isaac Orozco y Daniel Araya
+import time
+
+from laberinto.constantes import (Punto, ENERGIA_MAXIMA, COSTO_CORRER_POR_MOVIMIENTO,
+                                  RECUPERACION_ENERGIA_POR_TURNO, MAX_TRAMPAS_ACTIVAS,
+                                  COOLDOWN_TRAMPA, TIEMPO_REAPARICION_ENEMIGO)
+from laberinto.generador import es_posicion_valida, colocar_trampa
+
+
+# ----------------- CLASE JUGADOR -----------------
+class Jugador:
+    def __init__(self, posicion):
+        self.posicion = posicion
+        self.energia = ENERGIA_MAXIMA
+        self.trampas_activas = 0
+        self.ultimo_uso_trampa = float("-inf")  # la primera trampa no tiene cooldown
+        self.puntaje = 0
+        self.vivo = True
+        self.direccion = "down"   # Dirección inicial por defecto
+
+
+    def mover(self, mapa, nueva_r, nueva_c, corriendo=False):
+        """Mueve el jugador a una nueva posición"""
+        if not es_posicion_valida(mapa, nueva_r, nueva_c, es_jugador=True):
+            return False
+
+        if corriendo:
+            if self.energia >= COSTO_CORRER_POR_MOVIMIENTO:
+                self.energia -= COSTO_CORRER_POR_MOVIMIENTO
+            else:
+                return False  # No hay suficiente energía para correr
+
+        self.posicion = Punto(nueva_r, nueva_c)
+        return True
+
+    def recuperar_energia(self):
+        """Recupera energía por turno"""
+        self.energia = min(self.energia + RECUPERACION_ENERGIA_POR_TURNO, ENERGIA_MAXIMA)
+
+    def puede_colocar_trampa(self, ahora=None):
+        """Verifica si puede colocar una trampa (ahora: reloj de la simulación)"""
+        tiempo_actual = time.time() if ahora is None else ahora
+        return (self.trampas_activas < MAX_TRAMPAS_ACTIVAS and
+                tiempo_actual - self.ultimo_uso_trampa >= COOLDOWN_TRAMPA)
+
+    def colocar_trampa_en_mapa(self, mapa, ahora=None):
+        """Coloca una trampa en la posición actual del jugador"""
+        if ahora is None:
+            ahora = time.time()
+        if self.puede_colocar_trampa(ahora):
+            if colocar_trampa(mapa, self.posicion.r, self.posicion.c, ahora):
+                self.trampas_activas += 1
+                self.ultimo_uso_trampa = ahora
+                return True
+        return False
+
+
+# ----------------- CLASE ENEMIGO -----------------
+class Enemigo:
+    def __init__(self, posicion):
+        self.posicion = posicion
+        self.vivo = True
+        self.tiempo_muerte = 0
+        self.proximo_movimiento = 0  # tick de la simulación en que vuelve a moverse
+        self.indice = None  # posición en Simulacion.enemigos
+
+    def mover_hacia_objetivo(self, mapa, objetivo, huir=False, campo=None):
+        """Mueve el enemigo hacia o lejos del objetivo.
+
+        Si se pasa un CampoDistancias con raíz en el objetivo se sigue su
+        gradiente (respeta muros, lianas y túneles); si no, se usa la
+        distancia Manhattan como heurística simple.
+        """
+        if not self.vivo:
+            return False
+
+        if campo is not None and campo.distancia(self.posicion) >= 0:
+            return self.seguir_campo(campo, huir)
+
+        mejor_movimiento = None
+        # Si huye: iniciar con -inf para buscar la mayor distancia
+        # Si persigue: iniciar con inf para buscar la menor distancia
+        mejor_distancia = float('-inf') if huir else float('inf')
+
+        direcciones = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+        for dr, dc in direcciones:
+            nueva_r = self.posicion.r + dr
+            nueva_c = self.posicion.c + dc
+
+            if es_posicion_valida(mapa, nueva_r, nueva_c, es_jugador=False):
+                # Calcular distancia Manhattan al objetivo
+                distancia = abs(nueva_r - objetivo.r) + abs(nueva_c - objetivo.c)
+
+                if huir:
+                    # Si está huyendo, prefiere mayor distancia
+                    if distancia > mejor_distancia:
+                        mejor_distancia = distancia
+                        mejor_movimiento = Punto(nueva_r, nueva_c)
+                else:
+                    # Si está persiguiendo, prefiere menor distancia
+                    if distancia < mejor_distancia:
+                        mejor_distancia = distancia
+                        mejor_movimiento = Punto(nueva_r, nueva_c)
+
+        if mejor_movimiento:
+            self.posicion = mejor_movimiento
+            return True
+
+        return False
+
+    def seguir_campo(self, campo, huir=False):
+        """Da un paso por el gradiente de un CampoDistancias (hacia sus orígenes,
+        o lejos si huir); devuelve False si no puede moverse"""
+        if not self.vivo:
+            return False
+        siguiente = campo.siguiente_paso(self.posicion, huir)
+        if siguiente:
+            self.posicion = siguiente
+            return True
+        return False
+
+    def morir(self, ahora=None):
+        """Marca al enemigo como muerto"""
+        self.vivo = False
+        self.tiempo_muerte = time.time() if ahora is None else ahora
+
+    def puede_reaparecer(self, ahora=None):
+        """Verifica si el enemigo puede reaparecer"""
+        if ahora is None:
+            ahora = time.time()
+        return (not self.vivo and
+                ahora - self.tiempo_muerte >= TIEMPO_REAPARICION_ENEMIGO)
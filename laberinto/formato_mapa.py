@@ -0,0 +1,184 @@
+# Escapa del Laberinto - mapas y paquetes de niveles en disco
+# Isaac Orozco y Daniel Araya
+#
+# Un mapa guardado se abre sin generar ni validar nada: las celdas están
+# tal cual las usa GrillaMapa (un byte por casilla), así que cargar es una
+# copia de memoria. Los archivos se abren con mmap; en un paquete solo se
+# lee el nivel que se pide.
+#
+# Formato de mapa .lbm (little-endian):
+#   "LBM" + versión, filas, columnas, semilla, jugador (fila, columna),
+#   cantidad de salidas, salidas (fila, columna) y las celdas sin comprimir
+# Formato de paquete .lbp:
+#   "LBP" + versión, cantidad de niveles, (offset, largo) de cada nivel y
+#   luego cada nivel en formato .lbm
+import mmap
+import os
+import struct
+
+from laberinto.constantes import Punto
+from laberinto.casillas import Camino, Trampa
+from laberinto.generador import GeneradorMapa
+
+MAGIA_MAPA = b"LBM"
+MAGIA_PAQUETE = b"LBP"
+VERSION = 1
+EXTENSION_MAPA = ".lbm"
+EXTENSION_PAQUETE = ".lbp"
+
+SIN_JUGADOR = 0xFFFF
+
+_ENCABEZADO = struct.Struct("<3sBHHQHHH")
+_SALIDA = struct.Struct("<HH")
+_ENCABEZADO_PAQUETE = struct.Struct("<3sBI")
+_ENTRADA_PAQUETE = struct.Struct("<QI")
+
+# Las trampas las pone el jugador durante la partida: se guardan como camino
+_SIN_TRAMPAS = bytes(Camino.codigo if codigo == Trampa.codigo else codigo for codigo in range(256))
+
+
+# ----------------- CODIFICACIÓN -----------------
+def codificar(generador):
+    """Bytes .lbm del mapa del generador"""
+    jugador = generador.posicion_jugador
+    datos = bytearray(_ENCABEZADO.pack(
+        MAGIA_MAPA, VERSION, generador.filas, generador.columnas, generador.semilla,
+        jugador.r if jugador else SIN_JUGADOR, jugador.c if jugador else SIN_JUGADOR,
+        len(generador.salidas)))
+    for salida in generador.salidas:
+        datos += _SALIDA.pack(salida.r, salida.c)
+    datos += generador.mapa.celdas.translate(_SIN_TRAMPAS)
+    return bytes(datos)
+
+
+def decodificar(buffer, inicio=0):
+    """GeneradorMapa a partir de un mapa .lbm que empieza en buffer[inicio:]"""
+    try:
+        magia, version, filas, columnas, semilla, r, c, num_salidas = _ENCABEZADO.unpack_from(buffer, inicio)
+    except struct.error:
+        raise ValueError("Mapa incompleto") from None
+    if magia != MAGIA_MAPA:
+        raise ValueError("No es un mapa de Escapa del Laberinto")
+    if version != VERSION:
+        raise ValueError(f"Versión de mapa no soportada: {version}")
+
+    i = inicio + _ENCABEZADO.size
+    if len(buffer) < i + _SALIDA.size * num_salidas:
+        raise ValueError("Mapa incompleto")
+    salidas = []
+    for _ in range(num_salidas):
+        salidas.append(Punto(*_SALIDA.unpack_from(buffer, i)))
+        i += _SALIDA.size
+    total = filas * columnas
+    with memoryview(buffer) as vista:
+        celdas = bytearray(vista[i:i + total])
+    if len(celdas) != total:
+        raise ValueError("Mapa incompleto")
+    if total and max(celdas) >= Trampa.codigo:
+        raise ValueError("Código de casilla inválido en el mapa")
+
+    jugador = None if r == SIN_JUGADOR else Punto(r, c)
+    # Una posición fuera de la grilla fallaría recién durante la partida
+    for punto in salidas + ([jugador] if jugador else []):
+        if not (0 <= punto.r < filas and 0 <= punto.c < columnas):
+            raise ValueError(f"Posición fuera del mapa: ({punto.r}, {punto.c})")
+    return GeneradorMapa.desde_celdas(filas, columnas, celdas, salidas, jugador, semilla)
+
+
+def _abrir(ruta):
+    """mmap de solo lectura del archivo"""
+    with open(ruta, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Archivo vacío: {ruta}")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _escribir(ruta, datos):
+    # Escribir aparte y reemplazar: nunca queda un archivo a medias
+    with open(ruta + ".tmp", "wb") as f:
+        f.write(datos)
+    os.replace(ruta + ".tmp", ruta)
+
+
+# ----------------- MAPAS -----------------
+def guardar_mapa(generador, ruta):
+    _escribir(ruta, codificar(generador))
+    return ruta
+
+
+def cargar_mapa(ruta):
+    mapa = _abrir(ruta)
+    try:
+        return decodificar(mapa)
+    finally:
+        mapa.close()
+
+
+# ----------------- PAQUETES DE NIVELES -----------------
+def guardar_paquete(generadores, ruta):
+    """Escribe varios mapas en un solo archivo .lbp; devuelve la ruta"""
+    niveles = [codificar(generador) for generador in generadores]
+    offset = _ENCABEZADO_PAQUETE.size + _ENTRADA_PAQUETE.size * len(niveles)
+    datos = bytearray(_ENCABEZADO_PAQUETE.pack(MAGIA_PAQUETE, VERSION, len(niveles)))
+    for nivel in niveles:
+        datos += _ENTRADA_PAQUETE.pack(offset, len(nivel))
+        offset += len(nivel)
+    for nivel in niveles:
+        datos += nivel
+    _escribir(ruta, datos)
+    return ruta
+
+
+class PaqueteMapas:
+    """Paquete .lbp abierto con mmap; paquete[k] decodifica solo el nivel k.
+
+    Se usa con `with` (o cerrar()) para soltar el archivo.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._mapa = _abrir(ruta)
+        try:
+            magia, version, cantidad = _ENCABEZADO_PAQUETE.unpack_from(self._mapa)
+        except struct.error:
+            self.cerrar()
+            raise ValueError("Paquete incompleto") from None
+        if magia != MAGIA_PAQUETE:
+            self.cerrar()
+            raise ValueError("No es un paquete de niveles de Escapa del Laberinto")
+        if version != VERSION:
+            self.cerrar()
+            raise ValueError(f"Versión de paquete no soportada: {version}")
+        if len(self._mapa) < _ENCABEZADO_PAQUETE.size + cantidad * _ENTRADA_PAQUETE.size:
+            self.cerrar()
+            raise ValueError("Paquete incompleto")
+        self.cantidad = cantidad
+
+    def __len__(self):
+        return self.cantidad
+
+    def __getitem__(self, k):
+        if not 0 <= k < self.cantidad:
+            raise IndexError(k)
+        try:
+            offset, _ = _ENTRADA_PAQUETE.unpack_from(
+                self._mapa, _ENCABEZADO_PAQUETE.size + k * _ENTRADA_PAQUETE.size)
+        except struct.error:
+            raise ValueError("Paquete incompleto") from None
+        return decodificar(self._mapa, offset)
+
+    def __iter__(self):
+        for k in range(self.cantidad):
+            yield self[k]
+
+    def cerrar(self):
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
@@ -0,0 +1,496 @@
+# Escapa del Laberinto - generación del mapa
+# Isaac Orozco y Daniel Araya
+import random
+from array import array
+from collections import deque
+
+from laberinto.constantes import FILAS, COLUMNAS, NUM_ENEMIGOS, DISTANCIA_APARICION_SALIDA, Punto
+from laberinto.casillas import (Camino, Muro, Liana, Tunel, Salida, Trampa,
+                                GrillaMapa)
+from laberinto.pathfinding import CampoDistancias
+
+
+# ----------------- CONJUNTOS DISJUNTOS -----------------
+class ConjuntosDisjuntos:
+    """Union-find sobre índices planos de celdas.
+
+    - unir(i, j) y raiz(i) cuestan casi O(1) (unión por tamaño y compresión
+      de caminos a la mitad).
+    - El generador lo mantiene al día mientras abre casillas, así que saber
+      si dos casillas están conectadas no necesita un BFS.
+    """
+
+    def __init__(self, total):
+        self.padre = array("i", range(total))
+        self.tamano = array("i", [1]) * total
+
+    def raiz(self, i):
+        padre = self.padre
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]
+            i = padre[i]
+        return i
+
+    def agregar(self, i, raiz):
+        """Pone la celda aislada i en el conjunto de raiz, en O(1)"""
+        self.padre[i] = raiz
+        self.tamano[raiz] += 1
+
+    def unir(self, i, j):
+        i, j = self.raiz(i), self.raiz(j)
+        if i == j:
+            return
+        if self.tamano[i] < self.tamano[j]:
+            i, j = j, i
+        self.padre[j] = i
+        self.tamano[i] += self.tamano[j]
+
+
+# ----------------- GENERADOR DE MAPA -----------------
+class GeneradorMapa:
+    # El mapa sale válido en una sola pasada: generar_mapa_juego no reintenta
+    conexo_por_construccion = True
+
+    def __init__(self, filas=FILAS, columnas=COLUMNAS, semilla=None):
+        self.filas = filas
+        self.columnas = columnas
+        # Cada generador usa su propio RNG: la misma semilla da el mismo mapa
+        self.semilla = semilla if semilla is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.semilla)
+        self.mapa = GrillaMapa(filas, columnas)
+        self.posicion_jugador = None
+        self.salidas = []
+        # Componentes de las casillas que pisa el jugador, al día mientras se genera
+        self.conjuntos = None
+        self.version_conjuntos = None
+        self.inicio_laberinto = None  # índice donde empezó el DFS
+        self.campo_salidas = None     # ver distancias_salidas()
+
+    @classmethod
+    def desde_celdas(cls, filas, columnas, celdas, salidas, posicion_jugador, semilla=None):
+        """Generador con un mapa ya hecho (celdas: un código por casilla, sin trampas)"""
+        generador = cls(filas, columnas, semilla=semilla)
+        generador.mapa.celdas[:] = celdas
+        generador.mapa.recalcular_paso()
+        generador.salidas = list(salidas)
+        generador.posicion_jugador = posicion_jugador
+        return generador
+
+    def guardar(self, ruta):
+        """Guarda el mapa en un archivo .lbm (ver laberinto.formato_mapa)"""
+        from laberinto.formato_mapa import guardar_mapa
+        return guardar_mapa(self, ruta)
+
+    @staticmethod
+    def cargar(ruta):
+        """Abre un mapa .lbm sin generar ni validar nada"""
+        from laberinto.formato_mapa import cargar_mapa
+        return cargar_mapa(ruta)
+
+    def generar_mapa_aleatorio(self):
+        """Genera un mapa aleatorio con camino garantizado a la salida"""
+        # Reiniciar el RNG para que generar dos veces con la misma semilla dé lo mismo
+        self.rng.seed(self.semilla)
+        self.salidas = []
+        self.posicion_jugador = None
+
+        # Inicializar mapa con muros
+        self.mapa = GrillaMapa(self.filas, self.columnas)
+        self.conjuntos = ConjuntosDisjuntos(self.filas * self.columnas)
+
+        # Generar caminos usando algoritmo de laberinto
+        self._generar_laberinto()
+
+        # Agregar elementos especiales
+        self._agregar_lianas()
+        self._agregar_tuneles()
+        # Salidas y jugador solo en la componente del laberinto: ya quedan conectados
+        self._colocar_salidas()
+        self._colocar_jugador()
+
+        self.version_conjuntos = self.mapa.version_paso
+        return self.mapa
+
+    def _abrir(self, r, c, codigo=Camino.codigo):
+        """Pone una casilla que pisa el jugador y la une con sus vecinas transitables"""
+        self.mapa.poner(r, c, codigo)
+        i = r * self.columnas + c
+        paso = self.mapa.paso_jugador
+        for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.filas and 0 <= nc < self.columnas and paso[nr * self.columnas + nc]:
+                self.conjuntos.unir(i, nr * self.columnas + nc)
+
+    def _generar_laberinto(self):
+        """Genera caminos usando algoritmo de búsqueda en profundidad"""
+        # Stack para DFS
+        stack = []
+        visitados = set()
+
+        # Empezar desde una posición aleatoria (debe ser impar para el algoritmo)
+        inicio_r = self.rng.randrange(1, self.filas - 1, 2)
+        inicio_c = self.rng.randrange(1, self.columnas - 1, 2)
+
+        stack.append((inicio_r, inicio_c))
+        self.mapa.poner(inicio_r, inicio_c, Camino.codigo)
+        visitados.add((inicio_r, inicio_c))
+
+        # El DFS forma un árbol: todo lo que abre queda en la componente del
+        # inicio, así que se agrega directo a ella sin mirar las vecinas
+        raiz = self.inicio_laberinto = inicio_r * self.columnas + inicio_c
+
+        direcciones = [(0, 2), (2, 0), (0, -2), (-2, 0)]  # Derecha, Abajo, Izquierda, Arriba
+
+        while stack:
+            actual_r, actual_c = stack[-1]
+
+            # Buscar vecinos no visitados
+            vecinos = []
+            for dr, dc in direcciones:
+                nuevo_r, nuevo_c = actual_r + dr, actual_c + dc
+                if (0 < nuevo_r < self.filas - 1 and
+                        0 < nuevo_c < self.columnas - 1 and
+                        (nuevo_r, nuevo_c) not in visitados):
+                    vecinos.append((nuevo_r, nuevo_c))
+
+            if vecinos:
+                # Elegir vecino aleatorio
+                siguiente_r, siguiente_c = self.rng.choice(vecinos)
+
+                # Crear camino entre actual y siguiente
+                pared_r = actual_r + (siguiente_r - actual_r) // 2
+                pared_c = actual_c + (siguiente_c - actual_c) // 2
+
+                self.mapa.poner(pared_r, pared_c, Camino.codigo)
+                self.mapa.poner(siguiente_r, siguiente_c, Camino.codigo)
+                self.conjuntos.agregar(pared_r * self.columnas + pared_c, raiz)
+                self.conjuntos.agregar(siguiente_r * self.columnas + siguiente_c, raiz)
+
+                visitados.add((siguiente_r, siguiente_c))
+                stack.append((siguiente_r, siguiente_c))
+            else:
+                stack.pop()
+
+        # Agregar caminos adicionales para hacer el laberinto menos lineal
+        self._agregar_caminos_adicionales()
+
+    def _agregar_caminos_adicionales(self):
+        """Agrega caminos adicionales para hacer el mapa más interesante"""
+        num_caminos_extra = self.rng.randint(5, 15)
+
+        for _ in range(num_caminos_extra):
+            r = self.rng.randint(1, self.filas - 2)
+            c = self.rng.randint(1, self.columnas - 2)
+
+            # Solo convertir muros que tengan al menos un camino adyacente
+            if self.mapa.tipo(r, c) == Muro.codigo:
+                caminos_adyacentes = 0
+                for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                    nr, nc = r + dr, c + dc
+                    if (self.mapa.dentro(nr, nc) and
+                            self.mapa.tipo(nr, nc) == Camino.codigo):
+                        caminos_adyacentes += 1
+
+                if caminos_adyacentes >= 1:
+                    self._abrir(r, c)
+
+    def _agregar_lianas(self):
+        """Agrega lianas en posiciones estratégicas"""
+        num_lianas = self.rng.randint(8, 15)
+
+        for _ in range(num_lianas):
+            r = self.rng.randint(0, self.filas - 1)
+            c = self.rng.randint(0, self.columnas - 1)
+
+            if self.mapa.tipo(r, c) == Muro.codigo:
+                # Verificar que tenga al menos un camino cercano
+                tiene_camino_cercano = False
+                for dr in range(-2, 3):
+                    for dc in range(-2, 3):
+                        nr, nc = r + dr, c + dc
+                        if (self.mapa.dentro(nr, nc) and
+                                self.mapa.tipo(nr, nc) == Camino.codigo):
+                            tiene_camino_cercano = True
+                            break
+                    if tiene_camino_cercano:
+                        break
+
+                if tiene_camino_cercano:
+                    self.mapa.poner(r, c, Liana.codigo)
+
+    def _agregar_tuneles(self):
+        """Agrega túneles para dar ventaja al jugador"""
+        num_tuneles = self.rng.randint(5, 10)
+
+        for _ in range(num_tuneles):
+            r = self.rng.randint(0, self.filas - 1)
+            c = self.rng.randint(0, self.columnas - 1)
+
+            if self.mapa.tipo(r, c) == Muro.codigo:
+                self._abrir(r, c, Tunel.codigo)
+
+    def _colocar_salidas(self):
+        """Coloca salidas en los bordes junto a un camino del laberinto principal"""
+        self.salidas = []
+        num_salidas = self.rng.randint(2, 4)
+        principal = self.conjuntos.raiz(self.inicio_laberinto)
+
+        def conectada(r, c):
+            return (self.mapa.tipo(r, c) == Camino.codigo and
+                    self.conjuntos.raiz(r * self.columnas + c) == principal)
+
+        # Posibles posiciones de salida (bordes). Las columnas impares de la
+        # fila 1 son nodos del laberinto, así que nunca faltan candidatas
+        posiciones_validas = []
+
+        # Borde superior e inferior
+        for c in range(1, self.columnas - 1):  # Evitar esquinas
+            if conectada(1, c):
+                posiciones_validas.append((0, c))
+            if conectada(self.filas - 2, c):
+                posiciones_validas.append((self.filas - 1, c))
+
+        # Borde izquierdo y derecho
+        for r in range(1, self.filas - 1):
+            if conectada(r, 1):
+                posiciones_validas.append((r, 0))
+            if conectada(r, self.columnas - 2):
+                posiciones_validas.append((r, self.columnas - 1))
+
+        # Elegir posiciones aleatorias para las salidas
+        num_salidas_real = min(num_salidas, len(posiciones_validas))
+        if num_salidas_real > 0:
+            salidas_elegidas = self.rng.sample(posiciones_validas, num_salidas_real)
+            for r, c in salidas_elegidas:
+                self._abrir(r, c, Salida.codigo)
+                self.salidas.append(Punto(r, c))
+
+    def _colocar_jugador(self):
+        """Un nodo del laberinto al azar a 3 o más casillas de toda salida.
+
+        Los nodos (fila y columna impares) los abrió el DFS, así que están en
+        la misma componente que las salidas. Se sortea entre los nodos
+        permitidos sin recorrer el mapa: solo se listan los pocos que quedan
+        cerca de alguna salida.
+        """
+        por_fila = (self.columnas - 1) // 2
+        total = por_fila * ((self.filas - 1) // 2)
+        if not self.salidas or not total:
+            return
+
+        # Nodos k = (r // 2) * por_fila + c // 2 demasiado cerca de una salida
+        cercanos = set()
+        for salida in self.salidas:
+            for r in range(max(salida.r - 2, 1) | 1, min(salida.r + 3, self.filas - 1), 2):
+                for c in range(max(salida.c - 2, 1) | 1, min(salida.c + 3, self.columnas - 1), 2):
+                    if abs(r - salida.r) + abs(c - salida.c) < 3:
+                        cercanos.add((r // 2) * por_fila + c // 2)
+
+        if len(cercanos) < total:
+            # El k-ésimo nodo permitido: saltar los cercanos que quedan antes
+            k = self.rng.randrange(total - len(cercanos))
+            for cercano in sorted(cercanos):
+                if cercano <= k:
+                    k += 1
+        else:
+            # Si no se encuentra una buena posición, cualquier nodo sirve
+            k = self.rng.randrange(total)
+        self.posicion_jugador = Punto(2 * (k // por_fila) + 1, 2 * (k % por_fila) + 1)
+
+    def distancias_salidas(self):
+        """CampoDistancias desde todas las salidas a la vez (BFS multi-origen
+        por las casillas que pisan los enemigos).
+
+        Las salidas no se mueven: se calcula una vez por mapa y solo se
+        rehace si cambia el paso (por ejemplo al generar una región nueva).
+        distancia(pos) es el camino real a la salida más cercana y
+        siguiente_paso(pos) el paso que acerca a ella.
+        """
+        if self.campo_salidas is None or self.campo_salidas.mapa is not self.mapa:
+            self.campo_salidas = CampoDistancias(self.mapa)
+        self.campo_salidas.actualizar_varios(self.salidas)
+        return self.campo_salidas
+
+    def explorar(self, posicion):
+        """El jugador llegó a posicion; aquí el mapa ya está completo (ver GeneradorMapaPorRegiones)"""
+
+    def completar(self):
+        """Termina de generar lo que falte del mapa; aquí ya está completo"""
+
+    def completo(self):
+        return True
+
+    def verificar_camino_valido(self):
+        """Verifica que existe al menos un camino válido desde el jugador hasta una salida"""
+        if not self.posicion_jugador or not self.salidas:
+            return False
+
+        # Recién generado: las componentes del union-find ya responden sin BFS
+        if self.conjuntos is not None and self.version_conjuntos == self.mapa.version_paso:
+            raiz = self.conjuntos.raiz(self.posicion_jugador.r * self.columnas + self.posicion_jugador.c)
+            return any(self.conjuntos.raiz(s.r * self.columnas + s.c) == raiz for s in self.salidas)
+
+        # BFS para encontrar camino
+        queue = deque([self.posicion_jugador])
+        visitados = {self.posicion_jugador}
+
+        direcciones = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+        while queue:
+            actual = queue.popleft()
+
+            # Verificar si llegamos a una salida
+            if actual in self.salidas:
+                return True
+
+            # Explorar vecinos
+            for dr, dc in direcciones:
+                nr, nc = actual.r + dr, actual.c + dc
+                nuevo_punto = Punto(nr, nc)
+
+                if (self.mapa.dentro(nr, nc) and
+                        nuevo_punto not in visitados and
+                        self.mapa.accesible(nr, nc, es_jugador=True)):
+                    visitados.add(nuevo_punto)
+                    queue.append(nuevo_punto)
+
+        return False
+
+    def mostrar_mapa(self):
+        """Muestra el mapa en consola para depuración"""
+        for r in range(self.filas):
+            fila = ""
+            for c in range(self.columnas):
+                if self.posicion_jugador and r == self.posicion_jugador.r and c == self.posicion_jugador.c:
+                    fila += "J "
+                else:
+                    fila += self.mapa[r][c].simbolo + " "
+            print(fila)
+        print()
+
+
+
+
+        
+
+# ----------------- FUNCIÓN PRINCIPAL DE GENERACIÓN -----------------
+def generar_mapa_juego(semilla=None, filas=FILAS, columnas=COLUMNAS, mostrar_progreso=True,
+                       clase_generador=GeneradorMapa):
+    """Genera un mapa válido para el juego.
+
+    Con la misma semilla se obtiene siempre el mismo mapa: la semilla de
+    cada intento se deriva de ella. El generador devuelto guarda en
+    .semilla la del intento que funcionó. Para mapas muy grandes se puede
+    pasar clase_generador=GeneradorMapaNumpy. Los generadores conexos por
+    construcción hacen un solo intento; el mapa simple de respaldo queda
+    para los que no (o para mapas demasiado chicos para tener salidas).
+    """
+    max_intentos = 1 if clase_generador.conexo_por_construccion else 10
+    rng_intentos = random.Random(semilla)
+
+    for intento in range(max_intentos):
+        generador = clase_generador(filas, columnas, semilla=rng_intentos.randrange(2 ** 32))
+        generador.generar_mapa_aleatorio()
+
+        # Verificar que el mapa es válido
+        if generador.verificar_camino_valido():
+            if mostrar_progreso:
+                print(f"Mapa generado exitosamente en el intento {intento + 1}")
+            return generador
+        elif mostrar_progreso:
+            print(f"Intento {intento + 1} falló - regenerando mapa...")
+
+    # Si no se pudo generar un mapa válido, crear uno simple
+    if mostrar_progreso:
+        print("Generando mapa simple como respaldo...")
+    return _generar_mapa_simple(filas, columnas)
+
+
+def _generar_mapa_simple(filas=FILAS, columnas=COLUMNAS):
+    """Genera un mapa simple garantizado como respaldo"""
+    generador = GeneradorMapa(filas, columnas)
+
+    # Crear mapa simple con caminos en forma de cruz
+    for r in range(generador.filas):
+        for c in range(generador.columnas):
+            if r == generador.filas // 2 or c == generador.columnas // 2:
+                generador.mapa.poner(r, c, Camino.codigo)
+            else:
+                generador.mapa.poner(r, c, Muro.codigo)
+
+    # Colocar salidas en las esquinas
+    generador.mapa.poner(0, 0, Salida.codigo)
+    generador.mapa.poner(0, generador.columnas - 1, Salida.codigo)
+    generador.salidas = [Punto(0, 0), Punto(0, generador.columnas - 1)]
+
+    # Colocar jugador en el centro
+    generador.posicion_jugador = Punto(generador.filas // 2, generador.columnas // 2)
+
+    return generador
+
+
+# ----------------- UTILIDADES DEL MAPA -----------------
+def obtener_posiciones_libres(mapa, tipo_casilla=None):
+    """Obtiene todas las posiciones libres del mapa"""
+    # Se recorre el arreglo plano de la grilla en vez de cada objeto Casilla
+    if tipo_casilla is None:
+        valores, buscado = mapa.paso_jugador, 1
+    else:
+        valores, buscado = mapa.celdas, tipo_casilla.codigo
+    columnas = mapa.columnas
+    posiciones = []
+    i = valores.find(buscado)
+    while i != -1:
+        posiciones.append(Punto(i // columnas, i % columnas))
+        i = valores.find(buscado, i + 1)
+    return posiciones
+
+
+def filtro_aparicion(campo_salidas):
+    """Condición de las casillas donde puede aparecer un enemigo (para
+    IndiceLibres.muestrear): con camino real a alguna salida y a
+    DISTANCIA_APARICION_SALIDA pasos o más de todas. None si no hay campo."""
+    if campo_salidas is None:
+        return None
+    distancias = campo_salidas.distancias
+    return lambda i: distancias[i] >= DISTANCIA_APARICION_SALIDA
+
+
+def obtener_posiciones_enemigos(mapa, num_enemigos=NUM_ENEMIGOS, posicion_jugador=None, rng=random,
+                                campo_salidas=None):
+    """Obtiene posiciones aleatorias válidas para colocar enemigos, evitando la posición del jugador.
+
+    Con campo_salidas (GeneradorMapa.distancias_salidas()) se evitan además
+    las casillas cerca de una salida o sin camino a ninguna (ver filtro_aparicion).
+    """
+    libres = mapa.libres()
+    # Mínimo 4 casillas (Manhattan) de distancia del jugador, si se proporciona
+    posiciones = libres.muestrear_varias(rng, num_enemigos, posicion_jugador, 4,
+                                         filtro_aparicion(campo_salidas))
+    if not posiciones:
+        # Si todo está muy cerca del jugador, cualquier casilla libre sirve
+        posiciones = libres.muestrear_varias(rng, num_enemigos)
+    return posiciones
+
+
+def es_posicion_valida(mapa, r, c, es_jugador=True):
+    """Verifica si una posición es válida para movimiento"""
+    return mapa.accesible(r, c, es_jugador)
+
+
+def colocar_trampa(mapa, r, c, ahora=None):
+    """Coloca una trampa en la posición especificada"""
+    if (mapa.dentro(r, c) and
+            mapa.tipo(r, c) == Camino.codigo):
+        mapa[r][c] = Trampa(ahora)
+        return True
+    return False
+
+
+def remover_trampa(mapa, r, c):
+    """Remueve una trampa y la convierte de vuelta en camino"""
+    if (mapa.dentro(r, c) and
+            mapa.tipo(r, c) == Trampa.codigo):
+        mapa.poner(r, c, Camino.codigo)
+        return True
+    return False
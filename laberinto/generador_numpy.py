@@ -0,0 +1,285 @@
+# Escapa del Laberinto - generación de mapas grandes con NumPy
+# Isaac Orozco y Daniel Araya
+#
+# Backend opcional: si numpy no está instalado el juego sigue funcionando
+# con GeneradorMapa. Pensado para mapas de cientos o miles de casillas por lado.
+from laberinto.constantes import FILAS, COLUMNAS, Punto
+from laberinto.casillas import Camino, Muro, Liana, Tunel, Salida, GrillaMapa
+from laberinto.generador import GeneradorMapa
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Área del mapa normal: las cantidades de lianas, túneles, etc. se escalan a partir de ella
+AREA_BASE = FILAS * COLUMNAS
+
+
+def suma_vecindario(arr, radio):
+    """Suma de cada ventana (2*radio+1)^2 alrededor de cada celda.
+
+    Equivale a convolucionar con un kernel de unos; se calcula con una
+    imagen integral (dos cumsum), así que cuesta O(filas * columnas).
+    """
+    k = 2 * radio + 1
+    integral = np.pad(arr.astype(np.int32), radio).cumsum(0).cumsum(1)
+    integral = np.pad(integral, ((1, 0), (1, 0)))
+    return (integral[k:, k:] - integral[:-k, k:]
+            - integral[k:, :-k] + integral[:-k, :-k])
+
+
+def etiquetar_componentes(paso):
+    """Etiqueta las componentes 4-conexas de una máscara booleana 2D.
+
+    Union-find vectorizado: en cada ronda cada arista cuelga la raíz mayor
+    de la menor y luego se comprimen los caminos saltando punteros. El
+    número de componentes al menos se reduce a la mitad por ronda.
+    Devuelve un arreglo de etiquetas (-1 en celdas sin paso).
+    """
+    filas, columnas = paso.shape
+    indices = np.arange(filas * columnas, dtype=np.int64).reshape(filas, columnas)
+    horizontal = paso[:, :-1] & paso[:, 1:]
+    vertical = paso[:-1, :] & paso[1:, :]
+    a = np.concatenate([indices[:, :-1][horizontal], indices[:-1, :][vertical]])
+    b = np.concatenate([indices[:, 1:][horizontal], indices[1:, :][vertical]])
+
+    etiquetas = np.arange(filas * columnas, dtype=np.int64)
+    while a.size:
+        la = etiquetas[a]
+        lb = etiquetas[b]
+        distintas = la != lb
+        if not distintas.any():
+            break
+        # Las aristas ya resueltas no vuelven a revisarse
+        a, b, la, lb = a[distintas], b[distintas], la[distintas], lb[distintas]
+        np.minimum.at(etiquetas, np.maximum(la, lb), np.minimum(la, lb))
+        while True:
+            siguiente = etiquetas[etiquetas]
+            if np.array_equal(siguiente, etiquetas):
+                break
+            etiquetas = siguiente
+
+    etiquetas[~paso.ravel()] = -1
+    return etiquetas.reshape(filas, columnas)
+
+
+# ----------------- GENERADOR CON NUMPY -----------------
+class GeneradorMapaNumpy(GeneradorMapa):
+    """GeneradorMapa para mapas muy grandes.
+
+    - Trabaja sobre una vista numpy (self.tipos) del bytearray de la grilla,
+      así que el resultado es la misma GrillaMapa que usa el juego.
+    - Lianas, túneles, caminos extra, salidas y jugador se colocan con
+      operaciones sobre arreglos completos (vecindarios como convoluciones).
+    - La validación usa componentes conexas en vez de un BFS casilla a casilla.
+    - El DFS del laberinto es secuencial por naturaleza: se mantiene, pero
+      sobre índices planos en vez de tuplas y conjuntos.
+    - Las cantidades de elementos especiales crecen con el área del mapa.
+    """
+    # Sin union-find (todo se escribe con arreglos): se valida con componentes
+    conexo_por_construccion = False
+
+    def __init__(self, filas=FILAS, columnas=COLUMNAS, semilla=None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("GeneradorMapaNumpy necesita numpy (pip install numpy)")
+        super().__init__(filas, columnas, semilla)
+        self.tipos = None
+
+    def _escalar(self, cantidad):
+        return max(cantidad, cantidad * self.filas * self.columnas // AREA_BASE)
+
+    def generar_mapa_aleatorio(self):
+        """Genera un mapa aleatorio con camino garantizado a la salida"""
+        self.rng.seed(self.semilla)
+        self.np_rng = np.random.default_rng(self.semilla)
+        self.salidas = []
+        self.posicion_jugador = None
+
+        self.mapa = GrillaMapa(self.filas, self.columnas)
+        self.tipos = np.frombuffer(self.mapa.celdas, dtype=np.uint8).reshape(self.filas, self.columnas)
+
+        self._generar_laberinto()
+        self._agregar_lianas()
+        self._agregar_tuneles()
+        self._colocar_salidas()
+        self._colocar_jugador()
+
+        # Se escribió directamente en las celdas: reconstruir las máscaras de paso
+        self.mapa.recalcular_paso()
+        return self.mapa
+
+    def _generar_laberinto(self):
+        """DFS sobre índices planos (r * columnas + c) de las celdas impares"""
+        filas, columnas = self.filas, self.columnas
+        total = filas * columnas
+        celdas = self.mapa.celdas
+        camino = Camino.codigo
+        rng = self.rng
+
+        # Nodos del laberinto: fila y columna impares sin tocar el borde
+        nodos = np.zeros((filas, columnas), dtype=np.uint8)
+        nodos[1:filas - 1:2, 1:columnas - 1:2] = 1
+        pendiente = bytearray(nodos.tobytes())
+
+        inicio = rng.randrange(1, filas - 1, 2) * columnas + rng.randrange(1, columnas - 1, 2)
+        celdas[inicio] = camino
+        pendiente[inicio] = 0
+        stack = [inicio]
+
+        saltos = (2, 2 * columnas, -2, -2 * columnas)  # Derecha, Abajo, Izquierda, Arriba
+        while stack:
+            actual = stack[-1]
+            # Los saltos que cruzan un borde caen en la columna 0 o la última,
+            # que nunca son nodos, así que basta con revisar `pendiente`
+            vecinos = [actual + s for s in saltos
+                       if 0 <= actual + s < total and pendiente[actual + s]]
+            if vecinos:
+                siguiente = vecinos[int(rng.random() * len(vecinos))]
+                celdas[(actual + siguiente) // 2] = camino  # pared entre ambos
+                celdas[siguiente] = camino
+                pendiente[siguiente] = 0
+                stack.append(siguiente)
+            else:
+                stack.pop()
+
+        self._agregar_caminos_adicionales()
+
+    def _agregar_caminos_adicionales(self):
+        """Convierte en camino muros elegidos al azar con algún camino adyacente"""
+        t = self.tipos
+        cantidad = self._escalar(self.rng.randint(5, 15))
+        r = self.np_rng.integers(1, self.filas - 1, cantidad)
+        c = self.np_rng.integers(1, self.columnas - 1, cantidad)
+
+        es_camino = t == Camino.codigo
+        adyacentes = (es_camino[r - 1, c].astype(np.int8) + es_camino[r + 1, c]
+                      + es_camino[r, c - 1] + es_camino[r, c + 1])
+        elegidos = (t[r, c] == Muro.codigo) & (adyacentes >= 1)
+        t[r[elegidos], c[elegidos]] = Camino.codigo
+
+    def _agregar_lianas(self):
+        """Agrega lianas en muros con algún camino en su vecindario 5x5"""
+        t = self.tipos
+        cantidad = self._escalar(self.rng.randint(8, 15))
+        r = self.np_rng.integers(0, self.filas, cantidad)
+        c = self.np_rng.integers(0, self.columnas, cantidad)
+
+        caminos_cercanos = suma_vecindario(t == Camino.codigo, 2)
+        elegidos = (t[r, c] == Muro.codigo) & (caminos_cercanos[r, c] > 0)
+        t[r[elegidos], c[elegidos]] = Liana.codigo
+
+    def _agregar_tuneles(self):
+        """Agrega túneles en muros elegidos al azar"""
+        t = self.tipos
+        cantidad = self._escalar(self.rng.randint(5, 10))
+        r = self.np_rng.integers(0, self.filas, cantidad)
+        c = self.np_rng.integers(0, self.columnas, cantidad)
+
+        elegidos = t[r, c] == Muro.codigo
+        t[r[elegidos], c[elegidos]] = Tunel.codigo
+
+    def _posiciones_borde(self):
+        """Casillas de borde (sin esquinas) que tienen un camino justo adentro"""
+        t = self.tipos
+        camino = Camino.codigo
+        ultima_fila, ultima_columna = self.filas - 1, self.columnas - 1
+        columnas = np.arange(1, ultima_columna)
+        filas = np.arange(1, ultima_fila)
+
+        superior = columnas[t[1, 1:-1] == camino]
+        inferior = columnas[t[-2, 1:-1] == camino]
+        izquierdo = filas[t[1:-1, 1] == camino]
+        derecho = filas[t[1:-1, -2] == camino]
+
+        r = np.concatenate([np.zeros_like(superior), np.full_like(inferior, ultima_fila),
+                            izquierdo, derecho])
+        c = np.concatenate([superior, inferior, np.zeros_like(izquierdo),
+                            np.full_like(derecho, ultima_columna)])
+        return r, c
+
+    def _crear_caminos_hacia_bordes(self):
+        """Crea caminos desde el interior hacia los bordes para asegurar salidas accesibles"""
+        # Encontrar caminos en el interior
+        caminos_interiores = []
+        for r in range(2, self.filas - 2):
+            for c in range(2, self.columnas - 2):
+                if self.mapa.tipo(r, c) == Camino.codigo:
+                    caminos_interiores.append((r, c))
+        
+        # Crear algunos caminos hacia los bordes
+        if caminos_interiores:
+            for _ in range(3):  # Crear hasta 3 caminos hacia bordes
+                r, c = self.rng.choice(caminos_interiores)
+                
+                # Elegir dirección hacia un borde
+                direcciones = []
+                if r > self.filas // 2:  # Más cerca del borde inferior
+                    direcciones.append((1, 0))  # Hacia abajo
+                else:  # Más cerca del borde superior
+                    direcciones.append((-1, 0))  # Hacia arriba
+                    
+                if c > self.columnas // 2:  # Más cerca del borde derecho
+                    direcciones.append((0, 1))  # Hacia derecha
+                else:  # Más cerca del borde izquierdo
+                    direcciones.append((0, -1))  # Hacia izquierda
+                
+                # Crear camino en la dirección elegida
+                if direcciones:
+                    dr, dc = self.rng.choice(direcciones)
+                    actual_r, actual_c = r, c
+                    
+                    # Crear camino hasta llegar cerca del borde
+                    while (1 < actual_r < self.filas - 2 and 
+                           1 < actual_c < self.columnas - 2):
+                        actual_r += dr
+                        actual_c += dc
+                        if self.mapa.tipo(actual_r, actual_c) == Muro.codigo:
+                            self.mapa.poner(actual_r, actual_c, Camino.codigo)
+
+    def _colocar_salidas(self):
+        """Coloca salidas en los bordes del mapa asegurando que tengan acceso"""
+        self.salidas = []
+        num_salidas = self.rng.randint(2, 4)
+
+        r, c = self._posiciones_borde()
+        if r.size < num_salidas:
+            self._crear_caminos_hacia_bordes()
+            r, c = self._posiciones_borde()
+
+        num_salidas_real = min(num_salidas, r.size)
+        if num_salidas_real > 0:
+            elegidas = self.np_rng.choice(r.size, num_salidas_real, replace=False)
+            self.tipos[r[elegidas], c[elegidas]] = Salida.codigo
+            self.salidas = [Punto(int(r[i]), int(c[i])) for i in elegidas]
+
+    def _colocar_jugador(self):
+        """Elige un camino interior a 3 o más casillas de toda salida"""
+        t = self.tipos
+        candidatas = np.zeros(t.shape, dtype=bool)
+        candidatas[1:-1, 1:-1] = t[1:-1, 1:-1] == Camino.codigo
+
+        filas = np.arange(self.filas)[:, None]
+        columnas = np.arange(self.columnas)[None, :]
+        lejos = candidatas.copy()
+        for salida in self.salidas:
+            lejos &= (np.abs(filas - salida.r) + np.abs(columnas - salida.c)) >= 3
+
+        indices = np.flatnonzero(lejos)
+        if indices.size == 0:
+            # Si no se encuentra una buena posición, usar cualquier camino
+            indices = np.flatnonzero(t == Camino.codigo)
+        if indices.size:
+            i = int(self.np_rng.choice(indices))
+            self.posicion_jugador = Punto(i // self.columnas, i % self.columnas)
+
+    def verificar_camino_valido(self):
+        """Verifica con componentes conexas que el jugador llega a alguna salida"""
+        if not self.posicion_jugador or not self.salidas:
+            return False
+
+        paso = np.frombuffer(self.mapa.paso_jugador, dtype=np.uint8).reshape(self.filas, self.columnas)
+        etiquetas = etiquetar_componentes(paso.astype(bool))
+        componente = etiquetas[self.posicion_jugador.r, self.posicion_jugador.c]
+        return any(etiquetas[s.r, s.c] == componente for s in self.salidas)
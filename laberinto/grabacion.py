@@ -0,0 +1,272 @@
+# Escapa del Laberinto - grabación y repetición de partidas
+# Isaac Orozco y Daniel Araya
+#
+# Una partida queda determinada por el mapa, la semilla de la simulación y
+# las acciones del jugador con el tick en que llegaron (el reloj de la
+# simulación avanza por ticks, no con time.time). Eso es lo único que se
+# guarda, en un archivo binario de pocos KB. reproducir() vuelve a correr la
+# partida sin ventana, miles de veces más rápido que en tiempo real.
+#
+# Uso:
+#   python -m laberinto.grabacion partidas/*.lbr     # verifica los puntajes
+#
+# Formato (little-endian):
+#   encabezado  "LBR" + versión, modo, dificultad, enemigos, filas, columnas,
+#               semilla del mapa, semilla de la simulación, jugador, salidas
+#               y las celdas del mapa comprimidas con zlib
+#   eventos     varint(ticks desde el evento anterior) + 1 byte de acción
+#   final       varint(ticks) + FIN + varint(puntaje) + 1 byte de victoria
+import argparse
+import datetime
+import os
+import struct
+import sys
+import time
+import zlib
+
+from laberinto.constantes import DIRECTORIO_PARTIDAS, Punto
+from laberinto.casillas import Trampa
+from laberinto.generador import GeneradorMapa
+from laberinto.simulacion import Simulacion, DIRECCIONES
+
+MAGIA = b"LBR"
+# 2: en modo cazador los enemigos muertos se reutilizan (las partidas de la
+# versión 1 no se repetirían igual)
+# 3: en modo cazador los enemigos siguen el camino real a las salidas y
+# todos aparecen lejos de ellas (generador.distancias_salidas)
+VERSION = 3
+EXTENSION = ".lbr"
+
+MODOS = ("escapa", "cazador")
+DIFICULTADES = ("facil", "dificil")
+NOMBRES_DIRECCIONES = tuple(DIRECCIONES)
+
+# Códigos de acción: 0-7 movimiento (dirección * 2 + corriendo), luego trampa
+TRAMPA = 8
+FIN = 0xFF
+
+_ENCABEZADO = struct.Struct("<3sBBBHHHQQHHB")
+
+
+def _escribir_varint(datos, n):
+    while n >= 0x80:
+        datos.append((n & 0x7F) | 0x80)
+        n >>= 7
+    datos.append(n)
+
+
+def _leer_varint(datos, i):
+    n = desplazamiento = 0
+    while True:
+        if i >= len(datos):
+            raise ValueError("Grabación incompleta")
+        byte = datos[i]
+        i += 1
+        n |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return n, i
+        desplazamiento += 7
+
+
+def codificar_accion(accion):
+    if accion[0] == "mover":
+        corriendo = accion[2] if len(accion) > 2 else False
+        return NOMBRES_DIRECCIONES.index(accion[1]) * 2 + bool(corriendo)
+    if accion[0] == "trampa":
+        return TRAMPA
+    raise ValueError(f"Acción desconocida: {accion!r}")
+
+
+def decodificar_accion(codigo):
+    if codigo == TRAMPA:
+        return ("trampa",)
+    if codigo >= TRAMPA:
+        raise ValueError(f"Código de acción inválido en la grabación: {codigo}")
+    return ("mover", NOMBRES_DIRECCIONES[codigo // 2], bool(codigo & 1))
+
+
+# ----------------- GRABACIÓN -----------------
+class Grabadora:
+    """Registra las acciones aplicadas a una Simulacion recién creada.
+
+    - aplicar(accion) registra la acción con el tick actual y la aplica.
+    - guardar() agrega el resultado final y escribe el archivo.
+    """
+
+    def __init__(self, sim):
+        if sim.semilla is None:
+            raise ValueError("Solo se pueden grabar simulaciones con semilla (sin rng propio)")
+        if not sim.generador.completo():
+            # La repetición usa el mapa guardado: no puede generar regiones como el original
+            raise ValueError("El mapa debe estar completo (generador.completar()) antes de "
+                             "crear la simulación")
+        self.sim = sim
+        self.datos = bytearray(self._encabezado(sim))
+        self.ultimo_tick = 0
+
+    @staticmethod
+    def _encabezado(sim):
+        generador = sim.generador
+        inicio = sim.jugador.posicion
+        datos = bytearray(_ENCABEZADO.pack(
+            MAGIA, VERSION, MODOS.index(sim.modo), DIFICULTADES.index(sim.dificultad),
+            sim.num_enemigos, generador.filas, generador.columnas,
+            generador.semilla, sim.semilla, inicio.r, inicio.c, len(generador.salidas)))
+        for salida in generador.salidas:
+            datos += struct.pack("<HH", salida.r, salida.c)
+        celdas = zlib.compress(bytes(generador.mapa.celdas), 9)
+        datos += struct.pack("<I", len(celdas)) + celdas
+        return datos
+
+    def _marcar_tick(self):
+        _escribir_varint(self.datos, self.sim.tick - self.ultimo_tick)
+        self.ultimo_tick = self.sim.tick
+
+    def aplicar(self, accion):
+        """Registra y aplica una acción del jugador; devuelve lo mismo que Simulacion.aplicar"""
+        if not self.sim.terminado:
+            self._marcar_tick()
+            self.datos.append(codificar_accion(accion))
+        return self.sim.aplicar(accion)
+
+    def cerrar(self):
+        """Bytes de la grabación completa (con el resultado final)"""
+        datos = bytearray(self.datos)
+        _escribir_varint(datos, self.sim.tick - self.ultimo_tick)
+        datos.append(FIN)
+        _escribir_varint(datos, self.sim.jugador.puntaje)
+        datos.append(1 if self.sim.victoria else 0)
+        return bytes(datos)
+
+    def guardar(self, directorio=DIRECTORIO_PARTIDAS, nombre=None):
+        """Escribe la grabación y devuelve la ruta"""
+        if nombre is None:
+            fecha = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre = f"partida_{fecha}_{self.sim.modo}_{self.sim.semilla:08x}{EXTENSION}"
+        os.makedirs(directorio, exist_ok=True)
+        ruta = os.path.join(directorio, nombre)
+        with open(ruta, "wb") as f:
+            f.write(self.cerrar())
+        return ruta
+
+
+# ----------------- LECTURA Y REPETICIÓN -----------------
+class Grabacion:
+    """Contenido de un archivo .lbr ya decodificado"""
+
+    def __init__(self, datos):
+        """Decodifica los bytes; un archivo cortado o dañado da ValueError"""
+        try:
+            (magia, version, modo, dificultad, self.num_enemigos, self.filas, self.columnas,
+             self.semilla_mapa, self.semilla, r, c, num_salidas) = _ENCABEZADO.unpack_from(datos)
+        except struct.error:
+            raise ValueError("Grabación incompleta") from None
+        if magia != MAGIA:
+            raise ValueError("No es una grabación de Escapa del Laberinto")
+        if version != VERSION:
+            raise ValueError(f"Versión de grabación no soportada: {version}")
+        if modo >= len(MODOS) or dificultad >= len(DIFICULTADES):
+            raise ValueError("Modo o dificultad inválidos en la grabación")
+        self.modo = MODOS[modo]
+        self.dificultad = DIFICULTADES[dificultad]
+        self.posicion_jugador = Punto(r, c)
+
+        i = _ENCABEZADO.size
+        self.salidas = []
+        try:
+            for _ in range(num_salidas):
+                self.salidas.append(Punto(*struct.unpack_from("<HH", datos, i)))
+                i += 4
+            (largo,) = struct.unpack_from("<I", datos, i)
+            i += 4
+            if len(datos) < i + largo:
+                raise ValueError("Grabación incompleta")
+            self.celdas = zlib.decompress(datos[i:i + largo])
+        except (struct.error, zlib.error):
+            raise ValueError("Grabación incompleta") from None
+        i += largo
+        if len(self.celdas) != self.filas * self.columnas:
+            raise ValueError("El mapa de la grabación no tiene filas x columnas celdas")
+        if self.celdas and max(self.celdas) >= Trampa.codigo:
+            raise ValueError("Código de casilla inválido en la grabación")
+        for punto in self.salidas + [self.posicion_jugador]:
+            if not (0 <= punto.r < self.filas and 0 <= punto.c < self.columnas):
+                raise ValueError(f"Posición fuera del mapa: ({punto.r}, {punto.c})")
+
+        self.eventos = []  # (tick, accion)
+        tick = 0
+        while True:
+            delta, i = _leer_varint(datos, i)
+            tick += delta
+            if i >= len(datos):
+                raise ValueError("Grabación incompleta")
+            codigo = datos[i]
+            i += 1
+            if codigo == FIN:
+                break
+            self.eventos.append((tick, decodificar_accion(codigo)))
+        self.tick_final = tick
+        self.puntaje, i = _leer_varint(datos, i)
+        if i >= len(datos):
+            raise ValueError("Grabación incompleta")
+        self.victoria = bool(datos[i])
+
+    @classmethod
+    def leer(cls, ruta):
+        with open(ruta, "rb") as f:
+            return cls(f.read())
+
+    def generador(self):
+        """GeneradorMapa con el mapa grabado (no depende del algoritmo de generación)"""
+        return GeneradorMapa.desde_celdas(self.filas, self.columnas, self.celdas, self.salidas,
+                                          self.posicion_jugador, self.semilla_mapa)
+
+
+def reproducir(grabacion):
+    """Corre la partida grabada sin interfaz y devuelve la Simulacion final"""
+    sim = Simulacion(grabacion.modo, grabacion.dificultad, generador=grabacion.generador(),
+                     num_enemigos=grabacion.num_enemigos, semilla=grabacion.semilla)
+    for tick, accion in grabacion.eventos:
+        while sim.tick < tick and not sim.terminado:
+            sim.step()
+        sim.aplicar(accion)
+    while sim.tick < grabacion.tick_final and not sim.terminado:
+        sim.step()
+    return sim
+
+
+def verificar(ruta):
+    """Reproduce una grabación; devuelve (coincide, grabacion, sim)"""
+    grabacion = Grabacion.leer(ruta)
+    sim = reproducir(grabacion)
+    coincide = (sim.jugador.puntaje == grabacion.puntaje and sim.tick == grabacion.tick_final and
+                sim.victoria == grabacion.victoria)
+    return coincide, grabacion, sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica partidas grabadas de Escapa del Laberinto")
+    parser.add_argument("archivos", nargs="+", help="grabaciones .lbr")
+    args = parser.parse_args(argv)
+
+    errores = 0
+    for ruta in args.archivos:
+        inicio = time.perf_counter()
+        try:
+            coincide, grabacion, sim = verificar(ruta)
+        except (OSError, ValueError) as e:
+            # Un archivo dañado no detiene la verificación de los demás
+            print(f"{'ERROR':<8} {ruta}: {e}")
+            errores += 1
+            continue
+        ms = (time.perf_counter() - inicio) * 1000
+        estado = "OK" if coincide else "DISTINTO"
+        print(f"{estado:<8} {ruta}: {grabacion.modo}/{grabacion.dificultad}, "
+              f"{grabacion.tick_final} ticks, puntaje {grabacion.puntaje} -> {sim.jugador.puntaje} "
+              f"({ms:.1f} ms)")
+        errores += not coincide
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,762 @@
+# Escapa del Laberinto - interfaz gráfica (tkinter)
+# Isaac Orozco y Daniel Araya
+#
+# Es el único módulo que importa tkinter al cargarse; PIL se importa recién
+# al escalar imágenes. Las herramientas sin ventana (python -m laberinto)
+# nunca lo importan.
+#
+# Imports estándar de Python
+import time
+import os
+
+# Imports de tkinter 
+import tkinter as tk
+from tkinter import messagebox, simpledialog, ttk
+
+# Lógica del juego (paquete laberinto, no depende de tkinter)
+from laberinto.constantes import (FILAS_VISTA, COLUMNAS_VISTA, MAX_TRAMPAS_ACTIVAS,
+                                  COOLDOWN_TRAMPA, ENERGIA_MAXIMA, DIRECTORIO_BASE,
+                                  DURACION_TICK, MAX_TICKS_POR_FRAME)
+from laberinto.casillas import Muro, Liana
+from laberinto.simulacion import Simulacion
+from laberinto.pool_mapas import PoolMapas
+from laberinto.perfilador import Perfilador
+from laberinto.grabacion import Grabadora
+from laberinto.puntajes import SistemaPuntajes
+from laberinto.render import RenderizadorMapa
+from laberinto.recursos import GestorRecursos
+
+
+    # ----------------- INTERFAZ GRÁFICA -----------------
+class JuegoLaberinto:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Escapa del Laberinto")
+        self.root.geometry("1200x800")
+        self.root.resizable(False, False)
+
+
+
+        # Configuración del juego (las reglas viven en self.sim)
+        self.sim = None
+        self.grabadora = None  # graba las acciones de la partida actual
+        self.modo_juego = None  # "escapa" o "cazador"
+        self.nombre_jugador = ""
+        self.juego_activo = False
+        self.juego_pausado = False
+
+        # Planificador del loop: solo hay un after() pendiente mientras se juega
+        self.id_loop = None
+        self.ultimo_instante = 0.0
+        self.acumulado = 0.0  # tiempo real aún no simulado
+        self.id_dibujo = None  # after_idle pendiente: a lo sumo un dibujo por frame
+
+        # Instrumentación por frame (apagada salvo LABERINTO_PERFIL o F3)
+        self.perfilador = Perfilador.desde_entorno()
+        self.item_perfil = None
+
+        # Sistema de puntajes
+        self.sistema_puntajes = SistemaPuntajes()
+
+        # Mapas pregenerados en segundo plano: iniciar/reiniciar no espera al generador
+        self.pool_mapas = PoolMapas().iniciar()
+
+                # Configuración visual
+        self.TAMANO_CASILLA = 30
+
+        # --- SPRITES DEL JUGADOR
+        # Los sprites están en sprites_personaje/ a la par del script
+        sprites_dir = os.path.join(DIRECTORIO_BASE, "sprites_personaje")
+        # nombres exactos de archivos (incluye extensión)
+        self.rutas_sprites = {
+            direccion: os.path.join(sprites_dir, f"Personaje_{direccion}.png")
+            for direccion in ("down", "up", "left", "right")
+        }
+        # Se llena en cargar_imagenes() al empezar la primera partida
+        self.sprites_jugador = {}
+        self.tamano_imagenes = None
+
+        # Todas las imágenes salen de un atlas ya escalado guardado en disco
+        Muro.init_imagen_path()
+        Liana.init_imagen_path()
+        self.recursos = GestorRecursos([Muro.imagen_path, Liana.imagen_path,
+                                        *self.rutas_sprites.values()])
+
+
+        self.colores = {
+            "#": "#8B4513",  # Muro - Marron
+            ".": "#90EE90",  # Camino - Verde claro
+            "L": "#228B22",  # Liana - Verde oscuro
+            "T": "#4169E1",  # Tunel - Azul
+            "S": "#FFD700",  # Salida - Dorado
+            "X": "#DC143C",  # Trampa - Rojo carmesi 
+            "J": "#FF1493",  # Jugador - Rosa fuerte
+            "E": "#8B0000",  # Enemigo - Rojo oscuro
+        }
+
+
+        self.crear_interfaz()
+        self.renderizador = RenderizadorMapa(self.canvas, self.TAMANO_CASILLA,
+                                             self.colores, self.sprites_jugador,
+                                             FILAS_VISTA, COLUMNAS_VISTA)
+        self.mostrar_menu_principal()
+
+    def crear_interfaz(self):
+        """Crea la interfaz principal del juego"""
+        # Frame principal
+        self.frame_principal = tk.Frame(self.root)
+        self.frame_principal.pack(fill=tk.BOTH, expand=True)
+
+        # Frame del juego (izquierda)
+        self.frame_juego = tk.Frame(self.frame_principal)
+        self.frame_juego.pack(side=tk.LEFT, padx=10, pady=10)
+
+        # Canvas para el mapa
+        self.canvas = tk.Canvas(
+            self.frame_juego,
+            width=COLUMNAS_VISTA * self.TAMANO_CASILLA,
+            height=FILAS_VISTA * self.TAMANO_CASILLA,
+            bg="white",
+            bd=2,
+            relief="solid"
+        )
+        self.canvas.pack()
+
+        # Frame de información (derecha)
+        self.frame_info = tk.Frame(self.frame_principal, width=300)
+        self.frame_info.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
+        self.frame_info.pack_propagate(False)
+
+        # Información del jugador
+        self.label_nombre = tk.Label(self.frame_info, text="Jugador: ", font=("Arial", 12, "bold"))
+        self.label_nombre.pack(anchor="w", pady=5)
+
+        self.label_modo = tk.Label(self.frame_info, text="Modo: ", font=("Arial", 10))
+        self.label_modo.pack(anchor="w", pady=2)
+
+        self.label_puntaje = tk.Label(self.frame_info, text="Puntaje: 0", font=("Arial", 10))
+        self.label_puntaje.pack(anchor="w", pady=2)
+
+        self.label_tiempo = tk.Label(self.frame_info, text="Tiempo: 0s", font=("Arial", 10))
+        self.label_tiempo.pack(anchor="w", pady=2)
+
+        # Barra de energía
+        tk.Label(self.frame_info, text="Energía:", font=("Arial", 10)).pack(anchor="w", pady=(10, 2))
+        self.barra_energia = ttk.Progressbar(
+            self.frame_info, length=200, maximum=ENERGIA_MAXIMA, value=ENERGIA_MAXIMA
+        )
+        self.barra_energia.pack(anchor="w", pady=2)
+        self.label_energia = tk.Label(self.frame_info, text=f"{ENERGIA_MAXIMA}/{ENERGIA_MAXIMA}", font=("Arial", 9))
+        self.label_energia.pack(anchor="w")
+
+        # Información de trampas (solo modo escapa): se crean una vez y solo
+        # se actualiza su texto
+        self.frame_trampas = tk.Frame(self.frame_info)
+        self.frame_trampas.pack(anchor="w", pady=10)
+        self.labels_trampas = [
+            tk.Label(self.frame_trampas, text="Trampas:", font=("Arial", 10, "bold")),
+            tk.Label(self.frame_trampas, text=""),
+            tk.Label(self.frame_trampas, text=""),
+        ]
+        self.trampas_visibles = False
+
+        # Controles
+        tk.Label(self.frame_info, text="Controles:", font=("Arial", 12, "bold")).pack(anchor="w", pady=(20, 5))
+        controles_text = """
+        WASD o Flechas: Mover
+        Shift + Mover: Correr
+        ESPACIO: Colocar trampa (Escapa)
+        P: Pausar/Reanudar
+        R: Reiniciar juego
+        ESC: Menú principal
+        F3: Perfil de rendimiento
+        """
+        tk.Label(self.frame_info, text=controles_text, font=("Arial", 9), justify="left").pack(anchor="w")
+
+        # Botones
+        self.btn_pausar = tk.Button(
+            self.frame_info, text="Pausar", command=self.pausar_juego,
+            font=("Arial", 10), width=15
+        )
+        self.btn_pausar.pack(pady=5)
+
+        self.btn_reiniciar = tk.Button(
+            self.frame_info, text="Reiniciar Juego", command=self.reiniciar_juego,
+            font=("Arial", 10), width=15
+        )
+        self.btn_reiniciar.pack(pady=5)
+
+        self.btn_menu = tk.Button(
+            self.frame_info, text="Menú Principal", command=self.mostrar_menu_principal,
+            font=("Arial", 10), width=15
+        )
+        self.btn_menu.pack(pady=5)
+
+        # Puntajes
+        self.frame_puntajes = tk.Frame(self.frame_info)
+        self.frame_puntajes.pack(fill=tk.BOTH, expand=True, pady=10)
+
+        # Configurar eventos de teclado
+        self.root.bind("<KeyPress>", self.manejar_tecla)
+        self.root.focus_set()
+
+    def mostrar_menu_principal(self):
+        """Muestra el menú principal"""
+        self.juego_activo = False
+        self.detener_loop()
+        self.canvas.delete("all")
+        self.renderizador.invalidar()
+
+        # Limpiar información
+        self.label_nombre.config(text="Jugador: ")
+        self.label_modo.config(text="Modo: ")
+        self.label_puntaje.config(text="Puntaje: 0")
+        self.label_tiempo.config(text="Tiempo: 0s")
+        self.barra_energia.config(value=ENERGIA_MAXIMA)
+        self.label_energia.config(text=f"{ENERGIA_MAXIMA}/{ENERGIA_MAXIMA}")
+
+        # Dibujar menú en el canvas - ajustar posiciones para que todo sea visible
+        canvas_width = COLUMNAS_VISTA * self.TAMANO_CASILLA
+        canvas_height = FILAS_VISTA * self.TAMANO_CASILLA
+        
+        self.canvas.create_text(
+            canvas_width // 2, 60,
+            text="ESCAPA DEL LABERINTO",
+            font=("Arial", 20, "bold"),
+            fill="darkblue"
+        )
+
+        # Crear botones del menú - ajustar espaciado y posición
+        btn_y = 120
+        btn_spacing = 50
+        btn_width = 140
+        btn_height = 35
+        btn_x = canvas_width // 2
+
+        # MODO ESCAPA
+        self.canvas.create_text(btn_x, btn_y, text="MODO ESCAPA", font=("Arial", 12, "bold"), fill="darkblue")
+        btn_y += 25
+        
+        # Botones de dificultad para Escapa
+        btn_small_width = 65
+        gap = 10
+        
+        # Escapa Fácil
+        self.canvas.create_rectangle(btn_x - btn_small_width - gap//2, btn_y - btn_height//2, 
+                                   btn_x - gap//2, btn_y + btn_height//2, 
+                                   fill="lightblue", outline="darkblue", width=2)
+        self.canvas.create_text(btn_x - btn_small_width//2 - gap//2, btn_y, text="FÁCIL", font=("Arial", 10, "bold"))
+        self.canvas.tag_bind("escapa_facil", "<Button-1>", lambda e: self.iniciar_juego_con_dificultad("escapa", "facil"))
+        self.canvas.create_rectangle(btn_x - btn_small_width - gap//2, btn_y - btn_height//2, 
+                                   btn_x - gap//2, btn_y + btn_height//2, 
+                                   tags="escapa_facil", fill="", outline="")
+        
+        # Escapa Difícil
+        self.canvas.create_rectangle(btn_x + gap//2, btn_y - btn_height//2, 
+                                   btn_x + btn_small_width + gap//2, btn_y + btn_height//2, 
+                                   fill="darkblue", outline="navy", width=2)
+        self.canvas.create_text(btn_x + btn_small_width//2 + gap//2, btn_y, text="DIFÍCIL", font=("Arial", 10, "bold"), fill="white")
+        self.canvas.tag_bind("escapa_dificil", "<Button-1>", lambda e: self.iniciar_juego_con_dificultad("escapa", "dificil"))
+        self.canvas.create_rectangle(btn_x + gap//2, btn_y - btn_height//2, 
+                                   btn_x + btn_small_width + gap//2, btn_y + btn_height//2, 
+                                   tags="escapa_dificil", fill="", outline="")
+
+        btn_y += btn_spacing + 10
+        
+        # MODO CAZADOR
+        self.canvas.create_text(btn_x, btn_y, text="MODO CAZADOR", font=("Arial", 12, "bold"), fill="darkred")
+        btn_y += 25
+        
+        # Botones de dificultad para Cazador
+        # Cazador Fácil
+        self.canvas.create_rectangle(btn_x - btn_small_width - gap//2, btn_y - btn_height//2, 
+                                   btn_x - gap//2, btn_y + btn_height//2, 
+                                   fill="lightcoral", outline="darkred", width=2)
+        self.canvas.create_text(btn_x - btn_small_width//2 - gap//2, btn_y, text="FÁCIL", font=("Arial", 10, "bold"))
+        self.canvas.tag_bind("cazador_facil", "<Button-1>", lambda e: self.iniciar_juego_con_dificultad("cazador", "facil"))
+        self.canvas.create_rectangle(btn_x - btn_small_width - gap//2, btn_y - btn_height//2, 
+                                   btn_x - gap//2, btn_y + btn_height//2, 
+                                   tags="cazador_facil", fill="", outline="")
+        
+        # Cazador Difícil
+        self.canvas.create_rectangle(btn_x + gap//2, btn_y - btn_height//2, 
+                                   btn_x + btn_small_width + gap//2, btn_y + btn_height//2, 
+                                   fill="darkred", outline="maroon", width=2)
+        self.canvas.create_text(btn_x + btn_small_width//2 + gap//2, btn_y, text="DIFÍCIL", font=("Arial", 10, "bold"), fill="white")
+        self.canvas.tag_bind("cazador_dificil", "<Button-1>", lambda e: self.iniciar_juego_con_dificultad("cazador", "dificil"))
+        self.canvas.create_rectangle(btn_x + gap//2, btn_y - btn_height//2, 
+                                   btn_x + btn_small_width + gap//2, btn_y + btn_height//2, 
+                                   tags="cazador_dificil", fill="", outline="")
+
+        btn_y += btn_spacing + 10
+        
+        # Botón PUNTAJES
+        self.canvas.create_rectangle(btn_x - btn_width//2, btn_y - btn_height//2, 
+                                   btn_x + btn_width//2, btn_y + btn_height//2, 
+                                   fill="lightgreen", outline="darkgreen", width=2)
+        self.canvas.create_text(btn_x, btn_y, text="PUNTAJES", font=("Arial", 11, "bold"))
+        self.canvas.tag_bind("puntajes", "<Button-1>", lambda e: self.mostrar_puntajes())
+        self.canvas.create_rectangle(btn_x - btn_width//2, btn_y - btn_height//2, 
+                                   btn_x + btn_width//2, btn_y + btn_height//2, 
+                                   tags="puntajes", fill="", outline="")
+        btn_y += btn_spacing
+        
+        # Botón SALIR
+        self.canvas.create_rectangle(btn_x - btn_width//2, btn_y - btn_height//2, 
+                                   btn_x + btn_width//2, btn_y + btn_height//2, 
+                                   fill="lightgray", outline="black", width=2)
+        self.canvas.create_text(btn_x, btn_y, text="SALIR", font=("Arial", 11, "bold"))
+        self.canvas.tag_bind("salir", "<Button-1>", lambda e: self.root.quit())
+        self.canvas.create_rectangle(btn_x - btn_width//2, btn_y - btn_height//2, 
+                                   btn_x + btn_width//2, btn_y + btn_height//2, 
+                                   tags="salir", fill="", outline="")
+
+    def cambiar_dificultad(self):
+        """Cambia entre dificultad fácil y difícil"""
+        self.dificultad = "dificil" if self.dificultad == "facil" else "facil"
+        self.mostrar_menu_principal()  # Refrescar menú para mostrar cambio
+        
+        # Mostrar información sobre la dificultad seleccionada
+        if self.dificultad == "facil":
+            mensaje = "Dificultad FÁCIL seleccionada\n\n• Enemigos más lentos\n• Ideal para principiantes"
+        else:
+            mensaje = "Dificultad DIFÍCIL seleccionada\n\n• Enemigos más rápidos\n• Mayor desafío"
+        
+        messagebox.showinfo("Dificultad Cambiada", mensaje)
+
+    def iniciar_juego_con_dificultad(self, modo, dificultad):
+        """Inicia un juego con modo y dificultad específicos"""
+        self.dificultad = dificultad
+        self.iniciar_juego(modo)
+
+    def cargar_imagenes(self):
+        """Carga (una vez por tamaño de casilla) las imágenes del mapa y del jugador"""
+        if self.tamano_imagenes == self.TAMANO_CASILLA:
+            return
+        self.tamano_imagenes = self.TAMANO_CASILLA
+        Muro.cargar_imagen(self.TAMANO_CASILLA, self.recursos.imagen)
+        Liana.cargar_imagen(self.TAMANO_CASILLA, self.recursos.imagen)
+        # Se actualiza en el lugar: el renderizador guarda este mismo diccionario
+        self.sprites_jugador.update({
+            direccion: self.recursos.imagen(ruta, self.TAMANO_CASILLA, "Sprites")
+            for direccion, ruta in self.rutas_sprites.items()
+        })
+        self.renderizador.invalidar()
+
+    def iniciar_juego(self, modo):
+        """Inicia un nuevo juego"""
+        # Pedir nombre del jugador
+        self.nombre_jugador = simpledialog.askstring(
+            "Nombre del Jugador",
+            "Introduce tu nombre:"
+        )
+
+        if not self.nombre_jugador or self.nombre_jugador.strip() == "":
+            messagebox.showwarning("Nombre requerido", "El registro es obligatorio. Debes introducir un nombre para jugar.")
+            return
+
+        # Limpiar el nombre (quitar espacios extra)
+        self.nombre_jugador = self.nombre_jugador.strip()
+
+        self.modo_juego = modo
+        self.juego_activo = True
+        self.juego_pausado = False
+
+        # Tomar un mapa listo y crear jugador y enemigos. El reloj es el de la
+        # simulación (ticks de DURACION_TICK): así la partida se puede grabar
+        self.sim = Simulacion(modo, self.dificultad, generador=self.pool_mapas.obtener(),
+                              perfilador=self.perfilador)
+        self.grabadora = Grabadora(self.sim)
+
+        # Actualizar interfaz
+        self.actualizar_interfaz()
+        self.dibujar_mapa()
+
+        # Iniciar loop del juego (detener_loop evita que queden dos loops)
+        self.detener_loop()
+        self.programar_loop()
+
+    # Accesos directos al estado de la simulación
+    @property
+    def generador(self):
+        return self.sim.generador if self.sim else None
+
+    @property
+    def jugador(self):
+        return self.sim.jugador if self.sim else None
+
+    @property
+    def enemigos(self):
+        return self.sim.enemigos if self.sim else []
+
+    def dibujar_mapa(self):
+        """Dibuja el mapa; solo cambia lo que se movió o se marcó como sucio."""
+        if self.id_dibujo is not None:
+            # Este dibujo ya incluye lo que pidieron las teclas
+            self.root.after_cancel(self.id_dibujo)
+            self.id_dibujo = None
+        self.cargar_imagenes()  # solo la primera vez (o si cambió TAMANO_CASILLA)
+        for posicion in self.sim.tomar_celdas_cambiadas():
+            self.renderizador.marcar_sucia(posicion)
+        self.renderizador.dibujar(self.generador, self.jugador, self.enemigos)
+
+    def pedir_dibujo(self):
+        """Marca el frame como sucio: varias teclas antes de que Tk pinte se
+        dibujan juntas, una sola vez (o en el próximo dibujo del loop)"""
+        if self.id_dibujo is None:
+            self.id_dibujo = self.root.after_idle(self.dibujar_pendiente)
+
+    def dibujar_pendiente(self):
+        self.id_dibujo = None
+        if self.juego_activo:
+            self.dibujar_mapa()
+
+    def revisar_fin_juego(self):
+        """Si la simulación terminó, muestra el resultado; devuelve True en ese caso"""
+        if self.juego_activo and self.sim.terminado:
+            self.dibujar_mapa()
+            self.fin_juego(self.sim.victoria, self.sim.mensaje)
+            return True
+        return False
+
+    def manejar_tecla(self, event):
+        """Maneja las teclas presionadas"""
+        if not self.juego_activo or self.juego_pausado:
+            if event.keysym == "Escape":
+                self.mostrar_menu_principal()
+            elif self.juego_pausado and event.keysym.lower() == "p":
+                self.pausar_juego()  # "Presiona P para continuar"
+            return
+
+        tecla = event.keysym.lower()
+        corriendo = bool(event.state & 0x1)  # Shift presionado
+
+        # Movimiento: tecla -> dirección del sprite
+        direcciones = {
+            'w': "up", 'up': "up",
+            's': "down", 'down': "down",
+            'a': "left", 'left': "left",
+            'd': "right", 'right': "right"
+        }
+
+        if tecla in direcciones:
+            direccion_anterior = self.jugador.direccion
+            if self.grabadora.aplicar(("mover", direcciones[tecla], corriendo)):
+                if self.revisar_fin_juego():
+                    return
+                self.actualizar_interfaz()
+                self.pedir_dibujo()
+            elif self.jugador.direccion != direccion_anterior:
+                self.pedir_dibujo()  # no se movió, pero el sprite mira a otro lado
+            return
+
+
+        # Colocar trampa (solo en modo escapa)
+        elif tecla == 'space' and self.modo_juego == "escapa":
+            if self.grabadora.aplicar(("trampa",)):
+                self.pedir_dibujo()
+
+        # Pausar
+        elif tecla == 'p':
+            self.pausar_juego()
+        
+        # Reiniciar juego
+        elif tecla == 'r':
+            self.reiniciar_juego()
+
+        # Terminar juego en modo cazador
+        elif tecla == 'q' and self.modo_juego == "cazador":
+            resultado = messagebox.askyesno(
+                "Terminar Juego", 
+                f"¿Deseas terminar el juego?\nPuntaje actual: {self.jugador.puntaje}"
+            )
+            if resultado:
+                self.fin_juego(True, f"Juego terminado voluntariamente")
+
+        # Perfil de rendimiento
+        elif tecla == 'f3':
+            self.alternar_perfil()
+
+        # Menú principal
+        elif tecla == 'escape':
+            self.mostrar_menu_principal()
+
+    # ----------------- LOOP DEL JUEGO -----------------
+    def programar_loop(self):
+        """Arranca el loop si se está jugando y no hay uno pendiente"""
+        if self.id_loop is None and self.juego_activo and not self.juego_pausado:
+            self.ultimo_instante = time.perf_counter()
+            self.acumulado = 0.0
+            self.id_loop = self.root.after(int(DURACION_TICK * 1000), self.loop_juego)
+
+    def detener_loop(self):
+        """Cancela el loop pendiente (pausa, menú o fin de partida)"""
+        if self.id_loop is not None:
+            self.root.after_cancel(self.id_loop)
+            self.id_loop = None
+
+    def loop_juego(self):
+        """Loop principal del juego: pasos fijos de simulación con acumulador.
+
+        Se simulan tantos ticks de DURACION_TICK como tiempo real pasó (hasta
+        MAX_TICKS_POR_FRAME si Tk llamó muy tarde) y se dibuja una sola vez.
+        """
+        self.id_loop = None
+        if not self.juego_activo or self.juego_pausado:
+            return
+
+        ahora = time.perf_counter()
+        self.acumulado += ahora - self.ultimo_instante
+        self.ultimo_instante = ahora
+
+        perfil = self.perfilador
+        perfil.iniciar_frame()
+        ticks = 0
+        with perfil.fase("simulacion"):
+            while self.acumulado >= DURACION_TICK and not self.sim.terminado:
+                # Avanzar un tick de la simulación (enemigos, colisiones, victoria y energía)
+                self.sim.step()
+                self.acumulado -= DURACION_TICK
+                ticks += 1
+                if ticks == MAX_TICKS_POR_FRAME:
+                    self.acumulado = 0.0  # demasiado atraso: se descarta en vez de acumular
+                    break
+
+        if ticks:
+            if self.revisar_fin_juego():
+                return
+            # Actualizar interfaz
+            with perfil.fase("interfaz"):
+                self.actualizar_interfaz()
+            with perfil.fase("dibujo"):
+                self.dibujar_mapa()
+            perfil.contar("ticks", ticks)
+            self.registrar_perfil()
+
+        # Continuar el loop justo cuando toca el siguiente tick
+        espera = max(1, int((DURACION_TICK - self.acumulado) * 1000))
+        self.id_loop = self.root.after(espera, self.loop_juego)
+
+    # ----------------- PERFIL DE RENDIMIENTO -----------------
+    def registrar_perfil(self):
+        """Cierra el frame del perfilador y actualiza el resumen sobre el canvas"""
+        perfil = self.perfilador
+        if not perfil.activo:
+            return
+        # Contadores acumulados de otros objetos: se registra cuánto avanzaron
+        perfil.fijar("items_canvas", self.renderizador.items_creados)
+        perfil.fijar("nodos_bfs", self.sim.campo_jugador.nodos_expandidos)
+        perfil.fijar("celdas_revisadas", self.sim.mapa.libres().celdas_revisadas)
+        perfil.terminar_frame()
+
+        if self.item_perfil is None or not self.canvas.type(self.item_perfil):
+            self.item_perfil = self.canvas.create_text(
+                4, 4, anchor="nw", font=("Courier", 8), fill="white", tags="perfil")
+        self.canvas.itemconfig(self.item_perfil, text=perfil.texto())
+        self.canvas.tag_raise("perfil")
+
+    def alternar_perfil(self):
+        """F3: enciende o apaga el perfilador y su resumen en pantalla"""
+        if not self.perfilador.alternar():
+            self.canvas.delete("perfil")
+            self.item_perfil = None
+
+    def fin_juego(self, victoria, mensaje):
+        """Termina el juego y muestra resultados"""
+        self.juego_activo = False
+        self.detener_loop()
+
+        # Calcular tiempo transcurrido
+        tiempo_transcurrido = self.sim.tiempo_transcurrido()
+
+        # Mostrar mensaje de resultado
+        if victoria:
+            if self.modo_juego == "escapa":
+                messagebox.showinfo("¡Victoria!", mensaje)
+            else:
+                messagebox.showinfo("Juego Terminado", mensaje)
+        else:
+            messagebox.showinfo("Derrota", mensaje)
+
+        # Guardar puntaje (siempre guardar en modo escapa cuando gana, en cazador siempre)
+        if victoria or self.modo_juego == "cazador":
+            self.sistema_puntajes.agregar_puntaje(
+                self.nombre_jugador,
+                self.jugador.puntaje,
+                self.modo_juego
+            )
+
+        # Guardar la grabación de la partida (se verifica con python -m laberinto.grabacion)
+        try:
+            self.grabadora.guardar()
+        except OSError as e:
+            print(f"Error guardando la grabación: {e}")
+
+        # Mostrar puntaje final
+        messagebox.showinfo(
+            "Puntaje Final",
+            f"Jugador: {self.nombre_jugador}\n"
+            f"Puntaje: {self.jugador.puntaje}\n"
+            f"Tiempo: {tiempo_transcurrido:.1f}s"
+        )
+
+        self.mostrar_menu_principal()
+
+    def pausar_juego(self):
+        """Pausa o reanuda el juego"""
+        if not self.juego_activo:
+            return
+
+        self.juego_pausado = not self.juego_pausado
+        self.btn_pausar.config(text="Reanudar" if self.juego_pausado else "Pausar")
+
+        if self.juego_pausado:
+            self.detener_loop()
+            self.canvas.create_text(
+                COLUMNAS_VISTA * self.TAMANO_CASILLA // 2,
+                FILAS_VISTA * self.TAMANO_CASILLA // 2,
+                text="PAUSADO\nPresiona P para continuar",
+                font=("Arial", 16, "bold"),
+                fill="red",
+                tags="pausa"
+            )
+        else:
+            self.canvas.delete("pausa")
+            self.programar_loop()
+    
+    def reiniciar_juego(self):
+        """Reinicia el juego actual con el mismo modo y jugador"""
+        if not self.modo_juego or not self.nombre_jugador:
+            return  # Solo reinicia si ya hay un juego activo
+        
+        # Guardar datos actuales
+        modo_actual = self.modo_juego
+        nombre_actual = self.nombre_jugador
+        
+        # Reiniciar variables del juego
+        self.juego_activo = True  # Reactivar el juego
+        self.juego_pausado = False
+
+        # Nueva simulación: nuevo mapa, jugador y enemigos
+        self.sim = Simulacion(modo_actual, self.dificultad, generador=self.pool_mapas.obtener(),
+                              perfilador=self.perfilador)
+        self.grabadora = Grabadora(self.sim)
+
+        # Restaurar datos
+        self.modo_juego = modo_actual
+        self.nombre_jugador = nombre_actual
+
+        # Actualizar interfaz
+        self.btn_pausar.config(text="Pausar")
+        self.canvas.delete("pausa")  # Limpiar mensaje de pausa si existe
+        self.actualizar_interfaz()
+        self.dibujar_mapa()  # Dibujar el nuevo mapa
+        self.detener_loop()
+        self.programar_loop()
+
+    def actualizar_interfaz(self):
+        """Actualiza la información mostrada en la interfaz"""
+        if not self.jugador:
+            return
+
+        self.label_nombre.config(text=f"Jugador: {self.nombre_jugador}")
+        self.label_modo.config(text=f"Modo: {self.modo_juego.title()}")
+        self.label_puntaje.config(text=f"Puntaje: {self.jugador.puntaje}")
+
+        if self.juego_activo:
+            tiempo_transcurrido = self.sim.tiempo_transcurrido()
+            self.label_tiempo.config(text=f"Tiempo: {tiempo_transcurrido:.1f}s")
+
+        # Actualizar barra de energía
+        self.barra_energia.config(value=self.jugador.energia)
+        self.label_energia.config(text=f"{self.jugador.energia}/{ENERGIA_MAXIMA}")
+
+        # Actualizar información de trampas en modo escapa
+        mostrar_trampas = self.modo_juego == "escapa"
+        if mostrar_trampas != self.trampas_visibles:
+            for label in self.labels_trampas:
+                if mostrar_trampas:
+                    label.pack(anchor="w")
+                else:
+                    label.pack_forget()
+            self.trampas_visibles = mostrar_trampas
+
+        if mostrar_trampas:
+            _, label_activas, label_cooldown = self.labels_trampas
+            label_activas.config(text=f"Activas: {self.jugador.trampas_activas}/{MAX_TRAMPAS_ACTIVAS}")
+
+            tiempo_desde_ultima = self.sim.reloj() - self.jugador.ultimo_uso_trampa
+            cooldown_restante = max(0, COOLDOWN_TRAMPA - tiempo_desde_ultima)
+            label_cooldown.config(text=f"Cooldown: {cooldown_restante:.1f}s")
+
+    def mostrar_puntajes(self):
+        """Muestra la ventana de puntajes"""
+        ventana_puntajes = tk.Toplevel(self.root)
+        ventana_puntajes.title("Puntajes")
+        ventana_puntajes.geometry("400x500")
+        ventana_puntajes.resizable(False, False)
+
+        # Top 5 Modo Escapa
+        tk.Label(ventana_puntajes, text="TOP 5 - MODO ESCAPA", font=("Arial", 14, "bold")).pack(pady=10)
+
+        top_escapa = self.sistema_puntajes.obtener_top5("escapa")
+        if top_escapa:
+            for i, puntaje in enumerate(top_escapa, 1):
+                tk.Label(
+                    ventana_puntajes,
+                    text=f"{i}. {puntaje['nombre']} - {puntaje['puntaje']} pts",
+                    font=("Arial", 10)
+                ).pack()
+        else:
+            tk.Label(ventana_puntajes, text="No hay puntajes registrados", font=("Arial", 9)).pack()
+
+        tk.Label(ventana_puntajes, text="", height=2).pack()  # Espaciador
+
+        # Top 5 Modo Cazador
+        tk.Label(ventana_puntajes, text="TOP 5 - MODO CAZADOR", font=("Arial", 14, "bold")).pack(pady=10)
+
+        top_cazador = self.sistema_puntajes.obtener_top5("cazador")
+        if top_cazador:
+            for i, puntaje in enumerate(top_cazador, 1):
+                tk.Label(
+                    ventana_puntajes,
+                    text=f"{i}. {puntaje['nombre']} - {puntaje['puntaje']} pts",
+                    font=("Arial", 10)
+                ).pack()
+        else:
+            tk.Label(ventana_puntajes, text="No hay puntajes registrados", font=("Arial", 9)).pack()
+
+        # Puntajes que no se pudieron escribir (se siguen reintentando)
+        error = self.sistema_puntajes.error_escritura
+        if error is not None:
+            tk.Label(
+                ventana_puntajes,
+                text=f"{self.sistema_puntajes.sin_guardar()} puntaje(s) sin guardar: {error}",
+                font=("Arial", 9), fg="red", wraplength=380
+            ).pack(pady=5)
+
+        # Botón cerrar
+        tk.Button(
+            ventana_puntajes,
+            text="Cerrar",
+            command=ventana_puntajes.destroy,
+            font=("Arial", 10),
+            width=15
+        ).pack(pady=20)
+
+    def ejecutar(self):
+        """Ejecuta el juego"""
+        self.root.mainloop()
+        self.perfilador.cerrar()
+
+
+# ----------------- FUNCIÓN PRINCIPAL -----------------
+def main():
+    """Función principal del juego"""
+    juego = JuegoLaberinto()
+    juego.ejecutar()
+
+
+# Ejecutar el juego
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,32 @@
+# Escapa del Laberinto - carga de imágenes
+# Isaac Orozco y Daniel Araya
+#
+# Este módulo importa tkinter; solo lo usa la interfaz. PIL (si está
+# instalado) se importa recién al escalar la primera imagen.
+import importlib.util
+import os
+import tkinter as tk
+
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+
+def cargar_imagen_escalada(ruta, tamano, etiqueta="Imagen"):
+    """Carga un PNG como PhotoImage de (tamano x tamano); None si no se puede.
+
+    - Debe llamarse DESPUÉS de crear el Tk() principal.
+    - Sin PIL no se puede escalar: la imagen debe tener ya el tamaño correcto.
+    """
+    if not os.path.exists(ruta):
+        print(f"[{etiqueta}] No encontrado: {ruta}")
+        return None
+    try:
+        if PIL_AVAILABLE:
+            from PIL import Image, ImageTk
+            img = Image.open(ruta).convert("RGBA")
+            # redimensionar con filtro de alta calidad
+            img = img.resize((tamano, tamano), Image.Resampling.LANCZOS)
+            return ImageTk.PhotoImage(img)
+        return tk.PhotoImage(file=ruta)
+    except Exception as e:
+        print(f"[{etiqueta}] Error cargando imagen '{ruta}': {e}")
+        return None
@@ -0,0 +1,174 @@
+# Escapa del Laberinto - índice de casillas libres para aparecer enemigos
+# Isaac Orozco y Daniel Araya
+#
+# Los enemigos aparecen en casillas Camino (sin trampa) lejos del jugador.
+# En vez de recorrer toda la grilla en cada aparición, GrillaMapa mantiene
+# este índice al día con cada cambio de casilla y las consultas se responden
+# por muestreo, sin mirar todas las celdas.
+from array import array
+
+from laberinto.constantes import Punto
+
+# Lado de los bloques en que se agrupan las casillas para el muestreo exacto
+LADO_BLOQUE = 8
+# Intentos de muestreo al azar antes de pasar a recorrer los bloques
+INTENTOS_RECHAZO = 16
+
+
+class IndiceLibres:
+    """Conjunto de casillas libres (índices planos) con muestreo por distancia.
+
+    - agregar/quitar en O(1): listas con borrado por intercambio y un
+      arreglo con la posición de cada celda dentro de su lista.
+    - Las celdas se guardan en una lista global y en bloques de
+      LADO_BLOQUE x LADO_BLOQUE casillas.
+    - muestrear(rng, origen, distancia_minima) prueba primero celdas al azar
+      de la lista global; como la zona prohibida alrededor del jugador es
+      chica, casi siempre acierta al primer intento. Si no, elige entre los
+      bloques según cuántas celdas válidas tienen (solo se filtran una a una
+      las de los bloques que cruzan el borde de la zona prohibida).
+    """
+
+    def __init__(self, filas, columnas, libres=()):
+        self.filas = filas
+        self.columnas = columnas
+        self.bloques_por_fila = (columnas + LADO_BLOQUE - 1) // LADO_BLOQUE
+        num_bloques = self.bloques_por_fila * ((filas + LADO_BLOQUE - 1) // LADO_BLOQUE)
+        self.todas = []
+        self.bloques = [[] for _ in range(num_bloques)]
+        self._pos_todas = array('i', [-1]) * (filas * columnas)
+        self._pos_bloque = array('i', [-1]) * (filas * columnas)
+        self.celdas_revisadas = 0  # acumulado, para el perfilador
+        for i in libres:
+            self.agregar(i)
+
+    @classmethod
+    def desde_mapa(cls, mapa, codigo):
+        """Índice de todas las celdas del mapa con el código dado"""
+        celdas = mapa.celdas
+        libres = []
+        i = celdas.find(codigo)
+        while i != -1:
+            libres.append(i)
+            i = celdas.find(codigo, i + 1)
+        return cls(mapa.filas, mapa.columnas, libres)
+
+    def __len__(self):
+        return len(self.todas)
+
+    def __contains__(self, i):
+        return self._pos_todas[i] != -1
+
+    def _bloque(self, i):
+        r, c = divmod(i, self.columnas)
+        return (r // LADO_BLOQUE) * self.bloques_por_fila + c // LADO_BLOQUE
+
+    # ----------------- ACTUALIZACIÓN -----------------
+    def agregar(self, i):
+        if self._pos_todas[i] != -1:
+            return
+        self._pos_todas[i] = len(self.todas)
+        self.todas.append(i)
+        bloque = self.bloques[self._bloque(i)]
+        self._pos_bloque[i] = len(bloque)
+        bloque.append(i)
+
+    def quitar(self, i):
+        if self._pos_todas[i] == -1:
+            return
+        _quitar_de(self.todas, self._pos_todas, i)
+        _quitar_de(self.bloques[self._bloque(i)], self._pos_bloque, i)
+
+    # ----------------- CONSULTAS -----------------
+    def _distancia(self, i, origen):
+        r, c = divmod(i, self.columnas)
+        return abs(r - origen.r) + abs(c - origen.c)
+
+    def muestrear(self, rng, origen=None, distancia_minima=0, excluir=(), filtro=None):
+        """Índice de una celda libre al azar a distancia Manhattan >= distancia_minima
+        de origen (y fuera de `excluir`); None si no hay ninguna.
+
+        filtro(i) (opcional) es una condición extra que debe cumplir la celda.
+        """
+        if not self.todas:
+            return None
+        if origen is None:
+            distancia_minima = 0
+        for _ in range(INTENTOS_RECHAZO):
+            self.celdas_revisadas += 1
+            i = self.todas[int(rng.random() * len(self.todas))]
+            if i not in excluir and (distancia_minima <= 0 or
+                                     self._distancia(i, origen) >= distancia_minima) and (
+                    filtro is None or filtro(i)):
+                return i
+        return self._muestrear_por_bloques(rng, origen, distancia_minima, excluir, filtro)
+
+    def _muestrear_por_bloques(self, rng, origen, distancia_minima, excluir, filtro=None):
+        """Muestreo exacto: pesa cada bloque por su cantidad de celdas válidas"""
+        candidatos = []  # (peso, bloque completo o lista filtrada)
+        total = 0
+        for b, bloque in enumerate(self.bloques):
+            if not bloque:
+                continue
+            if distancia_minima > 0:
+                cercana, lejana = self._rango_distancias(b, origen)
+                if lejana < distancia_minima:
+                    continue  # todo el bloque está demasiado cerca
+                if cercana < distancia_minima:
+                    self.celdas_revisadas += len(bloque)
+                    bloque = [i for i in bloque if self._distancia(i, origen) >= distancia_minima]
+            if excluir:
+                bloque = [i for i in bloque if i not in excluir]
+            if filtro is not None:
+                self.celdas_revisadas += len(bloque)
+                bloque = [i for i in bloque if filtro(i)]
+            if bloque:
+                candidatos.append((len(bloque), bloque))
+                total += len(bloque)
+
+        if not total:
+            return None
+        elegido = int(rng.random() * total)
+        for peso, bloque in candidatos:
+            if elegido < peso:
+                return bloque[elegido]
+            elegido -= peso
+        return None
+
+    def _rango_distancias(self, b, origen):
+        """Distancias Manhattan mínima y máxima de origen al rectángulo del bloque b"""
+        fila_bloque, columna_bloque = divmod(b, self.bloques_por_fila)
+        r0 = fila_bloque * LADO_BLOQUE
+        c0 = columna_bloque * LADO_BLOQUE
+        r1 = min(r0 + LADO_BLOQUE, self.filas) - 1
+        c1 = min(c0 + LADO_BLOQUE, self.columnas) - 1
+        cercana = max(r0 - origen.r, 0, origen.r - r1) + max(c0 - origen.c, 0, origen.c - c1)
+        lejana = max(abs(origen.r - r0), abs(origen.r - r1)) + max(abs(origen.c - c0), abs(origen.c - c1))
+        return cercana, lejana
+
+    def muestrear_varias(self, rng, cantidad, origen=None, distancia_minima=0, filtro=None):
+        """Hasta `cantidad` celdas distintas (como Punto) con la misma regla de distancia"""
+        elegidas = set()
+        puntos = []
+        while len(puntos) < cantidad:
+            i = self.muestrear(rng, origen, distancia_minima, elegidas, filtro)
+            if i is None:
+                break
+            elegidas.add(i)
+            puntos.append(Punto(*divmod(i, self.columnas)))
+        return puntos
+
+    def muestrear_punto(self, rng, origen=None, distancia_minima=0, filtro=None):
+        """Como muestrear(), pero devuelve un Punto"""
+        i = self.muestrear(rng, origen, distancia_minima, filtro=filtro)
+        return None if i is None else Punto(*divmod(i, self.columnas))
+
+
+def _quitar_de(lista, posiciones, i):
+    """Borra i de lista en O(1) moviendo el último elemento a su lugar"""
+    j = posiciones[i]
+    ultimo = lista.pop()
+    if ultimo != i:
+        lista[j] = ultimo
+        posiciones[ultimo] = j
+    posiciones[i] = -1
@@ -0,0 +1,39 @@
+# Escapa del Laberinto - qué enemigos hay en cada casilla
+# Isaac Orozco y Daniel Araya
+#
+# Con miles de enemigos no se puede recorrer la lista entera para saber si
+# alguno está sobre el jugador. La simulación mantiene este índice al día
+# en cada movimiento y las colisiones se resuelven con una sola consulta.
+
+
+class MapaOcupacion:
+    """Índice celda (índice plano) -> ids de los enemigos vivos en ella.
+
+    - Solo guarda las celdas ocupadas (un diccionario), así que el costo no
+      depende del tamaño del mapa.
+    - Los ids son la posición del enemigo en Simulacion.enemigos.
+    """
+
+    def __init__(self):
+        self.celdas = {}
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.celdas.values())
+
+    def en(self, i):
+        """Ids de los enemigos en la celda i (tupla vacía si no hay)"""
+        return self.celdas.get(i, ())
+
+    def agregar(self, id_enemigo, i):
+        self.celdas.setdefault(i, []).append(id_enemigo)
+
+    def quitar(self, id_enemigo, i):
+        ids = self.celdas[i]
+        ids.remove(id_enemigo)  # casi siempre hay uno solo
+        if not ids:
+            del self.celdas[i]
+
+    def mover(self, id_enemigo, anterior, nueva):
+        if anterior != nueva:
+            self.quitar(id_enemigo, anterior)
+            self.agregar(id_enemigo, nueva)
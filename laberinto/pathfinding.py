@@ -0,0 +1,94 @@
+# Escapa del Laberinto - búsqueda de caminos
+# Isaac Orozco y Daniel Araya
+from array import array
+from collections import deque
+
+from laberinto.constantes import Punto
+
+
+# ----------------- PATHFINDING -----------------
+class CampoDistancias:
+    """Campo de distancias BFS hacia un origen, sobre casillas que pisan los enemigos.
+
+    Se calcula una sola vez y todos los enemigos leen de él su siguiente
+    paso en O(1). Solo se recalcula cuando cambia el origen o el mapa.
+    """
+
+    def __init__(self, mapa):
+        self.mapa = mapa
+        self.origenes = None
+        self.version = -1
+        self.distancias = None
+        self.nodos_expandidos = 0
+
+    def actualizar(self, origen):
+        """Usa `origen` como raíz; devuelve True si hubo que recalcular"""
+        return self.actualizar_varios((origen,))
+
+    def actualizar_varios(self, origenes):
+        origenes = tuple(origenes)
+        if origenes == self.origenes and self.version == self.mapa.version_paso:
+            return False
+        self._calcular(origenes)
+        self.origenes = origenes
+        self.version = self.mapa.version_paso
+        return True
+
+    def _calcular(self, origenes):
+        """BFS multi-origen sobre el arreglo plano de paso de enemigos"""
+        filas = self.mapa.filas
+        columnas = self.mapa.columnas
+        paso = self.mapa.paso_enemigo
+        dist = array("i", [-1]) * (filas * columnas)
+        cola = deque()
+        for origen in origenes:
+            i = origen.r * columnas + origen.c
+            dist[i] = 0
+            cola.append(i)
+
+        expandidos = 0
+        while cola:
+            i = cola.popleft()
+            expandidos += 1
+            d = dist[i] + 1
+            r, c = divmod(i, columnas)
+            if c > 0 and dist[i - 1] < 0 and paso[i - 1]:
+                dist[i - 1] = d
+                cola.append(i - 1)
+            if c < columnas - 1 and dist[i + 1] < 0 and paso[i + 1]:
+                dist[i + 1] = d
+                cola.append(i + 1)
+            if r > 0 and dist[i - columnas] < 0 and paso[i - columnas]:
+                dist[i - columnas] = d
+                cola.append(i - columnas)
+            if r < filas - 1 and dist[i + columnas] < 0 and paso[i + columnas]:
+                dist[i + columnas] = d
+                cola.append(i + columnas)
+
+        self.distancias = dist
+        self.nodos_expandidos += expandidos
+
+    def distancia(self, posicion):
+        """Distancia real (en pasos) desde posicion al origen; -1 si no hay camino"""
+        return self.distancias[posicion.r * self.mapa.columnas + posicion.c]
+
+    def siguiente_paso(self, posicion, huir=False):
+        """Devuelve el vecino que acerca (o aleja) del origen, o None"""
+        columnas = self.mapa.columnas
+        dist = self.distancias
+        mejor = None
+        mejor_distancia = dist[posicion.r * columnas + posicion.c]
+        if mejor_distancia < 0:
+            return None
+
+        for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            nr, nc = posicion.r + dr, posicion.c + dc
+            if not self.mapa.accesible(nr, nc, es_jugador=False):
+                continue
+            d = dist[nr * columnas + nc]
+            if d < 0:
+                continue
+            if (d > mejor_distancia) if huir else (d < mejor_distancia):
+                mejor_distancia = d
+                mejor = Punto(nr, nc)
+        return mejor
@@ -0,0 +1,209 @@
+# Escapa del Laberinto - instrumentación por tick
+# Isaac Orozco y Daniel Araya
+#
+# Mide cuánto cuesta cada fase de un frame del juego (simulación, interfaz,
+# dibujo...) y cuenta trabajo hecho (items de canvas creados, nodos del BFS,
+# celdas revisadas). Está apagado por defecto y entonces no mide nada.
+#
+#   LABERINTO_PERFIL=1                          # encender al arrancar
+#   LABERINTO_PERFIL_SALIDA=perfil.jsonl        # exportar cada frame (.jsonl o .csv)
+#
+# En el juego, F3 lo enciende o apaga y muestra un resumen sobre el canvas.
+import csv
+import json
+import os
+import time
+from collections import deque
+
+# Límites superiores (ms) de los grupos del histograma de duración de frames
+LIMITES_HISTOGRAMA = (1, 2, 4, 8, 16, 33, 50, 100, float("inf"))
+# Columnas fijas del CSV (fases y contadores que mide el juego); otras que
+# aparezcan en el primer frame se agregan al final
+COLUMNAS_CSV = ("frame", "t", "total_ms", "simulacion_ms", "enemigos_ms", "reaparicion_ms",
+                "colisiones_ms", "victoria_ms", "interfaz_ms", "dibujo_ms",
+                "ticks", "items_canvas", "nodos_bfs", "celdas_revisadas")
+
+
+class _Fase:
+    """Context manager que suma el tiempo de una fase al frame actual"""
+
+    __slots__ = ("perfilador", "nombre", "inicio")
+
+    def __init__(self, perfilador, nombre):
+        self.perfilador = perfilador
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        fases = self.perfilador.frame_fases
+        fases[self.nombre] = fases.get(self.nombre, 0.0) + time.perf_counter() - self.inicio
+        return False
+
+
+class _FaseInactiva:
+    """No hace nada: es lo que devuelve fase() con el perfilador apagado"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_FASE_INACTIVA = _FaseInactiva()
+
+
+class Perfilador:
+    """Tiempos por fase, contadores y un histograma móvil de la duración de frames.
+
+    - fase(nombre) se usa con `with`; las fases pueden anidarse (la de
+      afuera incluye el tiempo de las de adentro).
+    - contar(nombre, n) suma a un contador del frame; fijar(nombre, total)
+      sirve para contadores acumulados de otros objetos (se guarda la
+      diferencia con el frame anterior).
+    - iniciar_frame() / terminar_frame() delimitan un frame; al terminar se
+      guarda en la ventana móvil y, si hay archivo de salida, se exporta.
+    """
+
+    def __init__(self, activo=False, salida=None, ventana=300):
+        self.activo = activo
+        self.salida = salida
+        self.frames = deque(maxlen=ventana)  # últimos frames (diccionarios)
+        self.totales_anteriores = {}
+        self.numero_frame = 0
+        self._archivo = None
+        self._escritor_csv = None
+        self._nuevo_frame()
+
+    @classmethod
+    def desde_entorno(cls):
+        """Perfilador configurado con LABERINTO_PERFIL y LABERINTO_PERFIL_SALIDA"""
+        salida = os.environ.get("LABERINTO_PERFIL_SALIDA") or None
+        activo = os.environ.get("LABERINTO_PERFIL", "") not in ("", "0") or salida is not None
+        return cls(activo, salida)
+
+    def _nuevo_frame(self):
+        self.frame_fases = {}
+        self.frame_contadores = {}
+        self.inicio_frame = time.perf_counter()
+
+    def alternar(self):
+        self.activo = not self.activo
+        # Mientras estuvo apagado no se llamó a fijar(): se parte de cero
+        self.totales_anteriores.clear()
+        self._nuevo_frame()
+        return self.activo
+
+    # ----------------- MEDICIÓN -----------------
+    def fase(self, nombre):
+        if not self.activo:
+            return _FASE_INACTIVA
+        return _Fase(self, nombre)
+
+    def contar(self, nombre, n=1):
+        if self.activo:
+            self.frame_contadores[nombre] = self.frame_contadores.get(nombre, 0) + n
+
+    def fijar(self, nombre, total):
+        """Registra el avance de un contador acumulado (p. ej. nodos_expandidos)"""
+        anterior = self.totales_anteriores.get(nombre, total)
+        self.totales_anteriores[nombre] = total
+        if self.activo and total >= anterior:
+            self.contar(nombre, total - anterior)
+
+    def iniciar_frame(self):
+        if self.activo:
+            self._nuevo_frame()
+
+    def terminar_frame(self):
+        if not self.activo:
+            return
+        self.numero_frame += 1
+        frame = {
+            "frame": self.numero_frame,
+            "t": time.time(),
+            "total_ms": (time.perf_counter() - self.inicio_frame) * 1000,
+        }
+        for nombre, segundos in self.frame_fases.items():
+            frame[f"{nombre}_ms"] = segundos * 1000
+        frame.update(self.frame_contadores)
+        self.frames.append(frame)
+        if self.salida:
+            self._exportar(frame)
+        self._nuevo_frame()
+
+    # ----------------- EXPORTACIÓN -----------------
+    def _exportar(self, frame):
+        try:
+            if self._archivo is None:
+                nuevo = not os.path.exists(self.salida) or os.path.getsize(self.salida) == 0
+                self._archivo = open(self.salida, "a", encoding="utf-8", newline="")
+                if self.salida.lower().endswith(".csv"):
+                    # Las fases que no corrieron en un frame quedan en 0
+                    columnas = list(COLUMNAS_CSV) + [c for c in frame if c not in COLUMNAS_CSV]
+                    self._escritor_csv = csv.DictWriter(self._archivo, fieldnames=columnas,
+                                                        restval=0, extrasaction="ignore")
+                    if nuevo:
+                        self._escritor_csv.writeheader()
+            if self._escritor_csv is not None:
+                self._escritor_csv.writerow(frame)
+            else:
+                self._archivo.write(json.dumps(frame) + "\n")
+            self._archivo.flush()
+        except OSError as e:
+            print(f"Error exportando perfil: {e}")
+            self.salida = None
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+            self._escritor_csv = None
+
+    # ----------------- RESUMEN -----------------
+    def histograma(self):
+        """[(límite_ms, cantidad de frames)] de la ventana móvil"""
+        cuentas = [0] * len(LIMITES_HISTOGRAMA)
+        for frame in self.frames:
+            for i, limite in enumerate(LIMITES_HISTOGRAMA):
+                if frame["total_ms"] <= limite:
+                    cuentas[i] += 1
+                    break
+        return list(zip(LIMITES_HISTOGRAMA, cuentas))
+
+    def resumen(self):
+        """Promedios por fase/contador y percentiles de la ventana móvil"""
+        if not self.frames:
+            return {}
+        tiempos = sorted(frame["total_ms"] for frame in self.frames)
+        promedios = {}
+        for frame in self.frames:
+            for clave, valor in frame.items():
+                if clave not in ("frame", "t", "total_ms"):
+                    promedios[clave] = promedios.get(clave, 0) + valor
+        cantidad = len(self.frames)
+        duracion = self.frames[-1]["t"] - self.frames[0]["t"]
+        return {
+            "frames": cantidad,
+            "fps": (cantidad - 1) / duracion if duracion > 0 else 0.0,
+            "p50_ms": tiempos[cantidad // 2],
+            "p95_ms": tiempos[min(cantidad - 1, int(cantidad * 0.95))],
+            "max_ms": tiempos[-1],
+            "promedios": {clave: valor / cantidad for clave, valor in sorted(promedios.items())},
+        }
+
+    def texto(self):
+        """Resumen en pocas líneas para mostrar sobre el canvas"""
+        datos = self.resumen()
+        if not datos:
+            return "PERFIL: esperando frames..."
+        lineas = [f"PERFIL  {datos['fps']:.1f} fps  p50 {datos['p50_ms']:.2f} ms  "
+                  f"p95 {datos['p95_ms']:.2f} ms  max {datos['max_ms']:.2f} ms"]
+        for clave, valor in datos["promedios"].items():
+            lineas.append(f"{clave}: {valor:.3f}" if clave.endswith("_ms") else f"{clave}: {valor:.1f}")
+        barras = "  ".join(f"<={limite:g}:{cuenta}" for limite, cuenta in self.histograma() if cuenta)
+        lineas.append(f"hist ms {barras}")
+        return "\n".join(lineas)
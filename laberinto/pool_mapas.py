@@ -0,0 +1,99 @@
+# Escapa del Laberinto - mapas pregenerados
+# Isaac Orozco y Daniel Araya
+#
+# Generar un mapa puede tomar varios intentos. Este módulo los genera por
+# adelantado para que iniciar o reiniciar una partida no bloquee la interfaz.
+import os
+import queue
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from laberinto.constantes import FILAS, COLUMNAS
+from laberinto.generador import generar_mapa_juego
+
+
+class PoolMapas:
+    """Mantiene una cola de mapas válidos listos por cada tamaño de mapa.
+
+    Un hilo en segundo plano rellena las colas; obtener() toma un mapa ya
+    generado al instante y solo genera en el momento si la cola está vacía.
+    La dificultad no cambia el mapa, así que las colas son por (filas, columnas).
+    """
+
+    def __init__(self, tamano_cola=3, tamanos=((FILAS, COLUMNAS),), semilla=None):
+        self.tamano_cola = tamano_cola
+        self.colas = {tamano: queue.Queue(maxsize=tamano_cola) for tamano in tamanos}
+        self.rng = random.Random(semilla)  # semillas de los mapas generados
+        self._lock = threading.Lock()
+        self._hay_espacio = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        """Arranca el hilo que mantiene las colas llenas"""
+        if self._hilo is None:
+            self._hay_espacio.set()
+            self._hilo = threading.Thread(target=self._rellenar, name="PoolMapas", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+        self._hay_espacio.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=1)
+            self._hilo = None
+
+    def _nueva_semilla(self):
+        with self._lock:
+            return self.rng.randrange(2 ** 32)
+
+    def _rellenar(self):
+        while not self._detener.is_set():
+            self._hay_espacio.wait()
+            self._hay_espacio.clear()
+            for (filas, columnas), cola in list(self.colas.items()):
+                while not cola.full() and not self._detener.is_set():
+                    generador = generar_mapa_juego(self._nueva_semilla(), filas, columnas,
+                                                   mostrar_progreso=False)
+                    cola.put(generador)
+
+    def obtener(self, filas=FILAS, columnas=COLUMNAS):
+        """Devuelve un GeneradorMapa válido; al instante si hay uno en cola"""
+        cola = self.colas.get((filas, columnas))
+        if cola is None:
+            # Tamaño nuevo: se empieza a mantener su cola desde ahora
+            cola = self.colas.setdefault((filas, columnas), queue.Queue(maxsize=self.tamano_cola))
+        try:
+            generador = cola.get_nowait()
+        except queue.Empty:
+            generador = generar_mapa_juego(self._nueva_semilla(), filas, columnas,
+                                           mostrar_progreso=False)
+        self._hay_espacio.set()
+        return generador
+
+
+# ----------------- GENERACIÓN EN LOTE -----------------
+def _generar_con_semilla(args):
+    semilla, filas, columnas = args
+    return generar_mapa_juego(semilla, filas, columnas, mostrar_progreso=False)
+
+
+def generar_lote(cantidad, filas=FILAS, columnas=COLUMNAS, semilla_base=0, procesos=None):
+    """Genera `cantidad` mapas usando todos los núcleos.
+
+    El mapa i se pide a generar_mapa_juego con la semilla semilla_base + i,
+    así que el lote completo es reproducible. Su .semilla no es esa: es la
+    del intento que funcionó, derivada de ella. Devuelve un iterador de
+    GeneradorMapa en orden.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    tareas = [(semilla_base + i, filas, columnas) for i in range(cantidad)]
+    if procesos == 1:
+        yield from map(_generar_con_semilla, tareas)
+        return
+    # Lotes grandes por proceso para amortizar el costo de pasar los mapas
+    chunksize = max(1, cantidad // (procesos * 8))
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        yield from executor.map(_generar_con_semilla, tareas, chunksize=chunksize)
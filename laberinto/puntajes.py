@@ -0,0 +1,447 @@
+# Escapa del Laberinto - sistema de puntajes
+# Isaac Orozco y Daniel Araya
+#
+# Los puntajes se guardan en un log de solo-agregar (una línea JSON por
+# partida). En memoria se mantiene un heap con el top-K de cada modo y el
+# mejor puntaje de cada jugador, así que agregar y consultar no reescriben
+# ni vuelven a leer el archivo completo. Todo el acceso al disco lo hace un
+# hilo en segundo plano con el archivo bloqueado (escribir, leer lo que
+# agregaron otros procesos y compactar), de modo que el juego nunca espera al
+# disco y dos procesos pueden escribir a la vez sin perder puntajes. El log se
+# abre en binario: los offsets de la lectura incremental son bytes también en
+# Windows, donde el modo texto traduciría los "\r\n".
+import atexit
+import bisect
+import contextlib
+import datetime
+import heapq
+import json
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+
+from laberinto.constantes import (ARCHIVO_PUNTAJES, ARCHIVO_PUNTAJES_ESCAPA,
+                                  ARCHIVO_PUNTAJES_CAZADOR)
+
+FORMATO_FECHA = "%d/%m/%Y %H:%M"
+# Espera antes de reintentar una escritura fallida; se duplica hasta el máximo
+ESPERA_REINTENTO = 1.0
+ESPERA_MAXIMA = 60.0
+
+try:
+    import fcntl
+
+    def _bloquear(f, exclusivo=True):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+
+    def _desbloquear(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _bloquear(f, exclusivo=True):
+        # msvcrt bloquea bytes desde la posición actual: siempre el primero
+        posicion = f.tell()
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        f.seek(posicion)
+
+    def _desbloquear(f):
+        posicion = f.tell()
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.seek(posicion)
+
+
+def cargar_puntajes_txt(archivo):
+    """Lee un archivo de puntajes del formato anterior (TOP 5 en TXT)"""
+    puntajes = []
+    if not os.path.exists(archivo):
+        return puntajes
+
+    with open(archivo, 'r', encoding='utf-8') as f:
+        for linea in f:
+            partes = [parte.strip() for parte in linea.strip().split('|')]
+            if len(partes) < 3:
+                continue
+            nombre, puntaje_str, fecha = partes[:3]
+            # Filtrar líneas de encabezado y separadores
+            if (nombre.lower() == 'nombre' or nombre.startswith('=') or
+                    nombre.startswith('-') or not puntaje_str.isdigit()):
+                continue
+            try:
+                instante = datetime.datetime.strptime(fecha, FORMATO_FECHA).timestamp()
+            except ValueError:
+                instante = 0.0
+            puntajes.append({"nombre": nombre, "puntaje": int(puntaje_str),
+                             "fecha": fecha, "t": instante})
+    return puntajes
+
+
+def _interpretar_lineas(lineas):
+    """[(modo, registro)] de las líneas (bytes) del log"""
+    registros = []
+    for linea in lineas:
+        try:
+            datos = json.loads(linea.decode("utf-8"))
+            registros.append((datos.pop("modo"), datos))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue  # línea incompleta o dañada: se ignora
+    return registros
+
+
+def _mismo_archivo(f, ruta):
+    """True si f sigue siendo el archivo que hay en ruta (no fue reemplazado)"""
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return False
+    abierto = os.fstat(f.fileno())
+    return (abierto.st_dev, abierto.st_ino) == (estado.st_dev, estado.st_ino)
+
+
+class SistemaPuntajes:
+    """Puntajes de ambos modos sobre un log de solo-agregar.
+
+    - agregar_puntaje() actualiza la memoria al instante y encola la escritura.
+    - obtener_top(modo, k), mejor_por_jugador(modo) y entre_fechas(modo, ...)
+      responden solo desde memoria. El hilo escritor lee cada
+      intervalo_lectura segundos lo que agregaron otros procesos (sin hilo,
+      con asincrono=False, lo leen las mismas consultas).
+    - Cuando el log crece, se compacta en segundo plano: se conservan los
+      puntajes recientes, el top de cada modo y el mejor de cada jugador.
+    - Si el log no existe se migran los puntajes_*.txt del formato anterior.
+    - Si escribir falla, el puntaje sigue en memoria y se reintenta con
+      esperas crecientes; error_escritura y sin_guardar() lo muestran.
+    """
+
+    def __init__(self, archivo=ARCHIVO_PUNTAJES, k=5, asincrono=True,
+                 archivos_anteriores=None, compactar_cada=1000, retencion_dias=365,
+                 intervalo_lectura=2.0):
+        self.archivo = archivo
+        self.k = k
+        self.asincrono = asincrono
+        self.compactar_cada = compactar_cada
+        self.retencion_dias = retencion_dias
+        self.intervalo_lectura = intervalo_lectura
+        if archivos_anteriores is None:
+            archivos_anteriores = {"escapa": ARCHIVO_PUNTAJES_ESCAPA,
+                                   "cazador": ARCHIVO_PUNTAJES_CAZADOR}
+
+        self._lock = threading.RLock()
+        self._pendientes = []      # (linea, modo, registro) agregados pero aún no escritos
+        self._por_escribir = []    # los que el escritor ya tomó (o falló al escribir)
+        self._espera = 0.0         # segundos hasta el próximo reintento tras un error
+        self._proximo_intento = 0.0
+        self.error_escritura = None  # último OSError al escribir; None si está todo guardado
+        self._reiniciar_memoria()
+        self._offset = 0           # hasta dónde del log ya está en memoria
+        self._identidad = None     # (st_dev, st_ino, primera línea) del log leído
+        self._agregados = 0        # registros escritos desde la última compactación
+        self._cola = queue.Queue()
+        self._hilo = None
+
+        if not os.path.exists(self.archivo):
+            self._migrar(archivos_anteriores)
+        self._sincronizar()
+
+        if asincrono:
+            self._hilo = threading.Thread(target=self._escritor, name="SistemaPuntajes", daemon=True)
+            self._hilo.start()
+            atexit.register(self.cerrar)
+
+    # ----------------- MEMORIA -----------------
+    def _reiniciar_memoria(self):
+        self._registros = {}   # modo -> lista ordenada por "t" (para rangos de fecha)
+        self._instantes = {}   # modo -> los "t" de _registros, para buscar con bisect
+        self._tops = {}        # modo -> min-heap de (puntaje, -t, n, registro) con k elementos
+        self._mejores = {}     # modo -> {nombre: registro}
+        self._contador = 0     # desempate estable dentro de los heaps
+
+    def _indexar(self, modo, registro):
+        registros = self._registros.setdefault(modo, [])
+        instantes = self._instantes.setdefault(modo, [])
+        i = bisect.bisect_right(instantes, registro["t"])  # casi siempre al final
+        instantes.insert(i, registro["t"])
+        registros.insert(i, registro)
+
+        self._contador += 1
+        # A igual puntaje gana el más antiguo (como el sort estable anterior)
+        entrada = (registro["puntaje"], -registro["t"], -self._contador, registro)
+        top = self._tops.setdefault(modo, [])
+        if len(top) < self.k:
+            heapq.heappush(top, entrada)
+        elif entrada[:3] > top[0][:3]:
+            heapq.heapreplace(top, entrada)
+
+        mejores = self._mejores.setdefault(modo, {})
+        actual = mejores.get(registro["nombre"])
+        if actual is None or registro["puntaje"] > actual["puntaje"]:
+            mejores[registro["nombre"]] = registro
+
+    # ----------------- ARCHIVO -----------------
+    def _migrar(self, archivos_anteriores):
+        """Pasa los puntajes del formato TXT anterior al log"""
+        lineas = []
+        for modo, archivo in archivos_anteriores.items():
+            try:
+                for registro in cargar_puntajes_txt(archivo):
+                    lineas.append(json.dumps(dict(registro, modo=modo), ensure_ascii=False))
+            except OSError as e:
+                print(f"Error migrando puntajes de {archivo}: {e}")
+        if not lineas:
+            return
+        try:
+            with self._abrir_bloqueado("ab+") as f:
+                # Otro proceso que arrancó a la vez pudo migrar primero
+                if os.fstat(f.fileno()).st_size == 0:
+                    f.write("".join(linea + "\n" for linea in lineas).encode("utf-8"))
+        except OSError as e:
+            print(f"Error migrando puntajes: {e}")
+
+    @contextlib.contextmanager
+    def _abrir_bloqueado(self, modo, exclusivo=True):
+        """Abre el log en binario y lo bloquea. Si otro proceso lo compactó
+        mientras se esperaba el bloqueo, se vuelve a abrir el archivo nuevo"""
+        while True:
+            f = open(self.archivo, modo)
+            try:
+                _bloquear(f, exclusivo)
+                try:
+                    if _mismo_archivo(f, self.archivo):
+                        yield f
+                        return
+                finally:
+                    _desbloquear(f)
+            finally:
+                f.close()
+
+    def _escribir_lineas(self, lineas):
+        """Agrega líneas al log con el archivo bloqueado; lee antes lo que agregaron otros"""
+        with self._abrir_bloqueado("ab+") as f:
+            self._leer_nuevo(f)
+            f.seek(0, os.SEEK_END)
+            f.write("".join(linea + "\n" for linea in lineas).encode("utf-8"))
+            f.flush()
+            self._offset = f.tell()
+
+    def _leer_nuevo(self, f):
+        """Carga en memoria las líneas del log posteriores a self._offset"""
+        estado = os.fstat(f.fileno())
+        # El número de inodo se reutiliza entre compactaciones: la primera
+        # línea (la cabecera única de cada compactación) distingue los logs
+        f.seek(0)
+        identidad = (estado.st_dev, estado.st_ino, f.readline())
+        # Primera lectura o el log fue compactado: se vuelve a leer completo
+        recargar = identidad != self._identidad or estado.st_size < self._offset
+        offset = 0 if recargar else self._offset
+        registros = []
+        if estado.st_size > offset:
+            f.seek(offset)
+            datos = f.read()
+            # Una línea sin "\n" final todavía se está escribiendo: se deja para después
+            completo = datos[:datos.rfind(b"\n") + 1]
+            registros = _interpretar_lineas(completo.splitlines())
+            offset += len(completo)
+        with self._lock:
+            if recargar:
+                self._reiniciar_memoria()
+            for modo, registro in registros:
+                self._indexar(modo, registro)
+            if recargar:
+                # Lo agregado en este proceso que aún no llegó al disco sigue contando
+                for _, modo, registro in self._pendientes:
+                    self._indexar(modo, registro)
+        self._offset = offset
+        self._identidad = identidad
+
+    def _sincronizar(self):
+        """Lee lo que otros procesos agregaron al log"""
+        if not os.path.exists(self.archivo):
+            return
+        try:
+            with self._abrir_bloqueado("rb", exclusivo=False) as f:
+                self._leer_nuevo(f)
+        except OSError as e:
+            print(f"Error cargando puntajes: {e}")
+
+    def compactar(self):
+        """Reescribe el log conservando lo que las consultas pueden necesitar"""
+        limite = (datetime.datetime.now().timestamp() - self.retencion_dias * 86400
+                  if self.retencion_dias is not None else float("-inf"))
+        try:
+            with self._abrir_bloqueado("ab+") as actual:
+                # Con el log bloqueado nadie agrega: lo leído es todo lo que hay
+                self._leer_nuevo(actual)
+                with self._lock:
+                    pendientes = {id(registro) for _, _, registro in self._pendientes}
+                    conservar = []
+                    for modo, registros in self._registros.items():
+                        elegidos = {id(r): r for r in registros if r["t"] >= limite}
+                        elegidos.update((id(e[3]), e[3]) for e in self._tops.get(modo, []))
+                        elegidos.update((id(r), r) for r in self._mejores.get(modo, {}).values())
+                        # Los pendientes los escribe después el hilo escritor
+                        conservar.extend((modo, r) for i, r in elegidos.items() if i not in pendientes)
+                conservar.sort(key=lambda e: e[1]["t"])
+
+                # Nombre único junto al log: dos procesos compactando no se pisan
+                descriptor, temporal = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(self.archivo)),
+                    prefix=os.path.basename(self.archivo) + ".", suffix=".tmp")
+                try:
+                    with os.fdopen(descriptor, "wb") as f:
+                        cabecera = (json.dumps({"compactado": os.urandom(8).hex()}) + "\n").encode("utf-8")
+                        f.write(cabecera)
+                        for modo, registro in conservar:
+                            linea = json.dumps(dict(registro, modo=modo), ensure_ascii=False) + "\n"
+                            f.write(linea.encode("utf-8"))
+                        f.flush()
+                        estado = os.fstat(f.fileno())
+                    os.chmod(temporal, stat.S_IMODE(os.fstat(actual.fileno()).st_mode))
+                    os.replace(temporal, self.archivo)
+                except BaseException:
+                    if os.path.exists(temporal):
+                        os.remove(temporal)
+                    raise
+        except OSError as e:
+            print(f"Error compactando puntajes: {e}")
+            return
+
+        # La memoria queda igual al log nuevo, sin volver a leerlo
+        with self._lock:
+            self._reiniciar_memoria()
+            for modo, registro in conservar:
+                self._indexar(modo, registro)
+            for _, modo, registro in self._pendientes:
+                self._indexar(modo, registro)
+        self._identidad = (estado.st_dev, estado.st_ino, cabecera)
+        self._offset = estado.st_size
+        self._agregados = 0
+
+    # ----------------- ESCRITOR EN SEGUNDO PLANO -----------------
+    def _escritor(self):
+        while True:
+            espera = self.intervalo_lectura
+            if self._por_escribir:
+                espera = max(0.0, min(espera, self._proximo_intento - time.monotonic()))
+            try:
+                tarea = self._cola.get(timeout=espera)
+            except queue.Empty:
+                self._escribir_pendientes()  # reintento tras un error
+                self._sincronizar()  # lo que agregaron otros procesos
+                continue
+            try:
+                if tarea is None:
+                    # Al cerrar se intenta una última vez sin esperar
+                    self._escribir_pendientes(forzar=True)
+                    return
+                self._procesar(tarea)
+            finally:
+                self._cola.task_done()
+
+    def _procesar(self, tarea):
+        if tarea == "compactar":
+            self.compactar()
+            return
+        self._por_escribir.append(tarea)
+        # Sin hilo escritor la llamada la hace el jugador: no hay que espaciar reintentos
+        self._escribir_pendientes(forzar=self._hilo is None)
+
+    def _escribir_pendientes(self, forzar=False):
+        """Escribe en una sola pasada lo que espera en _por_escribir (lo nuevo y lo
+        que falló antes). Si falla, se reintenta con una espera que se duplica"""
+        if not self._por_escribir or (not forzar and time.monotonic() < self._proximo_intento):
+            return
+        tareas = self._por_escribir
+        try:
+            self._escribir_lineas([tarea[0] for tarea in tareas])
+        except OSError as e:
+            self.error_escritura = e
+            self._espera = min(self._espera * 2, ESPERA_MAXIMA) if self._espera else ESPERA_REINTENTO
+            self._proximo_intento = time.monotonic() + self._espera
+            print(f"Error guardando puntajes (se reintenta en {self._espera:.1f} s): {e}")
+            return
+        self._por_escribir = []
+        self.error_escritura = None
+        self._espera = self._proximo_intento = 0.0
+        with self._lock:
+            for tarea in tareas:
+                self._pendientes.remove(tarea)
+        self._agregados += len(tareas)
+        if self.compactar_cada and self._agregados >= self.compactar_cada:
+            self.compactar()
+
+    def esperar(self):
+        """Espera a que el hilo escritor procese lo encolado (si una escritura
+        falló, queda en sin_guardar() hasta el próximo reintento)"""
+        if self._hilo is not None:
+            self._cola.join()
+
+    def cerrar(self):
+        if self._hilo is not None:
+            self._cola.put(None)
+            self._hilo.join()
+            self._hilo = None
+
+    # ----------------- API -----------------
+    def _al_dia(self):
+        """Sin hilo escritor, las consultas leen antes lo que agregaron otros procesos"""
+        if self._hilo is None:
+            self._sincronizar()
+
+    def sin_guardar(self):
+        """Cantidad de puntajes que están en memoria pero aún no en el log"""
+        with self._lock:
+            return len(self._pendientes)
+
+    def agregar_puntaje(self, nombre, puntaje, modo):
+        """Agrega un nuevo puntaje con la fecha actual (la escritura es asíncrona)"""
+        ahora = datetime.datetime.now()
+        registro = {"nombre": nombre, "puntaje": puntaje,
+                    "fecha": ahora.strftime(FORMATO_FECHA), "t": ahora.timestamp()}
+        tarea = (json.dumps(dict(registro, modo=modo), ensure_ascii=False), modo, registro)
+        with self._lock:
+            self._indexar(modo, registro)
+            self._pendientes.append(tarea)
+        if self._hilo is not None:
+            self._cola.put(tarea)
+        else:
+            self._procesar(tarea)
+
+    def obtener_top(self, modo, k=None):
+        """Los k mejores puntajes del modo, de mayor a menor"""
+        self._al_dia()
+        k = self.k if k is None else k
+        with self._lock:
+            if k <= self.k:
+                top = sorted(self._tops.get(modo, []), reverse=True)[:k]
+                return [entrada[3] for entrada in top]
+            todos = enumerate(self._registros.get(modo, []))
+            mejores = heapq.nlargest(k, todos, key=lambda e: (e[1]["puntaje"], -e[1]["t"], -e[0]))
+            return [registro for _, registro in mejores]
+
+    def obtener_top5(self, modo):
+        """Obtiene el top 5 de un modo específico"""
+        return self.obtener_top(modo, 5)
+
+    def mejor_por_jugador(self, modo):
+        """{nombre: mejor registro} de todos los jugadores del modo"""
+        self._al_dia()
+        with self._lock:
+            return dict(self._mejores.get(modo, {}))
+
+    def mejor_de(self, nombre, modo):
+        return self.mejor_por_jugador(modo).get(nombre)
+
+    def entre_fechas(self, modo, desde=None, hasta=None):
+        """Puntajes del modo con fecha en [desde, hasta] (datetime), en orden cronológico"""
+        self._al_dia()
+        with self._lock:
+            registros = self._registros.get(modo, [])
+            instantes = self._instantes.get(modo, [])
+            inicio = bisect.bisect_left(instantes, desde.timestamp()) if desde else 0
+            fin = bisect.bisect_right(instantes, hasta.timestamp()) if hasta else len(registros)
+            return registros[inicio:fin]
@@ -0,0 +1,151 @@
+# Escapa del Laberinto - atlas de sprites con caché en disco
+# Isaac Orozco y Daniel Araya
+#
+# Decodificar los PNG originales (liana.png pesa ~880 KB) y escalarlos con
+# LANCZOS en cada arranque es lo más lento de abrir el juego. Aquí todas las
+# imágenes de un tamaño de casilla se escalan una sola vez y se guardan
+# juntas en un atlas PNG dentro de DIRECTORIO_CACHE. En los arranques
+# siguientes basta con leer ese atlas chico (tkinter lo lee sin PIL) y
+# recortar cada imagen la primera vez que se pide.
+#
+# Como laberinto.imagenes, este módulo importa tkinter: solo lo usa la
+# interfaz. PIL se importa solo para construir un atlas nuevo; con la caché
+# vigente el arranque no lo carga.
+import json
+import os
+import tkinter as tk
+
+from laberinto.constantes import DIRECTORIO_CACHE
+from laberinto.imagenes import PIL_AVAILABLE, cargar_imagen_escalada
+
+VERSION_ATLAS = 1
+
+
+def clave_archivo(ruta):
+    """(ruta, mtime, tamaño en bytes) del archivo; None si no existe"""
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        return None
+    return [os.path.abspath(ruta), estado.st_mtime_ns, estado.st_size]
+
+
+def construir_atlas(rutas, tamano):
+    """Escala con PIL cada imagen a (tamano x tamano) y las pega en una sola imagen.
+
+    Devuelve (imagen PIL, {ruta: [x, y]}); las rutas que no se pueden leer
+    quedan fuera del atlas.
+    """
+    from PIL import Image
+
+    escaladas = []
+    for ruta in rutas:
+        try:
+            img = Image.open(ruta).convert("RGBA")
+            escaladas.append((ruta, img.resize((tamano, tamano), Image.Resampling.LANCZOS)))
+        except Exception as e:
+            print(f"[Atlas] Error cargando imagen '{ruta}': {e}")
+
+    por_fila = max(1, int(len(escaladas) ** 0.5 + 0.999))
+    filas = max(1, (len(escaladas) + por_fila - 1) // por_fila)
+    atlas = Image.new("RGBA", (por_fila * tamano, filas * tamano), (0, 0, 0, 0))
+    posiciones = {}
+    for n, (ruta, img) in enumerate(escaladas):
+        x, y = (n % por_fila) * tamano, (n // por_fila) * tamano
+        atlas.paste(img, (x, y))
+        posiciones[ruta] = [x, y]
+    return atlas, posiciones
+
+
+class GestorRecursos:
+    """Imágenes escaladas del juego servidas desde un atlas por tamaño de casilla.
+
+    - rutas: todas las imágenes que van al atlas (se registran de antemano
+      para que un solo archivo las contenga a todas).
+    - imagen(ruta, tamano, etiqueta) tiene la misma forma que
+      cargar_imagen_escalada y se puede pasar en su lugar.
+    - Nada se lee hasta el primer imagen() de cada tamaño. El atlas en disco
+      se reutiliza mientras la ruta, mtime y tamaño de cada imagen coincidan.
+    - Debe usarse DESPUÉS de crear el Tk() principal.
+    """
+
+    def __init__(self, rutas, directorio=DIRECTORIO_CACHE):
+        self.rutas = [os.path.abspath(ruta) for ruta in rutas]
+        self.directorio = directorio
+        self._atlas = {}     # tamano -> (PhotoImage del atlas, {ruta: [x, y]})
+        self._imagenes = {}  # (ruta, tamano) -> PhotoImage recortada
+
+    def _archivos(self, tamano):
+        base = os.path.join(self.directorio, f"atlas_{tamano}")
+        return base + ".png", base + ".json"
+
+    def _cargar_atlas(self, tamano):
+        """Atlas del tamaño pedido: desde la caché si sigue vigente, si no se construye"""
+        if tamano in self._atlas:
+            return self._atlas[tamano]
+
+        claves = {}
+        for ruta in self.rutas:
+            clave = clave_archivo(ruta)
+            if clave is not None:
+                claves[ruta] = clave
+        archivo_png, archivo_json = self._archivos(tamano)
+        atlas = None
+        try:
+            with open(archivo_json, encoding="utf-8") as f:
+                indice = json.load(f)
+            if (indice.get("version") == VERSION_ATLAS and indice.get("tamano") == tamano and
+                    indice.get("claves") == claves):
+                atlas = (tk.PhotoImage(file=archivo_png), indice["posiciones"])
+        except (OSError, ValueError, tk.TclError):
+            atlas = None
+
+        if atlas is None and PIL_AVAILABLE and claves:
+            from PIL import ImageTk
+
+            imagen, posiciones = construir_atlas(list(claves), tamano)
+            atlas = (ImageTk.PhotoImage(imagen), posiciones)
+            self._guardar(tamano, imagen, {"version": VERSION_ATLAS, "tamano": tamano,
+                                           "claves": claves, "posiciones": posiciones})
+
+        self._atlas[tamano] = atlas
+        return atlas
+
+    def _guardar(self, tamano, imagen, indice):
+        archivo_png, archivo_json = self._archivos(tamano)
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            # Escribir aparte y reemplazar: otro arranque nunca ve un atlas a medias
+            imagen.save(archivo_png + ".tmp", format="PNG")
+            os.replace(archivo_png + ".tmp", archivo_png)
+            with open(archivo_json + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(indice, f)
+            os.replace(archivo_json + ".tmp", archivo_json)
+        except OSError as e:
+            print(f"[Atlas] No se pudo guardar la caché: {e}")
+
+    def imagen(self, ruta, tamano, etiqueta="Imagen"):
+        """PhotoImage de (tamano x tamano) para ruta; None si no se puede cargar"""
+        ruta = os.path.abspath(ruta)
+        clave = (ruta, tamano)
+        if clave in self._imagenes:
+            return self._imagenes[clave]
+
+        atlas = self._cargar_atlas(tamano) if ruta in self.rutas else None
+        if atlas is not None and ruta in atlas[1]:
+            origen, posiciones = atlas
+            x, y = posiciones[ruta]
+            imagen = tk.PhotoImage(width=tamano, height=tamano)
+            imagen.tk.call(imagen, "copy", origen, "-from", x, y, x + tamano, y + tamano)
+        else:
+            # Sin PIL ni caché (o ruta no registrada): carga directa como antes
+            imagen = cargar_imagen_escalada(ruta, tamano, etiqueta)
+        self._imagenes[clave] = imagen
+        return imagen
+
+    def descartar(self, tamano=None):
+        """Suelta de memoria las imágenes de un tamaño (o de todos)"""
+        for clave in [c for c in self._imagenes if tamano is None or c[1] == tamano]:
+            del self._imagenes[clave]
+        for t in [t for t in self._atlas if tamano is None or t == tamano]:
+            del self._atlas[t]
@@ -0,0 +1,207 @@
+# Escapa del Laberinto - mapas grandes generados por regiones
+# Isaac Orozco y Daniel Araya
+#
+# En un mapa muy grande el jugador solo ve una parte. Este generador divide
+# el mapa en regiones cuadradas y genera cada una recién cuando el jugador
+# se acerca (explorar), así que generar el mapa al empezar cuesta lo mismo
+# sin importar su tamaño. La grilla sigue siendo una sola GrillaMapa: lo que
+# aún no se generó es muro.
+#
+# La memoria, en cambio, sigue siendo proporcional al mapa y no a la vista:
+# GrillaMapa usa 3 bytes por casilla (celdas y dos máscaras de paso),
+# IndiceLibres dos arreglos de 4 bytes por casilla y cada CampoDistancias
+# otro de 4 bytes por casilla. Todos comparten el índice plano
+# i = r * columnas + c (también el enjambre con numpy), y pasar a regiones
+# con índices locales cambiaría todos esos módulos. En 4001x4001 son unos
+# 47 MB al generar y unos 250 MB con una Simulacion, que además tarda
+# ~0.7 s en reservar esos arreglos.
+#
+# Cada región tiene su propio RNG derivado de (semilla, región), así que el
+# mapa final no depende del orden en que el jugador recorre las regiones.
+import random
+
+from laberinto.constantes import FILAS, COLUMNAS, Punto
+from laberinto.casillas import Camino, Muro, Liana, Tunel, Salida, GrillaMapa
+from laberinto.generador import GeneradorMapa
+
+# Lado de cada región en casillas (par, para que los bordes caigan en filas
+# y columnas de muro del laberinto)
+LADO_REGION = 32
+# Se generan las regiones a menos de estas casillas del jugador
+MARGEN_EXPLORACION = 24
+# Cantidades de elementos especiales de GeneradorMapa, pensadas para 12x18
+AREA_BASE = FILAS * COLUMNAS
+
+
+class GeneradorMapaPorRegiones(GeneradorMapa):
+    """GeneradorMapa que genera el mapa por regiones bajo demanda.
+
+    - generar_mapa_aleatorio() solo elige salidas y jugador y genera las
+      regiones cercanas al jugador.
+    - explorar(posicion) genera las regiones que quedaron cerca; la
+      simulación la llama después de cada movimiento del jugador.
+    - Cada región es un laberinto DFS completo sobre sus celdas impares que
+      abre una puerta hacia la región de la izquierda y otra hacia la de
+      arriba. Así todo el mapa queda conectado sin validar con BFS.
+    - completar() genera lo que falte (necesario antes de grabar una partida).
+    """
+
+    def __init__(self, filas=FILAS, columnas=COLUMNAS, semilla=None, lado_region=LADO_REGION,
+                 margen=MARGEN_EXPLORACION):
+        super().__init__(filas, columnas, semilla)
+        self.lado_region = lado_region
+        self.margen = margen
+        self.regiones_por_fila = (columnas + lado_region - 1) // lado_region
+        self.regiones_por_columna = (filas + lado_region - 1) // lado_region
+        self.generadas = bytearray(self.regiones_por_fila * self.regiones_por_columna)
+
+    def generar_mapa_aleatorio(self):
+        """Prepara un mapa de muros y genera solo las regiones cerca del jugador"""
+        self.rng.seed(self.semilla)
+        self.mapa = GrillaMapa(self.filas, self.columnas)
+        self.generadas = bytearray(len(self.generadas))
+
+        # Salidas y jugador sobre celdas impares: siempre serán camino
+        self._colocar_salidas()
+        self._colocar_jugador()
+        self.explorar(self.posicion_jugador)
+        return self.mapa
+
+    def verificar_camino_valido(self):
+        """El mapa queda conectado por construcción (ver _generar_region)"""
+        return bool(self.posicion_jugador and self.salidas)
+
+    # ----------------- REGIONES -----------------
+    def explorar(self, posicion):
+        """Genera las regiones a menos de self.margen casillas de posicion"""
+        lado = self.lado_region
+        r0 = max(posicion.r - self.margen, 0) // lado
+        r1 = min(posicion.r + self.margen, self.filas - 1) // lado
+        c0 = max(posicion.c - self.margen, 0) // lado
+        c1 = min(posicion.c + self.margen, self.columnas - 1) // lado
+        for rr in range(r0, r1 + 1):
+            for rc in range(c0, c1 + 1):
+                if not self.generadas[rr * self.regiones_por_fila + rc]:
+                    self._generar_region(rr, rc)
+
+    def completar(self):
+        """Genera todas las regiones que falten"""
+        for rr in range(self.regiones_por_columna):
+            for rc in range(self.regiones_por_fila):
+                if not self.generadas[rr * self.regiones_por_fila + rc]:
+                    self._generar_region(rr, rc)
+
+    def completo(self):
+        return all(self.generadas)
+
+    def regiones_generadas(self):
+        return sum(self.generadas)
+
+    def _es_nodo(self, r, c):
+        """Celdas impares sin tocar el borde: los nodos del laberinto DFS"""
+        return r % 2 == 1 and c % 2 == 1 and 0 < r < self.filas - 1 and 0 < c < self.columnas - 1
+
+    def _generar_region(self, rr, rc):
+        self.generadas[rr * self.regiones_por_fila + rc] = 1
+        lado = self.lado_region
+        r0, c0 = rr * lado, rc * lado
+        alto = min(lado, self.filas - r0)
+        ancho = min(lado, self.columnas - c0)
+        rng = random.Random(f"{self.semilla}:{rr}:{rc}")
+        celdas = bytearray([Muro.codigo]) * (alto * ancho)
+
+        # ----- LABERINTO DFS DENTRO DE LA REGIÓN -----
+        nodos = [(r, c) for r in range(r0 + 1, r0 + alto, 2) for c in range(c0 + 1, c0 + ancho, 2)
+                 if self._es_nodo(r, c)]
+        if nodos:
+            pendientes = set(nodos)
+            inicio = nodos[int(rng.random() * len(nodos))]
+            pendientes.discard(inicio)
+            celdas[(inicio[0] - r0) * ancho + inicio[1] - c0] = Camino.codigo
+            stack = [inicio]
+            while stack:
+                r, c = stack[-1]
+                vecinos = [(r + dr, c + dc) for dr, dc in ((0, 2), (2, 0), (0, -2), (-2, 0))
+                           if (r + dr, c + dc) in pendientes]
+                if vecinos:
+                    sr, sc = vecinos[int(rng.random() * len(vecinos))]
+                    celdas[((r + sr) // 2 - r0) * ancho + (c + sc) // 2 - c0] = Camino.codigo
+                    celdas[(sr - r0) * ancho + sc - c0] = Camino.codigo
+                    pendientes.discard((sr, sc))
+                    stack.append((sr, sc))
+                else:
+                    stack.pop()
+
+            # ----- PUERTAS HACIA LA IZQUIERDA Y HACIA ARRIBA -----
+            # La región vecina ya tiene (o tendrá) camino en todos sus nodos
+            if c0 > 0:
+                filas_puerta = [r for r in range(r0 + 1, r0 + alto, 2) if self._es_nodo(r, c0 + 1)]
+                if filas_puerta:
+                    celdas[(rng.choice(filas_puerta) - r0) * ancho] = Camino.codigo
+            if r0 > 0:
+                columnas_puerta = [c for c in range(c0 + 1, c0 + ancho, 2) if self._es_nodo(r0 + 1, c)]
+                if columnas_puerta:
+                    celdas[rng.choice(columnas_puerta) - c0] = Camino.codigo
+
+            self._decorar_region(rng, celdas, alto, ancho)
+
+        self.mapa.poner_bloque(r0, c0, ancho, celdas)
+        for salida in self.salidas:
+            if r0 <= salida.r < r0 + alto and c0 <= salida.c < c0 + ancho:
+                self.mapa.poner(salida.r, salida.c, Salida.codigo)
+
+    def _decorar_region(self, rng, celdas, alto, ancho):
+        """Caminos extra, lianas y túneles como en GeneradorMapa, escalados al área"""
+        escala = max(1, alto * ancho // AREA_BASE)
+        camino = Camino.codigo
+
+        def camino_adyacente(r, c):
+            return any(0 <= r + dr < alto and 0 <= c + dc < ancho and
+                       celdas[(r + dr) * ancho + c + dc] == camino
+                       for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)))
+
+        def camino_cercano(r, c):
+            return any(celdas[nr * ancho + nc] == camino
+                       for nr in range(max(r - 2, 0), min(r + 3, alto))
+                       for nc in range(max(c - 2, 0), min(c + 3, ancho)))
+
+        # Caminos extra: muros con algún camino adyacente
+        for _ in range(rng.randint(5, 15) * escala):
+            r, c = rng.randrange(alto), rng.randrange(ancho)
+            if celdas[r * ancho + c] == Muro.codigo and camino_adyacente(r, c):
+                celdas[r * ancho + c] = camino
+
+        # Lianas: muros con algún camino en su vecindario 5x5
+        for _ in range(rng.randint(8, 15) * escala):
+            r, c = rng.randrange(alto), rng.randrange(ancho)
+            if celdas[r * ancho + c] == Muro.codigo and camino_cercano(r, c):
+                celdas[r * ancho + c] = Liana.codigo
+
+        # Túneles: muros al azar
+        for _ in range(rng.randint(5, 10) * escala):
+            r, c = rng.randrange(alto), rng.randrange(ancho)
+            if celdas[r * ancho + c] == Muro.codigo:
+                celdas[r * ancho + c] = Tunel.codigo
+
+    # ----------------- SALIDAS Y JUGADOR -----------------
+    def _colocar_salidas(self):
+        """Salidas en el borde, junto a un nodo del laberinto (sin generar nada)"""
+        self.salidas = []
+        posiciones = ([(0, c) for c in range(1, self.columnas - 1, 2)] +
+                      [(r, 0) for r in range(1, self.filas - 1, 2)])
+        if (self.filas - 2) % 2 == 1:
+            posiciones += [(self.filas - 1, c) for c in range(1, self.columnas - 1, 2)]
+        if (self.columnas - 2) % 2 == 1:
+            posiciones += [(r, self.columnas - 1) for r in range(1, self.filas - 1, 2)]
+        cantidad = min(self.rng.randint(2, 4), len(posiciones))
+        self.salidas = [Punto(r, c) for r, c in self.rng.sample(posiciones, cantidad)]
+
+    def _colocar_jugador(self):
+        """Un nodo al azar a 3 casillas o más de toda salida"""
+        for _ in range(100):
+            r = self.rng.randrange(1, self.filas - 1, 2)
+            c = self.rng.randrange(1, self.columnas - 1, 2)
+            if all(abs(r - s.r) + abs(c - s.c) >= 3 for s in self.salidas):
+                self.posicion_jugador = Punto(r, c)
+                return
+        self.posicion_jugador = Punto(1, 1)
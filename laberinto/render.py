@@ -0,0 +1,238 @@
+# Escapa del Laberinto - dibujo del mapa en el canvas
+# Isaac Orozco y Daniel Araya
+#
+# No importa tkinter: recibe el canvas ya creado (o cualquier objeto con la
+# misma interfaz, como el canvas falso de los benchmarks).
+from laberinto.casillas import Muro, Liana
+
+
+# ----------------- RENDERIZADOR -----------------
+class RenderizadorMapa:
+    """Dibuja en modo retenido la parte visible del mapa (una cámara que sigue al jugador).
+
+    - filas_vista x columnas_vista es el tamaño de la vista en casillas
+      (por defecto todo el mapa). Solo existen items de canvas para esas
+      casillas, así que el costo no depende del tamaño del mapa.
+    - La celda (r, c) siempre usa el espacio (r % filas_vista, c % columnas_vista)
+      del conjunto de items. Al desplazarse la cámara todos los items se
+      mueven con un solo canvas.move y solo se reconfiguran los de la franja
+      de celdas que entra a la vista.
+    - Jugador y enemigos se mueven con canvas.coords en vez de recrearse.
+    - Solo se repintan las celdas marcadas con marcar_sucia(); si cambió
+      el mapa en bloque (version_paso) se revisa toda la vista.
+    """
+
+    def __init__(self, canvas, tamano, colores, sprites_jugador, filas_vista=None,
+                 columnas_vista=None):
+        self.canvas = canvas
+        self.tamano = tamano
+        self.colores = colores
+        self.sprites_jugador = sprites_jugador  # mantiene las referencias (evita GC)
+        self.filas_vista_max = filas_vista
+        self.columnas_vista_max = columnas_vista
+        self.items_creados = 0  # acumulado, para el perfilador
+        self.invalidar()
+
+    def invalidar(self):
+        """Olvida lo dibujado (por ejemplo después de canvas.delete("all"))"""
+        self.mapa_dibujado = None
+        self.version_dibujada = None
+        self.filas_vista = self.columnas_vista = 0
+        self.camara = None                 # (fila, columna) de la esquina superior izquierda
+        self.items_espacio = []            # [rectángulo, imagen, texto] por espacio
+        self.celda_espacio = []            # índice de la celda que muestra cada espacio (-1: ninguna)
+        self.codigo_espacio = bytearray()  # código de casilla con que se pintó cada espacio
+        self.celdas_sucias = set()
+        self.item_jugador = None
+        self.direccion_jugador = None
+        self.posicion_jugador = None
+        self.items_enemigos = []  # [item_id, posicion, visible] por enemigo
+
+    def marcar_sucia(self, posicion):
+        """Pide repintar la celda en el próximo dibujo"""
+        self.celdas_sucias.add(posicion)
+
+    def dibujar(self, generador, jugador, enemigos):
+        mapa = generador.mapa
+        if mapa is not self.mapa_dibujado:
+            self._preparar(mapa)
+
+        camara_anterior = self.camara
+        self.camara = self._calcular_camara(mapa, jugador)
+        camara_movida = self.camara != camara_anterior
+        if camara_anterior is not None and camara_movida:
+            # Desplazar todo lo ya dibujado; luego solo falta la franja nueva
+            dr = self.camara[0] - camara_anterior[0]
+            dc = self.camara[1] - camara_anterior[1]
+            self.canvas.move("casilla", -dc * self.tamano, -dr * self.tamano)
+        if camara_anterior is None or mapa.version_paso != self.version_dibujada:
+            self._pintar_vista(mapa, todas=True)
+        else:
+            if camara_movida:
+                self._pintar_vista(mapa, todas=False)
+            for posicion in self.celdas_sucias:
+                if self._visible(posicion):
+                    self._pintar_celda(mapa, posicion.r, posicion.c)
+        self.celdas_sucias.clear()
+        self.version_dibujada = mapa.version_paso
+
+        if jugador:
+            self._actualizar_jugador(jugador, camara_movida)
+        self._actualizar_enemigos(enemigos, camara_movida)
+
+    # ----------------- CÁMARA -----------------
+    def _preparar(self, mapa):
+        """Ajusta el conjunto de items al mapa nuevo (se reutiliza si la vista no cambia)"""
+        filas = min(self.filas_vista_max or mapa.filas, mapa.filas)
+        columnas = min(self.columnas_vista_max or mapa.columnas, mapa.columnas)
+        if (filas, columnas) != (self.filas_vista, self.columnas_vista):
+            self.canvas.delete("all")
+            self.invalidar()
+            self.filas_vista, self.columnas_vista = filas, columnas
+            self._crear_espacios()
+        self.mapa_dibujado = mapa
+        self.camara = None
+        self.celda_espacio = [-1] * len(self.items_espacio)
+
+    def _crear_espacios(self):
+        tam = self.tamano
+        for s in range(self.filas_vista * self.columnas_vista):
+            y, x = divmod(s, self.columnas_vista)
+            x *= tam
+            y *= tam
+            self.items_espacio.append([
+                self.canvas.create_rectangle(x, y, x + tam, y + tam, outline="gray",
+                                             fill="white", tags="casilla"),
+                self.canvas.create_image(x, y, anchor="nw", state="hidden", tags="casilla"),
+                self.canvas.create_text(x + tam // 2, y + tam // 2, text="", state="hidden",
+                                        font=("Arial", 8, "bold"), fill="black", tags="casilla"),
+            ])
+        self.items_creados += 3 * len(self.items_espacio)
+        self.codigo_espacio = bytearray([255]) * len(self.items_espacio)
+        self.celda_espacio = [-1] * len(self.items_espacio)
+
+    def _calcular_camara(self, mapa, jugador):
+        """Esquina de la vista centrada en el jugador, sin salirse del mapa"""
+        if jugador is None:
+            return (0, 0)
+        r0 = min(max(jugador.posicion.r - self.filas_vista // 2, 0), mapa.filas - self.filas_vista)
+        c0 = min(max(jugador.posicion.c - self.columnas_vista // 2, 0),
+                 mapa.columnas - self.columnas_vista)
+        return (r0, c0)
+
+    def _visible(self, posicion):
+        r0, c0 = self.camara
+        return (r0 <= posicion.r < r0 + self.filas_vista and
+                c0 <= posicion.c < c0 + self.columnas_vista)
+
+    # ----------------- CASILLAS -----------------
+    def _pintar_vista(self, mapa, todas):
+        """Pinta las celdas visibles cuyo espacio mostraba otra celda (o todas)"""
+        r0, c0 = self.camara
+        columnas = mapa.columnas
+        for r in range(r0, r0 + self.filas_vista):
+            base = (r % self.filas_vista) * self.columnas_vista
+            for c in range(c0, c0 + self.columnas_vista):
+                if todas or self.celda_espacio[base + c % self.columnas_vista] != r * columnas + c:
+                    self._pintar_celda(mapa, r, c)
+
+    def _pintar_celda(self, mapa, r, c):
+        """Lleva el espacio de la celda a su lugar en pantalla y lo pinta si cambió el tipo"""
+        s = (r % self.filas_vista) * self.columnas_vista + c % self.columnas_vista
+        i = r * mapa.columnas + c
+        rect, imagen, texto = self.items_espacio[s]
+        tam = self.tamano
+
+        if self.celda_espacio[s] != i:
+            x = (c - self.camara[1]) * tam
+            y = (r - self.camara[0]) * tam
+            self.canvas.coords(rect, x, y, x + tam, y + tam)
+            self.canvas.coords(imagen, x, y)
+            self.canvas.coords(texto, x + tam // 2, y + tam // 2)
+            self.celda_espacio[s] = i
+
+        codigo = mapa.celdas[i]
+        if self.codigo_espacio[s] == codigo:
+            return
+        self.codigo_espacio[s] = codigo
+        casilla = mapa.casilla_en(i)
+
+        # ----- MURO Y LIANA (con imagen si existe) -----
+        if isinstance(casilla, (Muro, Liana)) and casilla.imagen:
+            self.canvas.itemconfig(rect, state="hidden")
+            self.canvas.itemconfig(imagen, image=casilla.imagen, state="normal")
+            self.canvas.itemconfig(texto, state="hidden")
+            return
+
+        # ----- CAMINO Y DEMÁS -----
+        color = (self.colores[casilla.simbolo] if isinstance(casilla, (Muro, Liana))
+                 else self.colores.get(casilla.simbolo, "white"))
+        self.canvas.itemconfig(rect, fill=color, state="normal")
+        self.canvas.itemconfig(imagen, state="hidden")
+        if casilla.simbolo != ".":
+            self.canvas.itemconfig(texto, text=casilla.simbolo, state="normal")
+        else:
+            self.canvas.itemconfig(texto, state="hidden")
+
+    # ----------------- ENTIDADES -----------------
+    def _coords_ovalo(self, posicion):
+        x = (posicion.c - self.camara[1]) * self.tamano + 2
+        y = (posicion.r - self.camara[0]) * self.tamano + 2
+        return x, y, x + self.tamano - 4, y + self.tamano - 4
+
+    def _crear_ovalo(self, posicion, color):
+        self.items_creados += 1
+        return self.canvas.create_oval(*self._coords_ovalo(posicion), fill=color,
+                                       outline="black", width=2, tags="entidad")
+
+    def _actualizar_jugador(self, jugador, camara_movida):
+        sprite = self.sprites_jugador.get(jugador.direccion)
+        if self.item_jugador is None:
+            if sprite:
+                self.item_jugador = self.canvas.create_image(0, 0, image=sprite, tags="entidad")
+            else:
+                self.item_jugador = self._crear_ovalo(jugador.posicion, self.colores["J"])
+            self.items_creados += 1 if sprite else 0
+            self.direccion_jugador = jugador.direccion
+            self.posicion_jugador = None
+        elif sprite and jugador.direccion != self.direccion_jugador:
+            self.canvas.itemconfig(self.item_jugador, image=sprite)
+            self.direccion_jugador = jugador.direccion
+
+        if jugador.posicion != self.posicion_jugador or camara_movida:
+            if self.canvas.type(self.item_jugador) == "image":
+                self.canvas.coords(self.item_jugador,
+                                   (jugador.posicion.c - self.camara[1]) * self.tamano + self.tamano // 2,
+                                   (jugador.posicion.r - self.camara[0]) * self.tamano + self.tamano // 2)
+            else:
+                self.canvas.coords(self.item_jugador, *self._coords_ovalo(jugador.posicion))
+            self.posicion_jugador = jugador.posicion
+
+    def _actualizar_enemigos(self, enemigos, camara_movida):
+        # Quitar items sobrantes (por ejemplo al reiniciar con menos enemigos)
+        while len(self.items_enemigos) > len(enemigos):
+            self.canvas.delete(self.items_enemigos.pop()[0])
+
+        for i, enemigo in enumerate(enemigos):
+            visible = enemigo.vivo and self._visible(enemigo.posicion)
+            if i == len(self.items_enemigos):
+                if not visible:
+                    self.items_enemigos.append([None, None, False])
+                    continue
+                item = self._crear_ovalo(enemigo.posicion, self.colores["E"])
+                self.items_enemigos.append([item, enemigo.posicion, True])
+                continue
+
+            estado = self.items_enemigos[i]
+            if estado[0] is None:
+                if visible:
+                    estado[:] = [self._crear_ovalo(enemigo.posicion, self.colores["E"]),
+                                 enemigo.posicion, True]
+                continue
+
+            if visible != estado[2]:
+                self.canvas.itemconfig(estado[0], state="normal" if visible else "hidden")
+                estado[2] = visible
+            if visible and (enemigo.posicion != estado[1] or camara_movida):
+                self.canvas.coords(estado[0], *self._coords_ovalo(enemigo.posicion))
+                estado[1] = enemigo.posicion
@@ -0,0 +1,365 @@
+# Escapa del Laberinto - motor de simulación sin interfaz
+# Isaac Orozco y Daniel Araya
+#
+# Contiene todas las reglas del juego (movimiento de enemigos, colisiones,
+# trampas, salidas y puntaje). No importa tkinter: la interfaz solo dibuja
+# el estado de una Simulacion y le pasa las teclas como acciones.
+import random
+
+from laberinto.constantes import (NUM_ENEMIGOS, DIFICULTAD_FACIL, DIFICULTAD_DIFICIL,
+                                  DURACION_TICK)
+from laberinto.casillas import Camino, Salida, Trampa
+from laberinto.generador import generar_mapa_juego, obtener_posiciones_enemigos, filtro_aparicion
+from laberinto.pathfinding import CampoDistancias
+from laberinto.ocupacion import MapaOcupacion
+from laberinto.entidades import Jugador, Enemigo
+from laberinto.perfilador import Perfilador
+
+# Direcciones de movimiento del jugador: nombre -> (dr, dc)
+DIRECCIONES = {
+    "up": (-1, 0),
+    "down": (1, 0),
+    "left": (0, -1),
+    "right": (0, 1),
+}
+
+
+class Simulacion:
+    """Una partida completa que avanza con step(acciones).
+
+    - reloj: función sin argumentos que devuelve segundos. Por defecto es un
+      reloj simulado (tick * DURACION_TICK), así que miles de ticks corren en
+      milisegundos. La interfaz pasa time.time para jugar en tiempo real.
+    - rng: instancia de random.Random usada para reapariciones y enemigos nuevos.
+    - semilla: si no se pasan generador ni rng, ambos se derivan de ella y la
+      partida completa es reproducible. Si no se pasa (ni rng) se elige una
+      al azar y queda en self.semilla, para poder grabar la partida.
+    - Acciones: ("mover", direccion, corriendo) y ("trampa",).
+    - Cada enemigo tiene su propio temporizador (proximo_movimiento, en
+      ticks): se mueve cada frames_enemigo ticks contados desde que apareció.
+      La agenda tick -> enemigos evita revisar a todos en cada tick.
+    - ocupacion (celda -> enemigos vivos) se actualiza en cada movimiento:
+      las colisiones con el jugador son una consulta y las trampas y salidas
+      solo se revisan para los enemigos que se movieron (self.movidos).
+    - Los enemigos muertos quedan en self.reserva y generar_nuevo_enemigo
+      los reutiliza, así la lista no crece durante la partida.
+    - En modo cazador los enemigos bajan por generador.distancias_salidas(),
+      el campo de distancias reales a las salidas (uno por mapa). Ese mismo
+      campo decide dónde pueden aparecer: con camino a una salida y no
+      pegados a ella (ver generador.filtro_aparicion).
+    - perfilador: Perfilador donde se miden las fases de cada tick
+      (enemigos, reaparicion, colisiones, victoria); apagado por defecto.
+    """
+
+    def __init__(self, modo="escapa", dificultad="facil", generador=None,
+                 reloj=None, rng=None, num_enemigos=NUM_ENEMIGOS, semilla=None,
+                 perfilador=None):
+        self.modo = modo
+        self.dificultad = dificultad
+        self.num_enemigos = num_enemigos
+        if rng is None and semilla is None:
+            semilla = random.randrange(2 ** 32)
+        self.semilla = semilla
+        self.rng = rng if rng is not None else random.Random(semilla)
+        self.reloj = reloj if reloj is not None else self._reloj_simulado
+        self.tick = 0
+        self.perfilador = perfilador if perfilador is not None else Perfilador()
+
+        if dificultad == "facil":
+            self.frames_enemigo = DIFICULTAD_FACIL[modo]
+        else:  # dificil
+            self.frames_enemigo = DIFICULTAD_DIFICIL[modo]
+
+        if generador is None:
+            generador = generar_mapa_juego(semilla)
+        self.generador = generador
+        self.jugador = Jugador(self.generador.posicion_jugador)
+        self.generador.explorar(self.jugador.posicion)
+        self.campo_jugador = CampoDistancias(self.generador.mapa)
+        posiciones = obtener_posiciones_enemigos(self.generador.mapa, num_enemigos,
+                                                 self.jugador.posicion, self.rng,
+                                                 self.generador.distancias_salidas())
+        self.enemigos = []
+        self.agenda = {}  # tick -> enemigos que se mueven en ese tick
+        self.ocupacion = MapaOcupacion()
+        self.movidos = []   # enemigos que cambiaron de celda desde la última revisión
+        self.reserva = {}   # índice -> None de los enemigos muertos (en orden de muerte)
+        self.vivos = 0
+        for pos in posiciones:
+            self.agregar_enemigo(Enemigo(pos))
+
+        self.tiempo_inicio = self.reloj()
+        self.terminado = False
+        self.victoria = False
+        self.mensaje = ""
+        # Celdas cuyo tipo cambió (trampas puestas o quitadas) desde la última consulta
+        self.celdas_cambiadas = []
+
+    def _reloj_simulado(self):
+        return self.tick * DURACION_TICK
+
+    @property
+    def mapa(self):
+        return self.generador.mapa
+
+    def tiempo_transcurrido(self):
+        return self.reloj() - self.tiempo_inicio
+
+    def tomar_celdas_cambiadas(self):
+        """Devuelve y vacía la lista de celdas modificadas (para repintarlas)"""
+        celdas, self.celdas_cambiadas = self.celdas_cambiadas, []
+        return celdas
+
+    # ----------------- ACCIONES DEL JUGADOR -----------------
+    def aplicar(self, accion):
+        """Aplica una acción del jugador de inmediato; devuelve True si cambió algo"""
+        if self.terminado:
+            return False
+
+        tipo = accion[0]
+        if tipo == "mover":
+            direccion = accion[1]
+            corriendo = accion[2] if len(accion) > 2 else False
+            dr, dc = DIRECCIONES[direccion]
+            self.jugador.direccion = direccion
+            if self.jugador.mover(self.mapa, self.jugador.posicion.r + dr,
+                                  self.jugador.posicion.c + dc, corriendo):
+                self.generador.explorar(self.jugador.posicion)
+                self.verificar_colisiones()
+                self.verificar_victoria()
+                return True
+            return False
+
+        if tipo == "trampa" and self.modo == "escapa":
+            if self.jugador.colocar_trampa_en_mapa(self.mapa, self.reloj()):
+                self.celdas_cambiadas.append(self.jugador.posicion)
+                return True
+        return False
+
+    def step(self, acciones=()):
+        """Aplica las acciones del tick y avanza la simulación un tick"""
+        for accion in acciones:
+            self.aplicar(accion)
+        if self.terminado:
+            return
+
+        self.tick += 1
+        self.mover_programados()
+
+        with self.perfilador.fase("colisiones"):
+            self.verificar_colisiones()
+        with self.perfilador.fase("victoria"):
+            self.verificar_victoria()
+        self.jugador.recuperar_energia()
+
+    def ejecutar(self, max_ticks, bot=None):
+        """Corre hasta terminar o hasta max_ticks; bot(sim) devuelve las acciones de cada tick"""
+        while not self.terminado and self.tick < max_ticks:
+            self.step(bot(self) if bot else ())
+        return self.terminado
+
+    # ----------------- ENEMIGOS -----------------
+    def mover_programados(self):
+        """Mueve los enemigos cuyo temporizador vence en este tick (la velocidad
+        depende del modo y la dificultad)"""
+        listos = self.agenda.pop(self.tick, None)
+        if listos:
+            for enemigo in listos:
+                self.programar(enemigo)
+            with self.perfilador.fase("enemigos"):
+                self.mover_enemigos(listos)
+
+    def programar(self, enemigo):
+        """Agenda el próximo movimiento del enemigo dentro de frames_enemigo ticks"""
+        enemigo.proximo_movimiento = self.tick + self.frames_enemigo
+        self.agenda.setdefault(enemigo.proximo_movimiento, []).append(enemigo)
+
+    def agregar_enemigo(self, enemigo):
+        enemigo.indice = len(self.enemigos)
+        self.enemigos.append(enemigo)
+        self.programar(enemigo)
+        self.ocupacion.agregar(enemigo.indice, self._celda(enemigo.posicion))
+        self.movidos.append(enemigo)
+        self.vivos += 1
+
+    def _celda(self, posicion):
+        return posicion.r * self.mapa.columnas + posicion.c
+
+    def matar_enemigo(self, enemigo, ahora):
+        enemigo.morir(ahora)
+        self.ocupacion.quitar(enemigo.indice, self._celda(enemigo.posicion))
+        self.reserva[enemigo.indice] = None
+        self.vivos -= 1
+
+    def revivir_enemigo(self, enemigo, posicion):
+        enemigo.posicion = posicion
+        enemigo.vivo = True
+        self.ocupacion.agregar(enemigo.indice, self._celda(posicion))
+        self.reserva.pop(enemigo.indice, None)
+        self.movidos.append(enemigo)
+        self.vivos += 1
+
+    # ----------------- REGLAS -----------------
+    def mover_enemigos(self, enemigos=None):
+        """Mueve (o hace reaparecer) los enemigos dados; por defecto todos"""
+        ahora = self.reloj()
+        # Un solo BFS desde el jugador para todos los enemigos (solo si se movió o cambió el mapa)
+        self.campo_jugador.actualizar(self.jugador.posicion)
+        # El de las salidas ya está calculado; solo se rehace si cambió el mapa
+        campo_salidas = self.generador.distancias_salidas() if self.modo == "cazador" else None
+        for enemigo in self.enemigos if enemigos is None else enemigos:
+            if enemigo.vivo:
+                anterior = enemigo.posicion
+                if self.modo == "escapa":
+                    enemigo.mover_hacia_objetivo(self.mapa, self.jugador.posicion, huir=False,
+                                                 campo=self.campo_jugador)
+                elif campo_salidas.distancia(enemigo.posicion) >= 0:  # modo cazador
+                    # Un paso por el camino real hacia la salida más cercana, en O(1)
+                    enemigo.seguir_campo(campo_salidas)
+                else:
+                    # Sin camino a ninguna salida: acercarse en línea recta a la más cercana
+                    salida_cercana = self.encontrar_salida_mas_cercana(enemigo.posicion)
+                    if salida_cercana:
+                        enemigo.mover_hacia_objetivo(self.mapa, salida_cercana, huir=False)
+                    else:
+                        # Si no hay salidas, huir del jugador como respaldo
+                        enemigo.mover_hacia_objetivo(self.mapa, self.jugador.posicion, huir=True,
+                                                     campo=self.campo_jugador)
+                if enemigo.posicion != anterior:
+                    self.ocupacion.mover(enemigo.indice, self._celda(anterior),
+                                         self._celda(enemigo.posicion))
+                    self.movidos.append(enemigo)
+            elif enemigo.puede_reaparecer(ahora):
+                with self.perfilador.fase("reaparicion"):
+                    self.reaparecer_enemigo(enemigo)
+
+    def reaparecer_enemigo(self, enemigo):
+        """Reaparece un enemigo en una posición segura"""
+        # Casilla Camino (las trampas no lo son) a 4 o más casillas del jugador
+        posicion = self.punto_aparicion(4)
+        if posicion is not None:
+            self.revivir_enemigo(enemigo, posicion)
+
+    def punto_aparicion(self, distancia_jugador):
+        """Casilla libre a distancia_jugador (Manhattan) o más del jugador y, por
+        camino real, lejos de las salidas; si no hay ninguna, basta con lo primero"""
+        libres = self.mapa.libres()
+        filtro = filtro_aparicion(self.generador.distancias_salidas())
+        posicion = libres.muestrear_punto(self.rng, self.jugador.posicion, distancia_jugador, filtro)
+        if posicion is None:
+            posicion = libres.muestrear_punto(self.rng, self.jugador.posicion, distancia_jugador)
+        return posicion
+
+    def encontrar_salida_mas_cercana(self, posicion_enemigo):
+        """Encuentra la salida más cercana al enemigo en línea recta (Manhattan);
+        solo para los que no tienen camino a ninguna salida"""
+        if not self.generador.salidas:
+            return None
+
+        salida_mas_cercana = None
+        distancia_minima = float('inf')
+
+        for salida in self.generador.salidas:
+            distancia = abs(posicion_enemigo.r - salida.r) + abs(posicion_enemigo.c - salida.c)
+            if distancia < distancia_minima:
+                distancia_minima = distancia
+                salida_mas_cercana = salida
+
+        return salida_mas_cercana
+
+    def verificar_colisiones(self):
+        """Verifica colisiones entre jugador y enemigos/trampas"""
+        ahora = self.reloj()
+        # Enemigos en la casilla del jugador: una consulta al índice de ocupación
+        for indice in sorted(self.ocupacion.en(self._celda(self.jugador.posicion))):
+            enemigo = self.enemigos[indice]
+            if self.modo == "escapa":
+                # En modo escapa, enemigo atrapa al jugador
+                self.terminar(False, "Te atraparon!")
+                return
+            else:
+                # En modo cazador, jugador atrapa al enemigo
+                self.matar_enemigo(enemigo, ahora)
+                # El jugador obtiene puntos por atrapar (el doble de lo que perdería si escapa)
+                puntos_por_atrapar = 200  # Doble de los 100 que perdería si escapa
+                self.jugador.puntaje += puntos_por_atrapar
+                self.generar_nuevo_enemigo()
+
+        # Verificar si algún enemigo cayó en una trampa (solo en modo escapa;
+        # el jugador no activa trampas). Solo pueden caer los que se movieron
+        if self.modo == "escapa":
+            for enemigo in self.movidos:
+                if not enemigo.vivo:
+                    continue
+
+                i = self._celda(enemigo.posicion)
+                if self.mapa.celdas[i] != Trampa.codigo:
+                    continue
+                casilla_enemigo = self.mapa.trampas[i]
+                if casilla_enemigo.activa:
+                    # Activar trampa - el cazador muere inmediatamente
+                    casilla_enemigo.activar_trampa()
+                    self.matar_enemigo(enemigo, ahora)
+
+                    # Pequeño bono de puntos adicional por eliminar cazador
+                    bonus_trampa = 50
+                    self.jugador.puntaje += bonus_trampa
+                    self.jugador.trampas_activas -= 1
+
+                    # La trampa desaparece del mapa
+                    self.mapa.poner(enemigo.posicion.r, enemigo.posicion.c, Camino.codigo)
+                    self.celdas_cambiadas.append(enemigo.posicion)
+
+    def verificar_victoria(self):
+        """Verifica condiciones de victoria y enemigos en salidas"""
+        # Esta es la última revisión del tick: se vacía la lista de movidos
+        movidos, self.movidos = self.movidos, []
+        if self.terminado:
+            return
+
+        # Verificar si algún enemigo que se movió llegó a una salida en modo cazador
+        if self.modo == "cazador":
+            for enemigo in movidos:
+                if enemigo.vivo and self.mapa.celdas[self._celda(enemigo.posicion)] == Salida.codigo:
+                    # Enemigo escapó, el jugador pierde puntos
+                    puntos_perdidos = 100
+                    self.jugador.puntaje = max(0, self.jugador.puntaje - puntos_perdidos)
+                    # Remover este enemigo y generar uno nuevo
+                    self.matar_enemigo(enemigo, self.reloj())
+                    self.generar_nuevo_enemigo()
+
+        # Verificar victoria del jugador (en modo cazador las salidas solo
+        # sirven para que escapen los enemigos)
+        if (self.modo == "escapa" and
+                self.mapa.tipo(self.jugador.posicion.r, self.jugador.posicion.c) == Salida.codigo):
+            tiempo_transcurrido = self.tiempo_transcurrido()
+            # Puntaje basado en tiempo: 2000 puntos base, menos 20 puntos por segundo
+            puntaje_tiempo = max(100, 2000 - int(tiempo_transcurrido * 20))
+            # Bonus por dificultad (número de enemigos)
+            bonus_dificultad = NUM_ENEMIGOS * 100
+            puntaje_total = puntaje_tiempo + bonus_dificultad + self.jugador.puntaje
+            self.jugador.puntaje = puntaje_total
+            self.terminar(True, f"¡Escapaste! Tiempo: {tiempo_transcurrido:.1f}s - Puntaje: {puntaje_total}")
+
+    def generar_nuevo_enemigo(self):
+        """Genera un nuevo enemigo en una posición aleatoria si hay menos del máximo.
+
+        Reutiliza el enemigo muerto más antiguo de la reserva; solo crea uno
+        nuevo si no hay ninguno.
+        """
+        if self.vivos >= self.num_enemigos:
+            return  # Ya tenemos suficientes enemigos
+
+        # No generar muy cerca del jugador (más de 5 casillas)
+        posicion = self.punto_aparicion(6)
+        if posicion is None:
+            return
+        if self.reserva:
+            self.revivir_enemigo(self.enemigos[next(iter(self.reserva))], posicion)
+        else:
+            self.agregar_enemigo(Enemigo(posicion))
+
+    def terminar(self, victoria, mensaje):
+        self.terminado = True
+        self.victoria = victoria
+        self.mensaje = mensaje
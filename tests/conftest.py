@@ -0,0 +1,11 @@
+# Escapa del Laberinto - configuración de pytest
+# Isaac Orozco y Daniel Araya
+#
+# El repositorio no se instala como paquete: las pruebas importan laberinto
+# desde la raíz del proyecto.
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
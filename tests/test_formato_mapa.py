@@ -0,0 +1,117 @@
+# Escapa del Laberinto - pruebas de mapas .lbm y paquetes .lbp
+# Isaac Orozco y Daniel Araya
+import struct
+
+import pytest
+
+from laberinto.__main__ import main as cli
+from laberinto.casillas import Camino, Trampa
+from laberinto.constantes import Punto
+from laberinto.formato_mapa import (PaqueteMapas, cargar_mapa, codificar, decodificar,
+                                    guardar_mapa, guardar_paquete)
+from laberinto.generador import generar_mapa_juego
+
+
+def _mapa(semilla=3, filas=21, columnas=31):
+    return generar_mapa_juego(semilla, filas, columnas, mostrar_progreso=False)
+
+
+def _iguales(a, b):
+    assert (a.filas, a.columnas, a.semilla) == (b.filas, b.columnas, b.semilla)
+    assert a.salidas == b.salidas
+    assert a.posicion_jugador == b.posicion_jugador
+    assert bytes(a.mapa.celdas) == bytes(b.mapa.celdas)
+
+
+# ----------------- IDA Y VUELTA -----------------
+def test_mapa_ida_y_vuelta(tmp_path):
+    generador = _mapa()
+    ruta = guardar_mapa(generador, str(tmp_path / "nivel.lbm"))
+    cargado = cargar_mapa(ruta)
+    _iguales(generador, cargado)
+    assert cargado.verificar_camino_valido()
+
+
+def test_trampas_se_guardan_como_camino():
+    generador = _mapa()
+    i = generador.mapa.celdas.find(Camino.codigo)
+    generador.mapa.poner_casilla(i, Trampa(0.0))
+    cargado = decodificar(codificar(generador))
+    assert cargado.mapa.celdas[i] == Camino.codigo
+
+
+def test_paquete_ida_y_vuelta(tmp_path):
+    generadores = [_mapa(semilla) for semilla in range(4)]
+    ruta = guardar_paquete(generadores, str(tmp_path / "niveles.lbp"))
+    with PaqueteMapas(ruta) as paquete:
+        assert len(paquete) == 4
+        for original, cargado in zip(generadores, paquete):
+            _iguales(original, cargado)
+        _iguales(generadores[2], paquete[2])
+        with pytest.raises(IndexError):
+            paquete[4]
+
+
+# ----------------- ARCHIVOS DAÑADOS -----------------
+def test_mapa_cortado_en_cualquier_byte():
+    datos = codificar(_mapa(filas=11, columnas=13))
+    for largo in range(len(datos)):
+        with pytest.raises(ValueError):
+            decodificar(datos[:largo])
+
+
+def test_posiciones_fuera_del_mapa():
+    generador = _mapa()
+    generador.salidas = [Punto(generador.filas, 1)]
+    with pytest.raises(ValueError, match="fuera del mapa"):
+        decodificar(codificar(generador))
+
+    generador = _mapa()
+    generador.posicion_jugador = Punto(1, generador.columnas)
+    with pytest.raises(ValueError, match="fuera del mapa"):
+        decodificar(codificar(generador))
+
+
+def test_magia_y_version_invalidas():
+    datos = bytearray(codificar(_mapa()))
+    with pytest.raises(ValueError):
+        decodificar(b"XYZ" + bytes(datos[3:]))
+    datos[3] = 99
+    with pytest.raises(ValueError, match="Versión"):
+        decodificar(bytes(datos))
+
+
+def _paquete_cortado(tmp_path, nombre, datos):
+    ruta = tmp_path / nombre
+    ruta.write_bytes(datos)
+    return str(ruta)
+
+
+def test_paquete_cortado(tmp_path):
+    ruta = guardar_paquete([_mapa(1), _mapa(2)], str(tmp_path / "ok.lbp"))
+    datos = open(ruta, "rb").read()
+
+    with pytest.raises(ValueError, match="Paquete incompleto"):
+        PaqueteMapas(_paquete_cortado(tmp_path, "cinco.lbp", datos[:5]))
+    # El encabezado dice 5 niveles pero no está la tabla
+    sin_tabla = struct.pack("<3sBI", b"LBP", 1, 5)
+    with pytest.raises(ValueError, match="Paquete incompleto"):
+        PaqueteMapas(_paquete_cortado(tmp_path, "sin_tabla.lbp", sin_tabla))
+    # Cortado dentro del último nivel: el primero se sigue leyendo
+    with PaqueteMapas(_paquete_cortado(tmp_path, "corto.lbp", datos[:-40])) as paquete:
+        assert paquete[0].verificar_camino_valido()
+        with pytest.raises(ValueError, match="Mapa incompleto"):
+            paquete[1]
+
+
+def test_validate_reporta_paquete_cortado(tmp_path, capsys):
+    ruta = guardar_paquete([_mapa(1), _mapa(2)], str(tmp_path / "ok.lbp"))
+    datos = open(ruta, "rb").read()
+    cortado = _paquete_cortado(tmp_path, "corto.lbp", datos[:-40])
+    cinco = _paquete_cortado(tmp_path, "cinco.lbp", datos[:5])
+
+    assert cli(["validate", ruta, cortado, cinco]) == 1
+    salida = capsys.readouterr().out.splitlines()
+    assert salida[0].startswith("OK")
+    assert salida[1].startswith("ERROR") and "nivel 1: Mapa incompleto" in salida[1]
+    assert salida[2].startswith("ERROR") and "Paquete incompleto" in salida[2]
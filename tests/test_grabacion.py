@@ -0,0 +1,92 @@
+# Escapa del Laberinto - pruebas de grabación y repetición de partidas
+# Isaac Orozco y Daniel Araya
+import random
+
+import pytest
+
+from laberinto.__main__ import main as cli
+from laberinto.generador import generar_mapa_juego
+from laberinto.grabacion import Grabacion, Grabadora, main as verificar_grabaciones, reproducir, verificar
+from laberinto.simulacion import Simulacion, DIRECCIONES
+
+
+def _jugar(modo="escapa", semilla=9, ticks=400):
+    """Simulación con acciones al azar (reproducibles) grabada; devuelve (grabadora, sim)"""
+    generador = generar_mapa_juego(semilla, 21, 31, mostrar_progreso=False)
+    sim = Simulacion(modo, "dificil", generador=generador, semilla=semilla, num_enemigos=4)
+    grabadora = Grabadora(sim)
+    rng = random.Random(semilla)
+    for _ in range(ticks):
+        if rng.random() < 0.6:
+            grabadora.aplicar(("mover", rng.choice(list(DIRECCIONES)), rng.random() < 0.2))
+        if rng.random() < 0.05:
+            grabadora.aplicar(("trampa",))
+        sim.step()
+        if sim.terminado:
+            break
+    return grabadora, sim
+
+
+# ----------------- REPETICIÓN -----------------
+# Semillas con partidas que suman puntos: el puntaje repetido no es un 0 trivial
+@pytest.mark.parametrize("modo, semilla", [("escapa", 1), ("cazador", 2)])
+def test_repetir_da_el_mismo_resultado(tmp_path, modo, semilla):
+    grabadora, sim = _jugar(modo, semilla)
+    ruta = grabadora.guardar(str(tmp_path), "partida.lbr")
+    coincide, grabacion, repetida = verificar(ruta)
+    assert coincide
+    assert sim.jugador.puntaje > 0
+    assert grabacion.puntaje == sim.jugador.puntaje == repetida.jugador.puntaje
+    assert repetida.tick == sim.tick
+    assert repetida.jugador.posicion == sim.jugador.posicion
+
+
+def test_grabacion_ida_y_vuelta():
+    grabadora, sim = _jugar()
+    grabacion = Grabacion(grabadora.cerrar())
+    assert (grabacion.modo, grabacion.dificultad, grabacion.semilla) == ("escapa", "dificil", sim.semilla)
+    assert bytes(grabacion.celdas) == bytes(grabacion.generador().mapa.celdas)
+    assert grabacion.tick_final == sim.tick
+    assert grabacion.eventos  # la partida tuvo acciones
+    assert all(tick <= grabacion.tick_final for tick, _ in grabacion.eventos)
+    assert reproducir(grabacion).jugador.puntaje == grabacion.puntaje
+
+
+# ----------------- ARCHIVOS DAÑADOS -----------------
+def test_grabacion_cortada_en_cualquier_byte():
+    datos = _jugar(ticks=150)[0].cerrar()
+    for largo in range(len(datos)):
+        with pytest.raises(ValueError):
+            Grabacion(datos[:largo])
+
+
+def test_grabacion_dañada_solo_da_value_error():
+    datos = _jugar(ticks=150)[0].cerrar()
+    for i in range(len(datos)):
+        for valor in (0x00, 0x07, 0x09, 0x80, 0xFF):
+            dañados = bytearray(datos)
+            dañados[i] = valor
+            try:
+                Grabacion(bytes(dañados))
+            except ValueError:
+                pass
+
+
+def test_verificar_sigue_tras_un_archivo_dañado(tmp_path, capsys):
+    grabadora, _ = _jugar(ticks=150)
+    ruta = grabadora.guardar(str(tmp_path), "ok.lbr")
+    datos = open(ruta, "rb").read()
+    cortadas = []
+    for largo in (60, len(datos) - 2):  # dentro del bloque zlib y de los eventos
+        cortada = tmp_path / f"corta_{largo}.lbr"
+        cortada.write_bytes(datos[:largo])
+        cortadas.append(str(cortada))
+
+    assert verificar_grabaciones(cortadas + [ruta]) == 1
+    salida = capsys.readouterr().out.splitlines()
+    assert [linea.split()[0] for linea in salida] == ["ERROR", "ERROR", "OK"]
+
+    assert cli(["validate"] + cortadas + [ruta]) == 1
+    salida = capsys.readouterr().out.splitlines()
+    assert [linea.split()[0] for linea in salida] == ["ERROR", "ERROR", "OK"]
+    assert "Grabación incompleta" in salida[0]
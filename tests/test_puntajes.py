@@ -0,0 +1,166 @@
+# Escapa del Laberinto - pruebas del log de puntajes
+# Isaac Orozco y Daniel Araya
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import laberinto.puntajes as puntajes
+from laberinto.puntajes import SistemaPuntajes
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sistema(ruta, **opciones):
+    opciones.setdefault("asincrono", False)
+    return SistemaPuntajes(str(ruta), archivos_anteriores={}, **opciones)
+
+
+def _linea(nombre, puntaje, t, modo="escapa"):
+    return json.dumps({"nombre": nombre, "puntaje": puntaje, "fecha": "x", "t": t, "modo": modo})
+
+
+def _procesos(codigo, cantidad, directorio):
+    """Corre `cantidad` procesos de Python a la vez con el código dado (recibe argv[1] = k)"""
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    hijos = [subprocess.Popen([sys.executable, "-c", textwrap.dedent(codigo), str(k)],
+                              cwd=directorio, env=entorno)
+             for k in range(cantidad)]
+    assert all(hijo.wait(timeout=120) == 0 for hijo in hijos)
+
+
+# ----------------- CONSULTAS -----------------
+def test_top_mejores_y_fechas(tmp_path):
+    sistema = _sistema(tmp_path / "p.log", k=3)
+    for nombre, puntaje in [("ana", 10), ("luis", 30), ("ana", 50), ("eva", 30), ("luis", 5)]:
+        sistema.agregar_puntaje(nombre, puntaje, "escapa")
+    sistema.agregar_puntaje("zoe", 99, "cazador")
+
+    top = sistema.obtener_top("escapa")
+    # A igual puntaje queda primero el más antiguo
+    assert [(r["nombre"], r["puntaje"]) for r in top] == [("ana", 50), ("luis", 30), ("eva", 30)]
+    assert len(sistema.obtener_top("escapa", 10)) == 5
+    assert sistema.mejor_de("luis", "escapa")["puntaje"] == 30
+    assert [r["nombre"] for r in sistema.obtener_top("cazador")] == ["zoe"]
+    assert len(sistema.entre_fechas("escapa")) == 5
+
+
+def test_persistencia_y_lectura_incremental(tmp_path):
+    ruta = tmp_path / "p.log"
+    primero = _sistema(ruta)
+    primero.agregar_puntaje("ana", 10, "escapa")
+    segundo = _sistema(ruta)
+    segundo.agregar_puntaje("luis", 20, "escapa")
+    # El primero lee lo que agregó el segundo sin volver a leer todo
+    assert [r["nombre"] for r in primero.obtener_top("escapa")] == ["luis", "ana"]
+
+
+def test_log_con_fin_de_linea_windows(tmp_path):
+    ruta = tmp_path / "p.log"
+    ruta.write_bytes(("\r\n".join(_linea(f"j{i}", i, i) for i in range(5)) + "\r\n").encode())
+    sistema = _sistema(ruta)
+    assert len(sistema.entre_fechas("escapa")) == 5
+    sistema.agregar_puntaje("nuevo", 100, "escapa")
+    assert len(_sistema(ruta).entre_fechas("escapa")) == 6
+
+
+def test_asincrono_escribe_en_segundo_plano(tmp_path):
+    ruta = tmp_path / "p.log"
+    sistema = _sistema(ruta, asincrono=True)
+    sistema.agregar_puntaje("ana", 10, "escapa")
+    assert sistema.obtener_top("escapa")[0]["nombre"] == "ana"  # ya está en memoria
+    sistema.esperar()
+    sistema.cerrar()
+    assert _sistema(ruta).obtener_top("escapa")[0]["nombre"] == "ana"
+
+
+# ----------------- COMPACTACIÓN -----------------
+def test_compactar_conserva_top_mejores_y_recientes(tmp_path):
+    ruta = tmp_path / "p.log"
+    # Antiguos (t pequeño): solo se conservan si están en el top o son el mejor de alguien
+    ruta.write_text("".join(_linea(f"viejo{i % 4}", i, i) + "\n" for i in range(40)))
+    sistema = _sistema(ruta, k=2, retencion_dias=1)
+    sistema.agregar_puntaje("nuevo", 1, "escapa")
+    sistema.compactar()
+
+    nombres = sorted(r["nombre"] for r in _sistema(ruta).entre_fechas("escapa"))
+    assert nombres == ["nuevo", "viejo0", "viejo1", "viejo2", "viejo3"]
+    assert [r["puntaje"] for r in sistema.obtener_top("escapa")] == [39, 38]
+
+
+def test_procesos_concurrentes_con_compactacion(tmp_path):
+    _procesos("""
+        import sys
+        from laberinto.puntajes import SistemaPuntajes
+        sistema = SistemaPuntajes("p.log", archivos_anteriores={}, compactar_cada=5,
+                                  retencion_dias=None)
+        for i in range(100):
+            sistema.agregar_puntaje(f"{sys.argv[1]}-{i}", i, "escapa")
+        sistema.cerrar()
+    """, 4, tmp_path)
+    registros = _sistema(tmp_path / "p.log").entre_fechas("escapa")
+    assert len(registros) == 400
+    assert len({r["nombre"] for r in registros}) == 400
+    assert os.listdir(tmp_path) == ["p.log"]  # sin temporales olvidados
+
+
+# ----------------- MIGRACIÓN Y ERRORES -----------------
+def test_migracion_concurrente_no_duplica(tmp_path):
+    lineas = ["Nombre | Puntaje | Fecha"] + [f"j{i} | {i} | 01/01/2024 10:00" for i in range(30)]
+    (tmp_path / "escapa.txt").write_text("\n".join(lineas) + "\n")
+    _procesos("""
+        from laberinto.puntajes import SistemaPuntajes
+        SistemaPuntajes("p.log", asincrono=False, archivos_anteriores={"escapa": "escapa.txt"})
+    """, 6, tmp_path)
+    assert len((tmp_path / "p.log").read_text().splitlines()) == 30
+
+
+def test_escritura_fallida_se_reintenta(tmp_path, monkeypatch):
+    ruta = tmp_path / "p.log"
+    sistema = _sistema(ruta)
+    escribir = sistema._escribir_lineas
+    fallos = [OSError(28, "No space left on device")]
+
+    def escribir_con_fallo(lineas):
+        if fallos:
+            raise fallos.pop()
+        escribir(lineas)
+
+    monkeypatch.setattr(sistema, "_escribir_lineas", escribir_con_fallo)
+    sistema.agregar_puntaje("ana", 10, "escapa")
+    assert sistema.error_escritura is not None
+    assert sistema.sin_guardar() == 1
+    assert sistema.obtener_top("escapa")[0]["nombre"] == "ana"
+
+    sistema.agregar_puntaje("luis", 20, "escapa")  # el reintento lleva también el anterior
+    assert sistema.error_escritura is None
+    assert sistema.sin_guardar() == 0
+    assert sorted(r["nombre"] for r in _sistema(ruta).entre_fechas("escapa")) == ["ana", "luis"]
+
+
+def test_escritor_reintenta_con_espera_creciente(tmp_path, monkeypatch):
+    monkeypatch.setattr(puntajes, "ESPERA_REINTENTO", 0.05)
+    ruta = tmp_path / "p.log"
+    sistema = _sistema(ruta, asincrono=True, intervalo_lectura=5)
+    escribir = sistema._escribir_lineas
+    intentos = []
+
+    def escribir_con_fallo(lineas):
+        intentos.append(time.monotonic())
+        if len(intentos) <= 3:
+            raise OSError(28, "No space left on device")
+        escribir(lineas)
+
+    monkeypatch.setattr(sistema, "_escribir_lineas", escribir_con_fallo)
+    sistema.agregar_puntaje("ana", 10, "escapa")
+    limite = time.monotonic() + 5
+    while sistema.sin_guardar() and time.monotonic() < limite:
+        time.sleep(0.02)
+    sistema.cerrar()
+
+    assert len(intentos) == 4
+    esperas = [b - a for a, b in zip(intentos, intentos[1:])]
+    assert esperas[0] >= 0.04 and esperas[1] >= 0.09 and esperas[2] >= 0.19
+    assert [r["nombre"] for r in _sistema(ruta).entre_fechas("escapa")] == ["ana"]
@@ -0,0 +1,117 @@
+# Escapa del Laberinto - pruebas de la simulación sin interfaz
+# Isaac Orozco y Daniel Araya
+import random
+
+import pytest
+
+from laberinto.constantes import DISTANCIA_APARICION_SALIDA, Punto
+from laberinto.entidades import Enemigo
+from laberinto.generador import GeneradorMapa, generar_mapa_juego
+from laberinto.pathfinding import CampoDistancias
+from laberinto.simulacion import Simulacion, DIRECCIONES
+
+
+def _acciones(semilla, ticks):
+    rng = random.Random(semilla)
+    return [[("mover", rng.choice(list(DIRECCIONES)), rng.random() < 0.2)] if rng.random() < 0.6 else []
+            for _ in range(ticks)]
+
+
+def _estado(sim):
+    return (sim.tick, sim.jugador.posicion, sim.jugador.puntaje, sim.terminado, sim.victoria,
+            [(e.posicion, e.vivo) for e in sim.enemigos])
+
+
+# ----------------- DETERMINISMO -----------------
+@pytest.mark.parametrize("modo", ["escapa", "cazador"])
+def test_misma_semilla_misma_partida(modo):
+    acciones = _acciones(4, 300)
+    estados = []
+    for _ in range(2):
+        sim = Simulacion(modo, "dificil", semilla=123, num_enemigos=5)
+        for del_tick in acciones:
+            sim.step(del_tick)
+        estados.append(_estado(sim))
+    assert estados[0] == estados[1]
+
+
+def test_semilla_del_mapa_es_reproducible():
+    a = generar_mapa_juego(77, 31, 41, mostrar_progreso=False)
+    b = generar_mapa_juego(77, 31, 41, mostrar_progreso=False)
+    assert bytes(a.mapa.celdas) == bytes(b.mapa.celdas)
+    assert (a.salidas, a.posicion_jugador) == (b.salidas, b.posicion_jugador)
+
+
+# ----------------- GENERACIÓN CON UNION-FIND -----------------
+@pytest.mark.parametrize("filas, columnas", [(3, 3), (12, 18), (31, 41), (60, 90)])
+def test_union_find_coincide_con_bfs(filas, columnas):
+    for semilla in range(25):
+        generador = generar_mapa_juego(semilla, filas, columnas, mostrar_progreso=False)
+        por_conjuntos = generador.verificar_camino_valido()
+        generador.version_conjuntos = -1  # obliga al BFS
+        assert por_conjuntos and generador.verificar_camino_valido()
+
+
+def test_apariciones_lejos_de_las_salidas():
+    for semilla in range(10):
+        sim = Simulacion("cazador", "dificil", semilla=semilla, num_enemigos=8)
+        campo = sim.generador.distancias_salidas()
+        for enemigo in sim.enemigos:
+            assert campo.distancia(enemigo.posicion) >= DISTANCIA_APARICION_SALIDA
+
+
+def test_indices_de_fila_como_una_lista():
+    mapa = generar_mapa_juego(1, 11, 13, mostrar_progreso=False).mapa
+    assert mapa[2][-1] is mapa[2][12]
+    assert mapa[-1][0] is mapa[10][0]
+    for columna in (13, -14):
+        with pytest.raises(IndexError):
+            mapa[2][columna]
+    with pytest.raises(IndexError):
+        mapa[11]
+
+
+# ----------------- ENJAMBRE CONTRA OBJETOS -----------------
+def _comparar_enjambre(generador, objetivo, campo, huir=False, seguir=False):
+    """Un paso de EnjambreEnemigos contra el mismo paso de cada Enemigo, en todas las celdas libres"""
+    np = pytest.importorskip("numpy")
+    from laberinto.enjambre import EnjambreEnemigos
+
+    mapa = generador.mapa
+    libres = [i for i in range(mapa.filas * mapa.columnas) if mapa.paso_enemigo[i]]
+    enjambre = EnjambreEnemigos(mapa.filas, mapa.columnas, np.array(libres))
+    enjambre.mover(mapa, objetivo, campo=campo, huir=huir)
+
+    for k, i in enumerate(libres):
+        enemigo = Enemigo(Punto(*divmod(i, mapa.columnas)))
+        if seguir:
+            enemigo.seguir_campo(campo, huir=huir)
+        else:
+            enemigo.mover_hacia_objetivo(mapa, objetivo, huir=huir, campo=campo)
+        assert enemigo.posicion.r * mapa.columnas + enemigo.posicion.c == enjambre.posiciones[k]
+
+
+@pytest.mark.parametrize("huir", [False, True])
+def test_enjambre_persigue_como_los_objetos(huir):
+    generador = generar_mapa_juego(5, 31, 41, mostrar_progreso=False)
+    campo = CampoDistancias(generador.mapa)
+    campo.actualizar(generador.posicion_jugador)
+    _comparar_enjambre(generador, generador.posicion_jugador, campo, huir=huir)
+
+
+def test_enjambre_sin_campo_usa_manhattan():
+    generador = generar_mapa_juego(6, 31, 41, mostrar_progreso=False)
+    _comparar_enjambre(generador, generador.posicion_jugador, None)
+
+
+def test_enjambre_baja_a_las_salidas_como_los_objetos():
+    generador = generar_mapa_juego(7, 31, 41, mostrar_progreso=False)
+    campo = generador.distancias_salidas()
+    _comparar_enjambre(generador, generador.salidas[0], campo, seguir=True)
+
+
+def test_mapa_sin_salidas_no_es_valido():
+    generador = GeneradorMapa(11, 13, semilla=1)
+    generador.generar_mapa_aleatorio()
+    generador.salidas = []
+    assert not generador.verificar_camino_valido()